@@ -0,0 +1,84 @@
+"""Compiled program benchmark.
+
+Builds a large random rule set, then compares the memory held by its
+`Expr` tree with that of the compiled `Program`, times `evaluate` on the
+tree against the stack machine, and times writing the program and mapping
+it back with `load`, checking that all of them agree.
+
+Run from the repository root with:
+
+    python -m benchmarks.bench_bytecode
+"""
+
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+from logic_parser.bytecode import compile_expr, load
+from logic_parser.expr import BinaryExpr, Expr, evaluate
+from logic_parser.token import TokenType
+from tests.helpers import random_expr
+
+SEED = 36
+NAMES = [f"Signal_{i}" for i in range(64)]
+RULES = 2_000
+DEPTH = 10
+ROUNDS = 5
+
+
+def rule_set(rng: random.Random) -> Expr:
+    """The XOR of `RULES` random rules, so evaluation visits every node."""
+    expr = random_expr(rng, NAMES, DEPTH)
+    for _ in range(RULES - 1):
+        expr = BinaryExpr(TokenType.XOR, expr, random_expr(rng, NAMES, DEPTH))
+    return expr
+
+
+def measure(label: str, build):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - start
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<14} {elapsed:>8.3f}s {size / 1e6:>9.1f} MB")
+    return result, size
+
+
+def main():
+    rng = random.Random(SEED)
+    expr, tree_size = measure("Expr tree", lambda: rule_set(rng))
+    program, program_size = measure("Program", lambda: compile_expr(expr, NAMES))
+    nodes = len(program)
+    print(
+        f"{nodes} nodes: {tree_size / nodes:.1f} bytes/node as Expr, "
+        f"{program_size / nodes:.1f} as Program"
+    )
+
+    envs = [{name: rng.random() < 0.5 for name in NAMES} for _ in range(ROUNDS)]
+    start = time.perf_counter()
+    expected = [bool(evaluate(expr, env)) for env in envs]
+    print(f"evaluate       {(time.perf_counter() - start) / ROUNDS:>8.3f}s/eval")
+    start = time.perf_counter()
+    results = [program.run([env[name] for name in NAMES]) for env in envs]
+    print(f"Program.run    {(time.perf_counter() - start) / ROUNDS:>8.3f}s/eval")
+    assert results == expected, "program and tree disagree"
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "rules.lpbc")
+        start = time.perf_counter()
+        with open(path, "wb") as f:
+            program.dump(f)
+        elapsed = time.perf_counter() - start
+        print(f"dump           {elapsed:>8.3f}s {os.path.getsize(path) / 1e6:>9.1f} MB")
+        start = time.perf_counter()
+        loaded = load(path)
+        print(f"load           {time.perf_counter() - start:>8.3f}s")
+        assert loaded.run([envs[0][name] for name in NAMES]) == expected[0]
+        del loaded
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Parse cache benchmark.
+
+Writes a large logic file of random assignments that read earlier
+variables, then times parsing it against storing and loading its cache
+entry, checking that both give the same statements and variables.
+
+Run from the repository root with:
+
+    python -m benchmarks.bench_cache
+"""
+
+import os
+import random
+import tempfile
+import time
+
+from logic_parser.cache import Cache, CompiledFile, NodeTable
+from logic_parser.expr import format_expr
+from logic_parser.parser import Parser
+from logic_parser.tokenizer import tokenize_lines
+from tests.helpers import random_expr
+
+SEED = 41
+INPUTS = [f"In_{i}" for i in range(32)]
+ASSIGNMENTS = 20_000
+DEPTH = 5
+
+
+def write_file(path: str, rng: random.Random):
+    names = list(INPUTS)
+    with open(path, "w") as f:
+        for name in INPUTS:
+            f.write(f"{name} := {rng.randint(0, 1)}\n")
+        for i in range(ASSIGNMENTS):
+            name = f"V_{i}"
+            expr = random_expr(rng, rng.sample(names, 8), DEPTH)
+            f.write(f"{name} := {format_expr(expr)}\n")
+            names.append(name)
+            if i % 100 == 0:
+                f.write(f"{name}\n")
+
+
+def parse(path: str) -> CompiledFile:
+    with open(path) as f:
+        parser = Parser(tokenize_lines(f))
+        statements = list(parser.parse_all())
+    return CompiledFile(statements, dict(parser.memory), parser.functions)
+
+
+def table(compiled: CompiledFile) -> tuple:
+    """The node table of a file, which compares in linear time unlike its trees."""
+    nodes = NodeTable()
+    roots = [nodes.add(statement) for statement in compiled.statements]
+    roots += [nodes.add(value) for value in compiled.memory.values()]
+    return nodes.kinds, nodes.args, nodes.names, roots, list(compiled.memory)
+
+
+def main():
+    rng = random.Random(SEED)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "rules.pl")
+        write_file(path, rng)
+        print(f"{ASSIGNMENTS} assignments, {os.path.getsize(path) / 1e6:.1f} MB")
+
+        start = time.perf_counter()
+        compiled = parse(path)
+        print(f"parse          {time.perf_counter() - start:>8.3f}s")
+
+        cache = Cache(os.path.join(directory, "cache"))
+        start = time.perf_counter()
+        cache.store(path, compiled)
+        size = os.path.getsize(cache.entry_path(path))
+        print(f"store          {time.perf_counter() - start:>8.3f}s {size / 1e6:>6.1f} MB")
+
+        start = time.perf_counter()
+        loaded = cache.load(path)
+        print(f"load           {time.perf_counter() - start:>8.3f}s")
+        assert table(loaded) == table(compiled), "cached and parsed files differ"
+
+
+if __name__ == "__main__":
+    main()
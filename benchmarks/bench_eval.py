@@ -0,0 +1,107 @@
+"""Evaluator benchmark.
+
+Times `evaluate`, the iterative short-circuiting evaluator, against
+`recursive_eval`, a copy of the recursive evaluation it replaced, on a
+left-deep chain of the kind formula generators emit, a wide OR of short
+AND terms, and a balanced tree of random operators, and checks that both
+give the same results. The recursive evaluator cannot evaluate the deep
+chain at all.
+
+Run from the repository root with:
+
+    python -m benchmarks.bench_eval
+"""
+
+import random
+import time
+
+from logic_parser.expr import (
+    BinaryExpr,
+    Expr,
+    LiteralExpr,
+    NaryExpr,
+    UnaryExpr,
+    VariableExpr,
+    apply_binary,
+    evaluate,
+)
+from logic_parser.token import TokenType
+from tests.helpers import BINARY_OPERATORS
+
+SEED = 35
+NAMES = [f"X{i}" for i in range(16)]
+ROUNDS = 20
+
+
+def recursive_eval(node: Expr, env: dict[str, bool]):
+    if isinstance(node, BinaryExpr):
+        a = recursive_eval(node.r_operand, env)
+        b = recursive_eval(node.l_operand, env)
+        return apply_binary(node.operator, a, b)
+    if isinstance(node, UnaryExpr):
+        return not recursive_eval(node.operand, env)
+    if isinstance(node, NaryExpr):
+        results = (recursive_eval(operand, env) for operand in node.operands)
+        return all(results) if node.operator == TokenType.AND else any(results)
+    if isinstance(node, VariableExpr):
+        return env[node.name]
+    return node.eval(env)
+
+
+def deep_chain(rng: random.Random, length: int) -> Expr:
+    expr: Expr = VariableExpr(rng.choice(NAMES))
+    for _ in range(length):
+        operand = VariableExpr(rng.choice(NAMES))
+        if rng.random() < 0.3:
+            operand = UnaryExpr(TokenType.NOT, operand)
+        expr = BinaryExpr(rng.choice(BINARY_OPERATORS), expr, operand)
+    return expr
+
+
+def wide_or(rng: random.Random, terms: int) -> Expr:
+    return NaryExpr(
+        TokenType.OR,
+        [
+            NaryExpr(TokenType.AND, [VariableExpr(name) for name in rng.sample(NAMES, 4)])
+            for _ in range(terms)
+        ],
+    )
+
+
+def balanced(rng: random.Random, depth: int) -> Expr:
+    if depth == 0:
+        return VariableExpr(rng.choice(NAMES)) if rng.random() < 0.9 else LiteralExpr(True)
+    return BinaryExpr(
+        rng.choice(BINARY_OPERATORS),
+        balanced(rng, depth - 1),
+        balanced(rng, depth - 1),
+    )
+
+
+def time_eval(label: str, evaluator, expr: Expr, envs: list[dict[str, bool]]):
+    start = time.perf_counter()
+    try:
+        results = [evaluator(expr, env) for env in envs]
+    except RecursionError:
+        print(f"  {label:<10} RecursionError")
+        return None
+    print(f"  {label:<10} {(time.perf_counter() - start) / len(envs) * 1e3:>9.3f} ms/eval")
+    return [bool(result) for result in results]
+
+
+def main():
+    rng = random.Random(SEED)
+    envs = [{name: rng.random() < 0.5 for name in NAMES} for _ in range(ROUNDS)]
+    for label, expr in [
+        ("deep chain of 20,000 operators", deep_chain(rng, 20_000)),
+        ("OR of 20,000 AND terms", wide_or(rng, 20_000)),
+        ("balanced tree of depth 14", balanced(rng, 14)),
+    ]:
+        print(label)
+        reference = time_eval("recursive", recursive_eval, expr, envs)
+        results = time_eval("iterative", evaluate, expr, envs)
+        assert reference is None or results == reference, "evaluators disagree"
+
+
+if __name__ == "__main__":
+    main()
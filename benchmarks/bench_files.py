@@ -0,0 +1,63 @@
+"""Multi-file evaluation benchmark.
+
+Writes a set of random logic files, then times evaluating them one after
+the other and spread over process pools of increasing size, checking that
+every pool size gives the same results in the same order.
+
+Run from the repository root with:
+
+    python -m benchmarks.bench_files
+"""
+
+import os
+import random
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from logic_parser.expr import format_expr
+from logic_parser.main import evaluate_file
+from tests.helpers import random_expr
+
+SEED = 43
+FILES = 16
+STATEMENTS = 1_500
+NAMES = [f"In_{i}" for i in range(16)]
+JOBS = [1, 2, 4, os.cpu_count() or 1]
+
+
+def write_files(directory: str, rng: random.Random) -> list[str]:
+    paths = []
+    for i in range(FILES):
+        path = os.path.join(directory, f"rules_{i}.pl")
+        with open(path, "w") as f:
+            for name in NAMES:
+                f.write(f"{name} := {rng.randint(0, 1)}\n")
+            for _ in range(STATEMENTS):
+                f.write(format_expr(random_expr(rng, NAMES, 7)) + "\n")
+        paths.append(path)
+    return paths
+
+
+def main():
+    rng = random.Random(SEED)
+    print(f"{FILES} files of {STATEMENTS} statements, {os.cpu_count()} CPUs")
+    with tempfile.TemporaryDirectory() as directory:
+        paths = write_files(directory, rng)
+        expected = None
+        for jobs in sorted(set(JOBS)):
+            start = time.perf_counter()
+            if jobs == 1:
+                runs = [evaluate_file(path) for path in paths]
+            else:
+                with ProcessPoolExecutor(jobs) as executor:
+                    runs = list(executor.map(evaluate_file, paths))
+            elapsed = time.perf_counter() - start
+            print(f"-j {jobs:<3} {elapsed:>8.3f}s")
+            results = [(run.path, run.results, run.error) for run in runs]
+            assert expected is None or results == expected, "results differ"
+            expected = results
+
+
+if __name__ == "__main__":
+    main()
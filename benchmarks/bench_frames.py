@@ -0,0 +1,61 @@
+"""Parser memory benchmark.
+
+Creates a million parsers without a memory and checks that they share
+none and that memory does not grow, then compares looking names up in a
+`Frame`, directly and through a parent, with a plain dict.
+
+Run from the repository root with:
+
+    python -m benchmarks.bench_frames
+"""
+
+import time
+import tracemalloc
+
+from logic_parser.frame import Frame
+from logic_parser.parser import Parser, parse_formula
+from logic_parser.tokenizer import scan
+
+PARSERS = 1_000_000
+NAMES = [f"V_{i}" for i in range(1000)]
+LOOKUPS = 200
+
+
+def create_parsers() -> tuple[float, int]:
+    tracemalloc.start()
+    start = time.perf_counter()
+    for i in range(PARSERS):
+        parser = Parser(())
+        if i % 1000 == 0:
+            parser = Parser(scan(f"V{i} := 1\nV{i}\n"))
+            assert [result.eval() for result in parser.parse_all()] == [True]
+            assert list(parser.memory) == [f"V{i}"]
+    seconds = time.perf_counter() - start
+    growth = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return seconds, growth
+
+
+def time_lookups(lookup) -> float:
+    start = time.perf_counter()
+    for _ in range(LOOKUPS):
+        for name in NAMES:
+            lookup(name)
+    return time.perf_counter() - start
+
+
+def main():
+    seconds, growth = create_parsers()
+    print(f"{PARSERS} parsers   {seconds:>8.3f}s, {growth / 1024:.1f} KiB retained")
+    value = parse_formula("1")
+    plain = {name: value for name in NAMES}
+    frame = Frame()
+    frame.update(plain)
+    call = frame.child()
+    print(f"dict.get        {time_lookups(plain.get):>8.3f}s")
+    print(f"Frame.lookup    {time_lookups(frame.lookup):>8.3f}s")
+    print(f"through parent  {time_lookups(call.lookup):>8.3f}s")
+
+
+if __name__ == "__main__":
+    main()
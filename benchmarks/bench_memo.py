@@ -0,0 +1,48 @@
+"""Function call memoization benchmark.
+
+Parses and evaluates a generated file of many calls of a few small user
+functions with no call cache, with the default one and with a small one,
+and prints each cache's hit rate.
+
+Run from the repository root with:
+
+    python -m benchmarks.bench_memo
+"""
+
+import random
+import time
+
+from benchmarks.workloads import functions
+from logic_parser.expr import evaluate
+from logic_parser.memo import MAXSIZE, CallCache
+from logic_parser.parser import Parser
+from logic_parser.tokenizer import tokenize_lines
+
+SEED = 46
+SCALE = 4
+ROUNDS = 3
+
+
+def run(lines: list[str], maxsize: int) -> tuple[float, CallCache]:
+    calls = CallCache(maxsize)
+    start = time.perf_counter()
+    for statement in Parser(tokenize_lines(lines), calls=calls).parse_all():
+        evaluate(statement)
+    return time.perf_counter() - start, calls
+
+
+def main():
+    lines = functions(random.Random(SEED), SCALE).lines
+    plain = min(run(lines, 0)[0] for _ in range(ROUNDS))
+    print(f"no cache        {plain:>8.3f}s")
+    for maxsize in [MAXSIZE, 8]:
+        runs = [run(lines, maxsize) for _ in range(ROUNDS)]
+        seconds, calls = min(runs, key=lambda r: r[0])
+        print(
+            f"maxsize {maxsize:<7} {seconds:>8.3f}s {plain / seconds:>5.2f}x "
+            f"hit rate {calls.stats.hit_rate:.1%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
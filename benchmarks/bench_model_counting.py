@@ -0,0 +1,73 @@
+"""Model counting benchmark.
+
+Compares `count_models` with brute-force enumeration over `Expr.eval` on
+small random formulas (checking that both agree), then times
+`count_models` alone on larger random formulas made of short clauses over
+neighbouring variables, the shape of generated policy formulas.
+
+Run from the repository root with:
+
+    python -m benchmarks.bench_model_counting
+"""
+
+import random
+import time
+
+from logic_parser.expr import BinaryExpr, Expr, UnaryExpr, VariableExpr
+from logic_parser.sat import count_models
+from logic_parser.token import TokenType
+from tests.helpers import brute_force_models, random_expr
+
+SEED = 28
+
+
+def random_local_formula(rng: random.Random, num_vars: int, window: int = 8) -> Expr:
+    """Conjunction of 2 * num_vars three-literal clauses over nearby variables."""
+    names = [f"X{i}" for i in range(num_vars)]
+    formula = None
+    for _ in range(2 * num_vars):
+        base = rng.randrange(num_vars)
+        clause = None
+        for _ in range(3):
+            literal = VariableExpr(names[(base + rng.randrange(window)) % num_vars])
+            if rng.random() < 0.5:
+                literal = UnaryExpr(TokenType.NOT, literal)
+            clause = literal if clause is None else BinaryExpr(TokenType.OR, clause, literal)
+        formula = clause if formula is None else BinaryExpr(TokenType.AND, formula, clause)
+    return formula
+
+
+def bench_small(rng: random.Random):
+    print(f"{'vars':>6} {'formulas':>9} {'brute force (s)':>16} {'count_models (s)':>17}")
+    for num_vars in (4, 8, 12, 14):
+        names = [f"X{i}" for i in range(num_vars)]
+        formulas = [random_expr(rng, names, 7) for _ in range(10)]
+        start = time.perf_counter()
+        expected = [sum(1 for _ in brute_force_models(expr, names)) for expr in formulas]
+        brute_time = time.perf_counter() - start
+        start = time.perf_counter()
+        counted = [count_models(expr, names) for expr in formulas]
+        count_time = time.perf_counter() - start
+        assert counted == expected, "count_models disagrees with brute force"
+        print(f"{num_vars:>6} {len(formulas):>9} {brute_time:>16.3f} {count_time:>17.3f}")
+
+
+def bench_large(rng: random.Random):
+    print(f"{'vars':>6} {'clauses':>8} {'models':>12} {'count_models (s)':>17}")
+    for num_vars in (60, 100, 200, 400):
+        expr = random_local_formula(rng, num_vars)
+        start = time.perf_counter()
+        models = count_models(expr, [f"X{i}" for i in range(num_vars)])
+        elapsed = time.perf_counter() - start
+        print(f"{num_vars:>6} {2 * num_vars:>8} {models:>12.3e} {elapsed:>17.3f}")
+
+
+def main():
+    rng = random.Random(SEED)
+    bench_small(rng)
+    print()
+    bench_large(rng)
+
+
+if __name__ == "__main__":
+    main()
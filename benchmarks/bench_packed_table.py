@@ -0,0 +1,69 @@
+"""Packed truth table benchmark.
+
+Writes the packed tables of two random clause formulas over growing
+numbers of variables, then times mapping one back, random lookups,
+popcount-based counting (checked against `count_models`) and combining
+the two tables.
+
+Run from the repository root with:
+
+    python -m benchmarks.bench_packed_table
+"""
+
+import os
+import random
+import tempfile
+import time
+
+from benchmarks.bench_model_counting import random_local_formula
+from logic_parser.packed_table import PackedTable, write_table
+from logic_parser.sat import count_models
+
+SEED = 40
+LOOKUPS = 100_000
+
+
+def main():
+    rng = random.Random(SEED)
+    print(
+        f"{'vars':>5} {'MB':>7} {'write (s)':>10} {'lookups/s':>11} "
+        f"{'count (s)':>10} {'and (s)':>8}"
+    )
+    with tempfile.TemporaryDirectory() as directory:
+        for num_vars in (16, 20, 24):
+            names = [f"X{i}" for i in range(num_vars)]
+            f = random_local_formula(rng, num_vars)
+            g = random_local_formula(rng, num_vars)
+            f_path = os.path.join(directory, f"f{num_vars}.lptt")
+            g_path = os.path.join(directory, f"g{num_vars}.lptt")
+
+            start = time.perf_counter()
+            write_table(f, f_path, names)
+            written = time.perf_counter() - start
+            write_table(g, g_path, names)
+
+            table = PackedTable(f_path)
+            assignments = [rng.randrange(len(table)) for _ in range(LOOKUPS)]
+            start = time.perf_counter()
+            for assignment in assignments:
+                table[assignment]
+            lookups = LOOKUPS / (time.perf_counter() - start)
+
+            start = time.perf_counter()
+            count = table.count()
+            counted = time.perf_counter() - start
+            assert count == count_models(f, names), "popcount disagrees"
+
+            start = time.perf_counter()
+            table.combine(PackedTable(g_path), "and", os.path.join(directory, "and.lptt"))
+            combined = time.perf_counter() - start
+            size = os.path.getsize(f_path) / 1e6
+            print(
+                f"{num_vars:>5} {size:>7.2f} {written:>10.3f} {lookups:>11,.0f} "
+                f"{counted:>10.4f} {combined:>8.4f}"
+            )
+            del table
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""Parser throughput benchmark.
+
+Times `Parser`, which parses expressions by precedence climbing over an
+explicit operator stack, against `RecursiveDescentParser`, the
+one-method-per-precedence-level parser it replaced, on random formulas,
+and checks that both build the same trees. Also parses nesting far deeper
+than the recursion limit, which only `Parser` can do.
+
+Run from the repository root with:
+
+    python -m benchmarks.bench_parser
+"""
+
+import random
+import sys
+import time
+from typing import Callable
+
+from logic_parser.expr import BinaryExpr, Expr, UnaryExpr
+from logic_parser.parser import Parser
+from logic_parser.token import Token, TokenType
+from logic_parser.tokenizer import scan
+
+SEED = 34
+FORMULAS = 2_000
+OPERATORS = ["^", "v", "!=", "=>", "<=>"]
+
+
+class RecursiveDescentParser(Parser):
+    """The parser as it was before precedence climbing: one method per
+    precedence level, recursing once per level for every operand and once
+    more for every parenthesis or nested expression."""
+
+    def parse_expression(self) -> Expr:
+        self.parse_commentary()
+        return self.parse_biconditional()
+
+    def parse_binary_op(self, next_parse: Callable[[], Expr], type: TokenType):
+        node = next_parse()
+        while (t := self.peek()) and t.type == type:
+            self.consume(type)
+            node = BinaryExpr(type, node, next_parse())
+        return node
+
+    def parse_biconditional(self):
+        return self.parse_binary_op(self.parse_implication, TokenType.BICONDITIONAL)
+
+    def parse_implication(self):
+        return self.parse_binary_op(self.parse_or, TokenType.IMPLICATION)
+
+    def parse_or(self):
+        return self.parse_binary_op(self.parse_xor, TokenType.OR)
+
+    def parse_xor(self):
+        return self.parse_binary_op(self.parse_and, TokenType.XOR)
+
+    def parse_and(self):
+        return self.parse_binary_op(self.parse_not, TokenType.AND)
+
+    def parse_not(self):
+        if (t := self.peek()) and t.type == TokenType.NOT:
+            self.consume(TokenType.NOT)
+            return UnaryExpr(TokenType.NOT, self.parse_not())
+        if t and t.type == TokenType.OPEN_P:
+            self.consume(TokenType.OPEN_P)
+            expr = self.parse_expression()
+            self.consume(TokenType.CLOSE_P)
+            return expr
+        if (operand := self.parse_identifier()) is None:
+            return self.parse_expression()
+        return operand
+
+
+def random_formula(rng: random.Random, depth: int) -> str:
+    roll = rng.random()
+    if depth == 0 or roll < 0.15:
+        return rng.choice(["A", "B", "C", "D", "0", "1"])
+    if roll < 0.3:
+        return "~" + random_formula(rng, depth - 1)
+    if roll < 0.45:
+        return f"({random_formula(rng, depth - 1)})"
+    left = random_formula(rng, depth - 1)
+    right = random_formula(rng, depth - 1)
+    return f"{left} {rng.choice(OPERATORS)} {right}"
+
+
+def parse_new(tokens: list[Token]) -> Expr:
+    return Parser(tokens, {}, free_variables=True).parse()
+
+
+def parse_reference(tokens: list[Token]) -> Expr:
+    return RecursiveDescentParser(tokens, {}, free_variables=True).parse()
+
+
+def throughput(label: str, parse, inputs: list[list[Token]]) -> list[Expr]:
+    start = time.perf_counter()
+    trees = [parse(tokens) for tokens in inputs]
+    elapsed = time.perf_counter() - start
+    count = sum(len(tokens) for tokens in inputs)
+    print(f"{label:<16} {elapsed:>8.3f}s {count / elapsed:>12,.0f} tokens/s")
+    return trees
+
+
+def main():
+    rng = random.Random(SEED)
+    inputs = [list(scan(random_formula(rng, 8))) for _ in range(FORMULAS)]
+    print(f"{FORMULAS} formulas, {sum(map(len, inputs))} tokens")
+    reference = throughput("recursive descent", parse_reference, inputs)
+    trees = throughput("precedence climbing", parse_new, inputs)
+    assert trees == reference, "parsers disagree"
+
+    depth = 10 * sys.getrecursionlimit()
+    nested = list(scan("(" * depth + "A" + ")" * depth + " ^ " + "~" * depth + "B"))
+    start = time.perf_counter()
+    parse_new(nested)
+    print(f"nesting depth {depth}: {time.perf_counter() - start:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Profiler overhead benchmark.
+
+Parses and evaluates a generated file of assignments, expressions and
+function calls with no profiler, with a `Profiler` and with one tracing
+memory, and prints the profile of the second run.
+
+Run from the repository root with:
+
+    python -m benchmarks.bench_profiling
+"""
+
+import random
+import time
+from contextlib import nullcontext
+
+from logic_parser.expr import evaluate, format_expr
+from logic_parser.parser import Parser
+from logic_parser.profiling import Profiler
+from logic_parser.tokenizer import tokenize_lines
+from tests.helpers import random_expr
+
+SEED = 44
+NAMES = [f"In_{i}" for i in range(16)]
+STATEMENTS = 5_000
+ROUNDS = 3
+
+
+def workload(rng: random.Random) -> list[str]:
+    lines = [f"{name} := {rng.randint(0, 1)}\n" for name in NAMES]
+    lines.append("MAJ(a, b, c) := a ^ b v a ^ c v b ^ c\n")
+    for i in range(STATEMENTS):
+        if i % 10 == 0:
+            lines.append(f"F_{i} := MAJ({', '.join(rng.sample(NAMES, 3))})\n")
+        lines.append(format_expr(random_expr(rng, NAMES, 6)) + "\n")
+    return lines
+
+
+def run(lines: list[str], profiler: Profiler | None) -> float:
+    start = time.perf_counter()
+    with profiler or nullcontext():
+        for statement in Parser(tokenize_lines(lines)).parse_all():
+            evaluate(statement)
+    return time.perf_counter() - start
+
+
+def main():
+    lines = workload(random.Random(SEED))
+    plain = min(run(lines, None) for _ in range(ROUNDS))
+    profilers = [Profiler() for _ in range(ROUNDS)]
+    profiled = min(run(lines, profiler) for profiler in profilers)
+    traced = run(lines, Profiler(trace_memory=True))
+    print(f"no profiler    {plain:>8.3f}s")
+    print(f"Profiler       {profiled:>8.3f}s {profiled / plain:>5.2f}x")
+    print(f"trace_memory   {traced:>8.3f}s {traced / plain:>5.2f}x")
+    print()
+    print(profilers[0].report())
+
+
+if __name__ == "__main__":
+    main()
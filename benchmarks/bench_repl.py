@@ -0,0 +1,60 @@
+"""Scripted REPL session benchmark.
+
+Pipes a generated session, pasted several times, through the REPL's batch
+mode with and without its parse cache, and compares both with running the
+same lines as a file.
+
+Run from the repository root with:
+
+    python -m benchmarks.bench_repl
+"""
+
+import io
+import random
+import time
+
+from benchmarks.workloads import repl
+from logic_parser.expr import evaluate
+from logic_parser.parser import Parser
+from logic_parser.repl import PARSE_CACHE_SIZE, REPL
+from logic_parser.tokenizer import tokenize_lines
+
+SEED = 47
+SCALE = 1
+PASTES = 5
+ROUNDS = 3
+
+
+def run_batch(text: str, cache_size: int) -> tuple[float, REPL]:
+    session = REPL(cache_size)
+    start = time.perf_counter()
+    session.run_batch(io.StringIO(text), io.StringIO())
+    return time.perf_counter() - start, session
+
+
+def run_file(text: str) -> float:
+    start = time.perf_counter()
+    for statement in Parser(tokenize_lines(io.StringIO(text))).parse_all():
+        evaluate(statement)
+    return time.perf_counter() - start
+
+
+def main():
+    lines = repl(random.Random(SEED), SCALE).lines
+    text = "\n".join(lines * PASTES) + "\n"
+    print(f"{len(lines) * PASTES} lines")
+    file = min(run_file(text) for _ in range(ROUNDS))
+    print(f"file mode        {file:>8.3f}s")
+    uncached = min(run_batch(text, 0)[0] for _ in range(ROUNDS))
+    print(f"batch, no cache  {uncached:>8.3f}s {uncached / file:>5.2f}x file")
+    runs = [run_batch(text, PARSE_CACHE_SIZE) for _ in range(ROUNDS)]
+    cached, session = min(runs, key=lambda r: r[0])
+    stats = session.stats
+    print(
+        f"batch, cached    {cached:>8.3f}s {cached / file:>5.2f}x file, "
+        f"{stats.hits} hits, {stats.misses} misses"
+    )
+
+
+if __name__ == "__main__":
+    main()
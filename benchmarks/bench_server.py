@@ -0,0 +1,100 @@
+"""Session server benchmark.
+
+Starts a server, keeps one client sending large batches to it and measures
+the latency of small requests from another client in the meantime, with
+large batches run on the worker pool and with every batch run on the event
+loop. Also reports the throughput of large batches.
+
+Run from the repository root with:
+
+    python -m benchmarks.bench_server
+"""
+
+import asyncio
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+from logic_parser.expr import format_expr
+from logic_parser.server import HEAVY_BATCH, Client, Server
+from tests.helpers import random_expr
+
+SEED = 42
+NAMES = [f"In_{i}" for i in range(16)]
+HEAVY_STATEMENTS = 3_000
+SMALL_REQUESTS = 200
+
+
+def heavy_batch(rng: random.Random) -> str:
+    lines = [f"{name} := {rng.randint(0, 1)}" for name in NAMES]
+    for _ in range(HEAVY_STATEMENTS):
+        lines.append(format_expr(random_expr(rng, NAMES, 6)))
+    return "\n".join(lines) + "\n"
+
+
+def start(server: Server):
+    loop = asyncio.new_event_loop()
+    started = threading.Event()
+    thread = threading.Thread(
+        target=lambda: loop.run_until_complete(server.run(started))
+    )
+    thread.start()
+    started.wait()
+
+    def shutdown():
+        loop.call_soon_threadsafe(server.close)
+        thread.join()
+        loop.close()
+
+    return shutdown
+
+
+def measure(label: str, path: str, heavy: int, source: str):
+    server = Server(path, workers=2, heavy=heavy)
+    shutdown = start(server)
+    done = threading.Event()
+    batches = []
+
+    def send_heavy():
+        with Client(path) as client:
+            while not done.is_set():
+                begin = time.perf_counter()
+                client.run(source, "heavy")
+                batches.append(time.perf_counter() - begin)
+
+    sender = threading.Thread(target=send_heavy)
+    sender.start()
+    latencies = []
+    with Client(path) as client:
+        client.run("A := 1\n", "small")
+        for _ in range(SMALL_REQUESTS):
+            begin = time.perf_counter()
+            client.run("A ^ ~A v A\n", "small")
+            latencies.append(time.perf_counter() - begin)
+    done.set()
+    sender.join()
+    shutdown()
+    latencies.sort()
+    p99 = latencies[int(len(latencies) * 0.99) - 1]
+    print(
+        f"{label:<16} small p50 {statistics.median(latencies) * 1e3:>7.2f} ms "
+        f"p99 {p99 * 1e3:>7.2f} ms, large batch {statistics.mean(batches):.3f}s"
+    )
+
+
+def main():
+    rng = random.Random(SEED)
+    source = heavy_batch(rng)
+    print(f"large batches of {HEAVY_STATEMENTS} statements, {len(source)} chars")
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "logic.sock")
+        measure("worker pool", path, HEAVY_BATCH, source)
+        measure("event loop only", path, sys.maxsize, source)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Cone-of-influence slicing benchmark.
+
+Generates files of independent groups of definitions, each definition
+reading the inputs and one earlier definition of its group, and compares
+evaluating every statement with evaluating only the cone of one output per
+file. The pre-scan alone is timed as well.
+
+Run from the repository root with:
+
+    python -m benchmarks.bench_slicing
+"""
+
+import random
+import time
+
+from benchmarks.workloads import INPUTS, formula, inputs
+from logic_parser.expr import evaluate
+from logic_parser.parser import Parser
+from logic_parser.slicing import Program, evaluate_outputs
+from logic_parser.tokenizer import tokenize_lines
+
+SEED = 50
+GROUP = 100
+ROUNDS = 3
+
+
+def rules(rng: random.Random, size: int) -> list[str]:
+    lines = inputs(rng)
+    for i in range(size):
+        group = i - i % GROUP
+        definition = formula(rng, INPUTS, 3)
+        if i > group:
+            definition += f" != D_{rng.randrange(group, i)}"
+        lines.append(f"D_{i} := {definition}\n")
+    return lines
+
+
+def run_all(lines: list[str], output: str) -> bool:
+    parser = Parser(tokenize_lines(lines))
+    for _ in parser.parse_all():
+        pass
+    return bool(evaluate(parser.memory[output]))
+
+
+def best(function, *args) -> tuple[float, object]:
+    runs = []
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        result = function(*args)
+        runs.append((time.perf_counter() - start, result))
+    return min(runs, key=lambda run: run[0])
+
+
+def main():
+    rng = random.Random(SEED)
+    for size in (1_000, 10_000, 50_000):
+        lines = rules(rng, size)
+        output = f"D_{GROUP // 2}"
+        full, expected = best(run_all, lines, output)
+        prescan, program = best(Program, lines)
+        sliced, values = best(evaluate_outputs, lines, [output])
+        assert values[output] == expected
+        kept = len(program.slice([output]).statements)
+        print(
+            f"{size:>6} definitions: all {full:>7.3f}s, pre-scan {prescan:>7.3f}s, "
+            f"cone of {kept} {sliced:>7.3f}s {full / sliced:>5.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Concurrent snapshot evaluation benchmark.
+
+Freezes a generated rule set once, then evaluates its last definitions
+under many sets of input bindings on thread pools of increasing size, and
+checks that every pool gives the results of one thread. Threads only speed
+this up on a free-threaded Python build; with the GIL the numbers show the
+cost of sharing one snapshot.
+
+Run from the repository root with:
+
+    python -m benchmarks.bench_snapshot
+"""
+
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from logic_parser.expr import format_expr
+from logic_parser.snapshot import Snapshot, freeze
+from tests.helpers import random_expr
+
+SEED = 48
+INPUTS = [f"In_{i}" for i in range(32)]
+DEFINITIONS = 1_000
+TARGETS = 50
+CASES = 100
+THREADS = [1, 2, 4, 8]
+
+
+def rule_set(rng: random.Random) -> list[str]:
+    lines = [f"{name} := 0\n" for name in INPUTS]
+    names = list(INPUTS)
+    for i in range(DEFINITIONS):
+        lines.append(f"V_{i} := {format_expr(random_expr(rng, names[-40:], 4))}\n")
+        names.append(f"V_{i}")
+    return lines
+
+
+def evaluate_case(snapshot: Snapshot, targets: list[str], bindings: dict) -> list:
+    scope = snapshot.scope(bindings)
+    return [scope[name] for name in targets]
+
+
+def main():
+    rng = random.Random(SEED)
+    snapshot = freeze(rule_set(rng))
+    targets = [f"V_{i}" for i in range(DEFINITIONS - TARGETS, DEFINITIONS)]
+    cases = [{name: rng.random() < 0.5 for name in INPUTS} for _ in range(CASES)]
+    gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print(f"{CASES} cases of {TARGETS} names, GIL {'enabled' if gil else 'disabled'}")
+    expected = None
+    single = 0.0
+    for threads in THREADS:
+        start = time.perf_counter()
+        with ThreadPoolExecutor(threads) as executor:
+            runs = executor.map(lambda c: evaluate_case(snapshot, targets, c), cases)
+            results = list(runs)
+        seconds = time.perf_counter() - start
+        if expected is None:
+            expected, single = results, seconds
+        assert results == expected
+        print(f"{threads} threads {seconds:>8.3f}s {single / seconds:>5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Tokenizer throughput benchmark.
+
+Times `Tokenizer(...).tokenize()`, the character-at-a-time tokenizer,
+against `scan`, the regular-expression scanner, on a generated logic file
+with assignments, function definitions, comments and long identifiers,
+and checks that both produce the same tokens.
+
+Run from the repository root with:
+
+    python -m benchmarks.bench_tokenizer
+"""
+
+import random
+import time
+
+from logic_parser.tokenizer import Tokenizer, scan
+
+SEED = 33
+LINES = 20_000
+OPERATORS = ["^", "v", "!=", "=>", "<=>"]
+
+
+def generate(rng: random.Random, lines: int) -> str:
+    names = [f"Signal_{i}" for i in range(200)]
+    out = [f"{name} := {rng.randint(0, 1)}" for name in names[:20]]
+    out.append("MUX(s, a, b) := (s ^ a) v (~s ^ b)")
+    for i in range(lines):
+        a, b, c = (rng.choice(names) for _ in range(3))
+        op = rng.choice(OPERATORS)
+        if i % 7 == 0:
+            out.append(f"// derived signal {i}")
+        out.append(f"R{i} := ({a} {op} ~{b}) ^ ({c} v 0)")
+    return "\n".join(out) + "\n"
+
+
+def throughput(label: str, tokenize, content: str) -> list:
+    start = time.perf_counter()
+    tokens = tokenize(content)
+    elapsed = time.perf_counter() - start
+    print(
+        f"{label:<10} {len(tokens):>9} tokens {elapsed:>8.3f}s "
+        f"{len(content) / elapsed / 1e6:>7.2f} MB/s {len(tokens) / elapsed:>11,.0f} tokens/s"
+    )
+    return tokens
+
+
+def main():
+    content = generate(random.Random(SEED), LINES)
+    print(f"{len(content) / 1e6:.1f} MB of logic source")
+    reference = throughput("Tokenizer", lambda text: Tokenizer(text).tokenize(), content)
+    fast = throughput("scan", lambda text: list(scan(text)), content)
+    assert fast == reference, "scan and Tokenizer disagree"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Truth table benchmark.
+
+Tabulates random conjunctions of short clauses over neighbouring
+variables, for growing numbers of variables, comparing
+`truth_table`, which walks assignments in Gray-code order and re-evaluates
+only the nodes depending on the flipped variable, with evaluating the
+whole tree for every row, and checks that both agree. Also times writing
+the table as Gray bits.
+
+Run from the repository root with:
+
+    python -m benchmarks.bench_truth_table
+"""
+
+import io
+import random
+import time
+
+from benchmarks.bench_model_counting import random_local_formula
+from logic_parser.expr import Expr, evaluate
+from logic_parser.optimizer import count_nodes
+from logic_parser.truth_table import truth_table, write_gray_bits
+
+SEED = 39
+
+
+def full_table(expr: Expr, names: list[str]) -> list[bool]:
+    values = []
+    for assignment in range(1 << len(names)):
+        env = {name: bool(assignment >> i & 1) for i, name in enumerate(names)}
+        values.append(bool(evaluate(expr, env)))
+    return values
+
+
+def main():
+    rng = random.Random(SEED)
+    print(f"{'vars':>5} {'nodes':>6} {'full (s)':>9} {'gray (s)':>9} {'bits (s)':>9}")
+    for num_vars in (8, 12, 16):
+        names = [f"X{i}" for i in range(num_vars)]
+        expr = random_local_formula(rng, num_vars, window=4)
+        nodes = count_nodes(expr)
+
+        start = time.perf_counter()
+        expected = full_table(expr, names)
+        full = time.perf_counter() - start
+        start = time.perf_counter()
+        table = [False] * (1 << num_vars)
+        for assignment, value in truth_table(expr, names):
+            table[assignment] = value
+        gray = time.perf_counter() - start
+        assert table == expected, "tables disagree"
+        start = time.perf_counter()
+        write_gray_bits(expr, io.BytesIO(), names)
+        bits = time.perf_counter() - start
+        print(f"{num_vars:>5} {nodes:>6} {full:>9.3f} {gray:>9.3f} {bits:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,243 @@
+"""Benchmark suite with baselines.
+
+Times tokenizing, parsing and evaluating each workload of
+`benchmarks.workloads` separately, taking the best of a few rounds, and
+measures the peak of the Python heap over a separate run. Results can be
+saved as a JSON baseline and later runs compared against it, failing when
+any measurement grew by more than a threshold.
+
+The suite also runs from a copy in older checkouts, which CI measures as
+the baseline of a pull request: where a tree lacks `scan`,
+`tokenize_lines`, `Environment` or `evaluate`, it uses the `Tokenizer`,
+plain dicts and `Expr.eval` that every version has, and a workload the tree
+cannot run, such as one nested deeper than its recursive parser allows, is
+recorded as failed instead of stopping the suite.
+
+Run from the repository root with:
+
+    python -m benchmarks.suite --save baseline.json
+    python -m benchmarks.suite --compare baseline.json --threshold 0.25
+"""
+
+import argparse
+import gc
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from benchmarks.workloads import SEED, Workload, workloads
+from logic_parser.parser import Parser
+
+try:
+    from logic_parser.tokenizer import scan, tokenize_lines
+except ImportError:
+    from logic_parser.tokenizer import Tokenizer
+
+    def scan(content: str) -> list:
+        return Tokenizer(content).tokenize()
+
+    def tokenize_lines(lines: list[str]) -> list:
+        return scan("".join(lines))
+
+
+try:
+    from logic_parser.environment import Environment
+except ImportError:
+    Environment = dict
+
+try:
+    from logic_parser.expr import evaluate
+except ImportError:
+
+    def evaluate(expr, env=None):
+        return expr.eval() if env is None else expr.eval(env)
+
+
+ROUNDS = 5
+THRESHOLD = 0.25
+# Time differences below this many seconds are never reported as regressions.
+MIN_SECONDS = 0.01
+METRICS = ["tokenize", "parse", "evaluate", "peak_bytes"]
+
+
+def tokenize(workload: Workload) -> list:
+    if workload.interactive:
+        return [list(scan(line)) for line in workload.lines]
+    return list(tokenize_lines(workload.lines))
+
+
+def parse(workload: Workload, tokens: list) -> tuple[list, dict | None]:
+    if workload.interactive:
+        env = Environment()
+        statements = [Parser(line, env).parse() for line in tokens]
+        # A dict memory holds values that were substituted while parsing.
+        return statements, env if type(env) is not dict else None
+    return list(Parser(tokens, {}).parse_all()), None
+
+
+def evaluate_all(statements: list, env: dict | None) -> list:
+    return [evaluate(statement, env) for statement in statements]
+
+
+def time_phases(workload: Workload) -> dict:
+    """Seconds spent in each phase of one run over `workload`.
+
+    The garbage collector is paused while timing, so its pauses do not land
+    in whichever phase happens to trigger them.
+    """
+    gc.collect()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        tokens = tokenize(workload)
+        tokenized = time.perf_counter()
+        statements, env = parse(workload, tokens)
+        parsed = time.perf_counter()
+        evaluate_all(statements, env)
+        done = time.perf_counter()
+    finally:
+        gc.enable()
+    return {
+        "tokenize": tokenized - start,
+        "parse": parsed - tokenized,
+        "evaluate": done - parsed,
+    }
+
+
+def peak_bytes(workload: Workload) -> int:
+    """Peak of the Python heap over one run over `workload`."""
+    tracemalloc.start()
+    try:
+        statements, env = parse(workload, tokenize(workload))
+        evaluate_all(statements, env)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def commit() -> str | None:
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True
+        )
+    except OSError:
+        return None
+    return result.stdout.strip() or None
+
+
+def run_suite(
+    seed: int = SEED,
+    scale: float = 1.0,
+    rounds: int = ROUNDS,
+    only: list[str] | None = None,
+) -> dict:
+    selected = [w for w in workloads(seed, scale) if not only or w.name in only]
+    results = {}
+    for workload in selected:
+        try:
+            results[workload.name] = {"peak_bytes": peak_bytes(workload)}
+        except Exception as e:
+            results[workload.name] = {"error": f"{type(e).__name__}: {e}"}
+    selected = [w for w in selected if "error" not in results[w.name]]
+    # Rounds go over every workload in turn, so that a burst of load on the
+    # machine slows one round of several workloads rather than every round
+    # of one.
+    for _ in range(rounds):
+        for workload in selected:
+            for phase, seconds in time_phases(workload).items():
+                best = results[workload.name].get(phase, float("inf"))
+                results[workload.name][phase] = min(best, seconds)
+    for name, result in results.items():
+        print(format_row(name, result), flush=True)
+    return {
+        "seed": seed,
+        "scale": scale,
+        "python": platform.python_version(),
+        "commit": commit(),
+        "results": results,
+    }
+
+
+def format_row(name: str, result: dict) -> str:
+    if "error" in result:
+        return f"{name:<12} failed: {result['error'][:60]}"
+    return (
+        f"{name:<12} tokenize {result['tokenize']:>8.4f}s "
+        f"parse {result['parse']:>8.4f}s evaluate {result['evaluate']:>8.4f}s "
+        f"peak {result['peak_bytes'] / 1e6:>7.1f} MB"
+    )
+
+
+def compare(baseline: dict, current: dict, threshold: float = THRESHOLD) -> list[str]:
+    """Measurements of `current` more than `threshold` above `baseline`."""
+    if (baseline["seed"], baseline["scale"]) != (current["seed"], current["scale"]):
+        raise ValueError(
+            f"Baseline has seed {baseline['seed']} and scale {baseline['scale']}, "
+            f"not {current['seed']} and {current['scale']}"
+        )
+    regressions = []
+    for name, result in current["results"].items():
+        before = baseline["results"].get(name)
+        if before is None or "error" in before:
+            continue
+        if "error" in result:
+            regressions.append(f"{name}: failed, {result['error']}")
+            continue
+        for metric in METRICS:
+            old, new = before[metric], result[metric]
+            if metric != "peak_bytes" and new - old < MIN_SECONDS:
+                continue
+            if new > old * (1 + threshold):
+                regressions.append(
+                    f"{name} {metric}: {old:.4g} -> {new:.4g} "
+                    f"(+{(new / old - 1) * 100 if old else float('inf'):.0f}%)"
+                )
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    arg_parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.suite", description=__doc__.split("\n\n")[0]
+    )
+    arg_parser.add_argument("--seed", type=int, default=SEED)
+    arg_parser.add_argument(
+        "--scale", type=float, default=1.0, help="Multiply the size of every workload."
+    )
+    arg_parser.add_argument("--rounds", type=int, default=ROUNDS)
+    arg_parser.add_argument(
+        "--only", nargs="+", metavar="WORKLOAD", help="Run only these workloads."
+    )
+    arg_parser.add_argument("--save", metavar="PATH", help="Save the results to PATH.")
+    arg_parser.add_argument(
+        "--compare", metavar="PATH", help="Compare the results with the baseline PATH."
+    )
+    arg_parser.add_argument(
+        "--threshold",
+        type=float,
+        default=THRESHOLD,
+        help="Relative growth over the baseline counted as a regression.",
+    )
+    args = arg_parser.parse_args(argv)
+
+    current = run_suite(args.seed, args.scale, args.rounds, args.only)
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(current, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(baseline, current, args.threshold)
+        print(f"compared with {baseline.get('commit') or args.compare}")
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            return 1
+        print("no regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,138 @@
+"""Seeded workloads for the benchmark suite.
+
+Each workload is the source text of a logic file, or of a REPL session
+whose lines are parsed one at a time, and is the same for the same seed and
+scale.
+"""
+
+import random
+from dataclasses import dataclass
+
+SEED = 45
+INPUTS = [f"In_{i}" for i in range(64)]
+OPERATORS = ["^", "v", "!=", "=>", "<=>"]
+
+
+@dataclass
+class Workload:
+    name: str
+    lines: list[str]
+    # Lines of an interactive session are tokenized and parsed one by one.
+    interactive: bool = False
+
+
+def formula(rng: random.Random, names: list[str], depth: int) -> str:
+    """A random formula over `names`, parenthesized, at most `depth` deep."""
+    roll = rng.random()
+    if depth == 0 or roll < 0.15:
+        return rng.choice(names)
+    if roll < 0.35:
+        return "~" + formula(rng, names, depth - 1)
+    left = formula(rng, names, depth - 1)
+    right = formula(rng, names, depth - 1)
+    return f"({left} {rng.choice(OPERATORS)} {right})"
+
+
+def inputs(rng: random.Random) -> list[str]:
+    return [f"{name} := {rng.randint(0, 1)}\n" for name in INPUTS]
+
+
+def wide(rng: random.Random, scale: float) -> Workload:
+    """One expression with many operands at the top level."""
+    terms = [rng.choice(INPUTS) for _ in range(int(20_000 * scale))]
+    parts = [terms[0]]
+    for term in terms[1:]:
+        parts.append(f" {rng.choice(['^', 'v', '!='])} {term}")
+    return Workload("wide", inputs(rng) + ["".join(parts) + "\n"])
+
+
+def deep(rng: random.Random, scale: float) -> Workload:
+    """One expression of deeply nested parentheses."""
+    depth = int(3_000 * scale)
+    opening = "".join(
+        f"{'~' if rng.random() < 0.2 else ''}({rng.choice(INPUTS)} "
+        f"{rng.choice(OPERATORS)} "
+        for _ in range(depth)
+    )
+    closing = rng.choice(INPUTS) + ")" * depth + "\n"
+    return Workload("deep", inputs(rng) + [opening + closing])
+
+
+def chain(rng: random.Random, scale: float) -> Workload:
+    """Long chains of definitions, each reading the one before."""
+    lines = inputs(rng) + ["V_0 := In_0\n"]
+    for i in range(1, int(20_000 * scale)):
+        operator = rng.choice(OPERATORS)
+        lines.append(f"V_{i} := V_{i - 1} {operator} {rng.choice(INPUTS)}\n")
+        if i % 1_000 == 0:
+            lines.append(f"V_{i}\n")
+    return Workload("chain", lines)
+
+
+FUNCTIONS = [
+    "NAND(a, b) := ~(a ^ b)\n",
+    "MAJ(a, b, c) := a ^ b v a ^ c v b ^ c\n",
+    "MUX(s, a, b) := s ^ a v ~s ^ b\n",
+    "PARITY(a, b, c, d) := a != b != c != d\n",
+    "SAME(a, b) := a <=> b\n",
+]
+ARITY = {"NAND": 2, "MAJ": 3, "MUX": 3, "PARITY": 4, "SAME": 2}
+
+
+def functions(rng: random.Random, scale: float) -> Workload:
+    """Many calls of a few small user functions."""
+    lines = inputs(rng) + FUNCTIONS
+    for i in range(int(5_000 * scale)):
+        function = rng.choice(list(ARITY))
+        args = ", ".join(rng.sample(INPUTS, ARITY[function]))
+        lines.append(f"F_{i} := {function}({args})\n")
+        if i % 10 == 9:
+            recent = [f"F_{j}" for j in range(i - 9, i + 1)]
+            lines.append(formula(rng, recent, 3) + "\n")
+    return Workload("functions", lines)
+
+
+def large_file(rng: random.Random, scale: float) -> Workload:
+    """Thousands of assignments and expressions of random formulas.
+
+    Definitions only read the inputs, so the trees that substituting them
+    builds stay small.
+    """
+    lines = inputs(rng)
+    names = list(INPUTS)
+    for i in range(int(5_000 * scale)):
+        if rng.random() < 0.3:
+            lines.append(f"D_{i} := {formula(rng, INPUTS, 5)}\n")
+            names.append(f"D_{i}")
+        else:
+            lines.append(formula(rng, names[-64:], 6) + "\n")
+    return Workload("large_file", lines)
+
+
+def repl(rng: random.Random, scale: float) -> Workload:
+    """An interactive session: short assignments and queries, one per line."""
+    lines = []
+    defined: list[str] = []
+    for i in range(int(3_000 * scale)):
+        if not defined or rng.random() < 0.3:
+            name = rng.choice(INPUTS)
+            lines.append(f"{name} := {rng.randint(0, 1)}")
+            if name not in defined:
+                defined.append(name)
+        elif rng.random() < 0.3:
+            lines.append(f"R_{i} := {formula(rng, defined, 3)}")
+            defined.append(f"R_{i}")
+        else:
+            lines.append(formula(rng, defined, 4))
+    return Workload("repl", lines, interactive=True)
+
+
+GENERATORS = [wide, deep, chain, functions, large_file, repl]
+
+
+def workloads(seed: int = SEED, scale: float = 1.0) -> list[Workload]:
+    """Every workload, each from its own generator seeded by `seed` and its name."""
+    return [
+        generate(random.Random(f"{seed}:{generate.__name__}"), scale)
+        for generate in GENERATORS
+    ]
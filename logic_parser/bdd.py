@@ -0,0 +1,437 @@
+from typing import Iterable, Iterator
+
+from logic_parser.expr import (
+    BinaryExpr,
+    Expr,
+    LiteralExpr,
+    NaryExpr,
+    NoneExpr,
+    UnaryExpr,
+    VariableExpr,
+)
+from logic_parser.token import TokenType
+
+FALSE = 0
+TRUE = 1
+TERMINAL_LEVEL = 1 << 30
+
+
+class Function:
+    """A handle to a node of a `BDD`.
+
+    Handles stay valid across reordering and garbage collection, and two
+    handles from the same manager are equal exactly when they represent the
+    same boolean function, which is a constant time comparison.
+    """
+
+    __slots__ = ("bdd", "node")
+
+    def __init__(self, bdd: "BDD", node: int) -> None:
+        self.bdd = bdd
+        self.node = node
+        bdd._roots[node] = bdd._roots.get(node, 0) + 1
+
+    def __del__(self):
+        roots = self.bdd._roots
+        if (count := roots.get(self.node, 0)) > 1:
+            roots[self.node] = count - 1
+        else:
+            roots.pop(self.node, None)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Function):
+            return NotImplemented
+        return self.bdd is other.bdd and self.node == other.node
+
+    def __hash__(self) -> int:
+        return hash((id(self.bdd), self.node))
+
+    def __repr__(self) -> str:
+        return f"Function(node={self.node})"
+
+    def __invert__(self) -> "Function":
+        return self.bdd.ite(self, self.bdd.false, self.bdd.true)
+
+    def __and__(self, other: "Function") -> "Function":
+        return self.bdd.ite(self, other, self.bdd.false)
+
+    def __or__(self, other: "Function") -> "Function":
+        return self.bdd.ite(self, self.bdd.true, other)
+
+    def __xor__(self, other: "Function") -> "Function":
+        return self.bdd.ite(self, ~other, other)
+
+    def implies(self, other: "Function") -> "Function":
+        return self.bdd.ite(self, other, self.bdd.true)
+
+    def equiv(self, other: "Function") -> "Function":
+        return self.bdd.ite(self, other, ~other)
+
+    @property
+    def is_true(self) -> bool:
+        return self.node == TRUE
+
+    @property
+    def is_false(self) -> bool:
+        return self.node == FALSE
+
+    def count(self, num_vars: int | None = None) -> int:
+        return self.bdd.count(self, num_vars)
+
+    def models(self, care_vars: Iterable[str] | None = None):
+        return self.bdd.models(self, care_vars)
+
+    def cubes(self):
+        return self.bdd.cubes(self)
+
+
+class BDD:
+    """A manager for reduced ordered binary decision diagrams.
+
+    Nodes are integers indexing flat `var`/`low`/`high` lists, with 0 and 1
+    being the terminals. All functions built by a manager share one unique
+    table, so equal functions are the same node. `ite` results are kept in a
+    computed cache that evicts its oldest entries once `cache_size` is
+    reached. Variables are ordered by declaration unless an explicit order
+    is given, and can be reordered later, either to a given order or by
+    sifting.
+    """
+
+    def __init__(self, variables: Iterable[str] = (), cache_size: int = 1 << 16):
+        self.cache_size = cache_size
+        self._names: list[str] = []
+        self._var_index: dict[str, int] = {}
+        self._var_at: list[int] = []
+        self._level_of: list[int] = []
+        self._var: list[int] = [-1, -1]
+        self._low: list[int] = [FALSE, TRUE]
+        self._high: list[int] = [FALSE, TRUE]
+        self._unique: list[dict[tuple[int, int], int]] = []
+        self._free: list[int] = []
+        self._cache: dict[tuple[int, int, int], int] = {}
+        # Number of live `Function` handles per node.
+        self._roots: dict[int, int] = {}
+        self.cache_hits = 0
+        self.cache_misses = 0
+        for name in variables:
+            self.declare(name)
+        self.false = Function(self, FALSE)
+        self.true = Function(self, TRUE)
+
+    def declare(self, name: str) -> int:
+        """Declare `name` below the existing variables, returning its index."""
+        if (index := self._var_index.get(name)) is None:
+            index = self._var_index[name] = len(self._names)
+            self._names.append(name)
+            self._level_of.append(index)
+            self._var_at.append(index)
+            self._unique.append({})
+        return index
+
+    @property
+    def order(self) -> list[str]:
+        """Variable names from the top level to the bottom one."""
+        return [self._names[var] for var in self._var_at]
+
+    def var(self, name: str) -> Function:
+        return Function(self, self._mk(self.declare(name), FALSE, TRUE))
+
+    def __len__(self) -> int:
+        """Number of live internal nodes."""
+        return len(self._mark())
+
+    def _level(self, node: int) -> int:
+        if node <= TRUE:
+            return TERMINAL_LEVEL
+        return self._level_of[self._var[node]]
+
+    def _mk(self, var: int, low: int, high: int) -> int:
+        if low == high:
+            return low
+        table = self._unique[var]
+        if (node := table.get((low, high))) is not None:
+            return node
+        if self._free:
+            node = self._free.pop()
+            self._var[node] = var
+            self._low[node] = low
+            self._high[node] = high
+        else:
+            node = len(self._var)
+            self._var.append(var)
+            self._low.append(low)
+            self._high.append(high)
+        table[(low, high)] = node
+        return node
+
+    def ite(self, f: Function, g: Function, h: Function) -> Function:
+        return Function(self, self._ite(f.node, g.node, h.node))
+
+    def _ite(self, f: int, g: int, h: int) -> int:
+        if f == TRUE:
+            return g
+        if f == FALSE:
+            return h
+        if g == h:
+            return g
+        if g == TRUE and h == FALSE:
+            return f
+
+        key = (f, g, h)
+        if (result := self._cache.get(key)) is not None:
+            self.cache_hits += 1
+            return result
+        self.cache_misses += 1
+
+        level = min(self._level(f), self._level(g), self._level(h))
+        var = self._var_at[level]
+        f0, f1 = self._cofactors(f, level)
+        g0, g1 = self._cofactors(g, level)
+        h0, h1 = self._cofactors(h, level)
+        result = self._mk(var, self._ite(f0, g0, h0), self._ite(f1, g1, h1))
+
+        if len(self._cache) >= self.cache_size:
+            del self._cache[next(iter(self._cache))]
+        self._cache[key] = result
+        return result
+
+    def _cofactors(self, node: int, level: int) -> tuple[int, int]:
+        if self._level(node) == level:
+            return self._low[node], self._high[node]
+        return node, node
+
+    def add_expr(self, expr: Expr) -> Function:
+        """Build the BDD of `expr`, declaring its variables as needed."""
+        nodes: dict[int, int] = {}
+        keep: list[Expr] = []
+        stack: list[tuple[Expr, bool]] = [(expr, False)]
+        while stack:
+            node, expanded = stack.pop()
+            if id(node) in nodes:
+                continue
+            if isinstance(node, UnaryExpr) and not expanded:
+                stack.append((node, True))
+                stack.append((node.operand, False))
+            elif isinstance(node, BinaryExpr) and not expanded:
+                stack.append((node, True))
+                stack.append((node.l_operand, False))
+                stack.append((node.r_operand, False))
+            elif isinstance(node, NaryExpr) and not expanded:
+                stack.append((node, True))
+                stack.extend((operand, False) for operand in reversed(node.operands))
+            else:
+                keep.append(node)
+                nodes[id(node)] = self._build_node(node, nodes)
+        return Function(self, nodes[id(expr)])
+
+    def _build_node(self, node: Expr, nodes: dict[int, int]) -> int:
+        if isinstance(node, LiteralExpr):
+            return TRUE if node.value else FALSE
+        if isinstance(node, VariableExpr):
+            return self._mk(self.declare(node.name), FALSE, TRUE)
+        if isinstance(node, UnaryExpr):
+            if node.operator != TokenType.NOT:
+                raise NotImplementedError(f"Operator {node.operator} not implemented.")
+            return self._ite(nodes[id(node.operand)], FALSE, TRUE)
+        if isinstance(node, BinaryExpr):
+            a = nodes[id(node.r_operand)]
+            b = nodes[id(node.l_operand)]
+            match node.operator:
+                case TokenType.AND:
+                    return self._ite(a, b, FALSE)
+                case TokenType.OR:
+                    return self._ite(a, TRUE, b)
+                case TokenType.XOR:
+                    return self._ite(a, self._ite(b, FALSE, TRUE), b)
+                case TokenType.BICONDITIONAL:
+                    return self._ite(a, b, self._ite(b, FALSE, TRUE))
+                case TokenType.IMPLICATION:
+                    return self._ite(a, b, TRUE)
+                case _:
+                    raise NotImplementedError(
+                        f"Operator {node.operator} not implemented."
+                    )
+        if isinstance(node, NaryExpr):
+            operands = [nodes[id(operand)] for operand in node.operands]
+            result = TRUE if node.operator == TokenType.AND else FALSE
+            for operand in operands:
+                if node.operator == TokenType.AND:
+                    result = self._ite(result, operand, FALSE)
+                elif node.operator == TokenType.OR:
+                    result = self._ite(result, TRUE, operand)
+                else:
+                    raise NotImplementedError(
+                        f"Operator {node.operator} not implemented."
+                    )
+            return result
+        if isinstance(node, NoneExpr):
+            raise ValueError("Cannot build a BDD of an empty expression")
+        raise NotImplementedError(f"Expression {type(node).__name__} not supported.")
+
+    def count(self, f: Function, num_vars: int | None = None) -> int:
+        """Number of satisfying assignments over the first `num_vars` levels.
+
+        Defaults to all declared variables; `num_vars` must not be smaller
+        than the deepest level `f` depends on.
+        """
+        if num_vars is None:
+            num_vars = len(self._names)
+
+        def level(node: int) -> int:
+            return num_vars if node <= TRUE else self._level(node)
+
+        counts: dict[int, int] = {FALSE: 0, TRUE: 1}
+        stack = [f.node]
+        while stack:
+            node = stack[-1]
+            if node in counts:
+                stack.pop()
+                continue
+            low, high = self._low[node], self._high[node]
+            if low not in counts or high not in counts:
+                stack.extend(child for child in (low, high) if child not in counts)
+                continue
+            stack.pop()
+            here = level(node)
+            counts[node] = (counts[low] << (level(low) - here - 1)) + (
+                counts[high] << (level(high) - here - 1)
+            )
+        return counts[f.node] << level(f.node)
+
+    def cubes(self, f: Function) -> Iterator[dict[str, bool]]:
+        """Yield the paths to TRUE as partial assignments (disjoint cubes)."""
+        stack: list[tuple[int, dict[str, bool]]] = [(f.node, {})]
+        while stack:
+            node, cube = stack.pop()
+            if node == FALSE:
+                continue
+            if node == TRUE:
+                yield cube
+                continue
+            name = self._names[self._var[node]]
+            stack.append((self._high[node], {**cube, name: True}))
+            stack.append((self._low[node], {**cube, name: False}))
+
+    def models(
+        self, f: Function, care_vars: Iterable[str] | None = None
+    ) -> Iterator[dict[str, bool]]:
+        """Yield every satisfying assignment over `care_vars`.
+
+        `care_vars` defaults to all declared variables and must include
+        every variable `f` depends on.
+        """
+        names = list(self.order if care_vars is None else care_vars)
+        for cube in self.cubes(f):
+            if missing := set(cube) - set(names):
+                raise ValueError(f"Care variables miss {sorted(missing)}")
+            free = [name for name in names if name not in cube]
+            for bits in range(1 << len(free)):
+                model = dict(cube)
+                for i, name in enumerate(free):
+                    model[name] = bool(bits >> i & 1)
+                yield {name: model[name] for name in names}
+
+    def support(self, f: Function) -> list[str]:
+        levels = {self._level(node) for node in self._mark([f.node])}
+        return [self._names[self._var_at[level]] for level in sorted(levels)]
+
+    def _mark(self, roots: Iterable[int] | None = None) -> set[int]:
+        if roots is None:
+            roots = list(self._roots)
+        marked: set[int] = set()
+        stack = [node for node in roots if node > TRUE]
+        while stack:
+            node = stack.pop()
+            if node in marked:
+                continue
+            marked.add(node)
+            for child in (self._low[node], self._high[node]):
+                if child > TRUE and child not in marked:
+                    stack.append(child)
+        return marked
+
+    def collect_garbage(self):
+        """Free the nodes unreachable from live `Function` handles."""
+        live = self._mark()
+        for table in self._unique:
+            for key, node in list(table.items()):
+                if node not in live:
+                    del table[key]
+                    self._free.append(node)
+        self._cache.clear()
+
+    def _swap(self, level: int):
+        """Swap the variables at `level` and `level + 1` in place.
+
+        Nodes keep their ids and their functions, so handles and cached
+        counts stay valid.
+        """
+        x = self._var_at[level]
+        y = self._var_at[level + 1]
+        self._var_at[level], self._var_at[level + 1] = y, x
+        self._level_of[x], self._level_of[y] = level + 1, level
+
+        x_table, y_table = self._unique[x], self._unique[y]
+        moved = []
+        for key, node in list(x_table.items()):
+            low, high = key
+            if self._var[low] == y or self._var[high] == y:
+                moved.append(node)
+                del x_table[key]
+
+        for node in moved:
+            f0, f1 = self._low[node], self._high[node]
+            f00, f01 = (
+                (self._low[f0], self._high[f0]) if self._var[f0] == y else (f0, f0)
+            )
+            f10, f11 = (
+                (self._low[f1], self._high[f1]) if self._var[f1] == y else (f1, f1)
+            )
+            low = self._mk(x, f00, f10)
+            high = self._mk(x, f01, f11)
+            self._var[node] = y
+            self._low[node] = low
+            self._high[node] = high
+            y_table[(low, high)] = node
+
+    def reorder(self, order: list[str] | None = None, max_growth: float = 1.2):
+        """Reorder the variables to `order`, or by sifting if no order is given.
+
+        Sifting moves each variable, largest level first, through every
+        position and keeps it where the number of live nodes is smallest,
+        giving up on a direction once the size exceeds `max_growth` times
+        the best size seen.
+        """
+        self.collect_garbage()
+        if order is not None:
+            if sorted(order) != sorted(self._names):
+                raise ValueError("Order must be a permutation of the declared variables")
+            for target, name in enumerate(order):
+                while (level := self._level_of[self._var_index[name]]) > target:
+                    self._swap(level - 1)
+        else:
+            self._sift(max_growth)
+        self.collect_garbage()
+
+    def _sift(self, max_growth: float):
+        last = len(self._names) - 1
+        by_size = sorted(
+            range(len(self._names)), key=lambda var: len(self._unique[var]), reverse=True
+        )
+        for var in by_size:
+            best_size = len(self)
+            best_level = self._level_of[var]
+            for step in (1, -1):
+                while 0 <= self._level_of[var] + step <= last:
+                    level = self._level_of[var]
+                    self._swap(level if step == 1 else level - 1)
+                    size = len(self)
+                    if size < best_size:
+                        best_size, best_level = size, self._level_of[var]
+                    elif size > max_growth * best_size:
+                        break
+            while self._level_of[var] < best_level:
+                self._swap(self._level_of[var])
+            while self._level_of[var] > best_level:
+                self._swap(self._level_of[var] - 1)
+            self.collect_garbage()
@@ -0,0 +1,215 @@
+import mmap
+import struct
+import sys
+from array import array
+from typing import BinaryIO, Mapping, Sequence
+
+from logic_parser.expr import (
+    BinaryExpr,
+    Expr,
+    LiteralExpr,
+    NaryExpr,
+    UnaryExpr,
+    VariableExpr,
+)
+from logic_parser.token import TokenType
+
+# Opcodes. LOAD takes a variable index and the n-ary ones an operand count
+# from the argument array, in the order the opcodes appear.
+PUSH_FALSE = 0
+PUSH_TRUE = 1
+LOAD = 2
+NOT = 3
+AND = 4
+OR = 5
+XOR = 6
+IMPLICATION = 7
+BICONDITIONAL = 8
+NARY_AND = 9
+NARY_OR = 10
+
+BINARY_OPCODES = {
+    TokenType.AND: AND,
+    TokenType.OR: OR,
+    TokenType.XOR: XOR,
+    TokenType.IMPLICATION: IMPLICATION,
+    TokenType.BICONDITIONAL: BICONDITIONAL,
+}
+OPCODE_OPERATORS = {opcode: operator for operator, opcode in BINARY_OPCODES.items()}
+
+# File layout: magic, then the name, code and argument counts as
+# little-endian uint32, then the names (UTF-8, each followed by a NUL), the
+# opcodes padded to a multiple of 4 bytes, and the arguments as
+# little-endian uint32.
+MAGIC = b"LPBC\x01\x00\x00\x00"
+HEADER = struct.Struct("<8sIII")
+
+
+class Program:
+    """An expression compiled to postfix opcodes for a stack machine.
+
+    Each node takes one byte in `code`, and each variable read or n-ary node
+    four more in `args`, instead of a dataclass instance per node. Shared
+    subtrees are compiled once per use. `code` and `args` may be arrays or
+    read-only views of a mapped file (see `load`).
+    """
+
+    def __init__(
+        self,
+        code: Sequence[int],
+        args: Sequence[int],
+        names: list[str],
+        buffer: mmap.mmap | None = None,
+    ) -> None:
+        self.code = code
+        self.args = args
+        self.names = names
+        # Keeps the mapping a loaded program reads from open.
+        self.buffer = buffer
+
+    def __len__(self) -> int:
+        return len(self.code)
+
+    def nbytes(self) -> int:
+        return len(self.code) + 4 * len(self.args)
+
+    def eval(self, env: Mapping[str, bool] | None = None) -> bool:
+        values = []
+        for name in self.names:
+            if env is None or name not in env:
+                raise ValueError(f"No value found for variable name '{name}'")
+            values.append(bool(env[name]))
+        return self.run(values)
+
+    def run(self, values: Sequence[bool]) -> bool:
+        """Evaluate with `values[i]` as the value of `names[i]`."""
+        stack: list[bool] = []
+        push = stack.append
+        pop = stack.pop
+        args = iter(self.args)
+        for opcode in self.code:
+            if opcode == LOAD:
+                push(values[next(args)])
+            elif opcode == AND:
+                b = pop()
+                stack[-1] = stack[-1] and b
+            elif opcode == OR:
+                b = pop()
+                stack[-1] = stack[-1] or b
+            elif opcode == NOT:
+                stack[-1] = not stack[-1]
+            elif opcode == XOR:
+                b = pop()
+                stack[-1] = stack[-1] != b
+            elif opcode == IMPLICATION:
+                b = pop()
+                stack[-1] = not stack[-1] or b
+            elif opcode == BICONDITIONAL:
+                b = pop()
+                stack[-1] = stack[-1] == b
+            elif opcode == PUSH_TRUE:
+                push(True)
+            elif opcode == PUSH_FALSE:
+                push(False)
+            elif opcode == NARY_AND or opcode == NARY_OR:
+                count = next(args)
+                operands = stack[len(stack) - count :]
+                del stack[len(stack) - count :]
+                push(all(operands) if opcode == NARY_AND else any(operands))
+            else:
+                raise ValueError(f"Invalid opcode {opcode}")
+        return stack.pop()
+
+    def to_expr(self) -> Expr:
+        stack: list[Expr] = []
+        args = iter(self.args)
+        for opcode in self.code:
+            if opcode == LOAD:
+                stack.append(VariableExpr(self.names[next(args)]))
+            elif opcode in (PUSH_FALSE, PUSH_TRUE):
+                stack.append(LiteralExpr(opcode == PUSH_TRUE))
+            elif opcode == NOT:
+                stack.append(UnaryExpr(TokenType.NOT, stack.pop()))
+            elif opcode in OPCODE_OPERATORS:
+                right = stack.pop()
+                stack.append(BinaryExpr(OPCODE_OPERATORS[opcode], stack.pop(), right))
+            elif opcode in (NARY_AND, NARY_OR):
+                count = next(args)
+                operands = stack[len(stack) - count :]
+                del stack[len(stack) - count :]
+                operator = TokenType.AND if opcode == NARY_AND else TokenType.OR
+                stack.append(NaryExpr(operator, operands))
+            else:
+                raise ValueError(f"Invalid opcode {opcode}")
+        return stack.pop()
+
+    def dump(self, f: BinaryIO):
+        names = b"".join(name.encode() + b"\0" for name in self.names)
+        f.write(HEADER.pack(MAGIC, len(names), len(self.code), len(self.args)))
+        f.write(names)
+        f.write(bytes(self.code))
+        f.write(bytes(-(len(names) + len(self.code)) % 4))
+        args = array("I", self.args)
+        if sys.byteorder != "little":
+            args.byteswap()
+        f.write(args.tobytes())
+
+
+def compile_expr(expr: Expr, names: list[str] | None = None) -> Program:
+    """Compile `expr`, numbering variables in `names` order, then by appearance."""
+    code = array("B")
+    args = array("I")
+    names = list(names or [])
+    index = {name: i for i, name in enumerate(names)}
+    stack: list[tuple[Expr, bool]] = [(expr, False)]
+    while stack:
+        node, expanded = stack.pop()
+        if isinstance(node, VariableExpr):
+            if node.name not in index:
+                index[node.name] = len(names)
+                names.append(node.name)
+            code.append(LOAD)
+            args.append(index[node.name])
+        elif isinstance(node, LiteralExpr):
+            code.append(PUSH_TRUE if node.value else PUSH_FALSE)
+        elif expanded:
+            if isinstance(node, UnaryExpr):
+                code.append(NOT)
+            elif isinstance(node, BinaryExpr):
+                code.append(BINARY_OPCODES[node.operator])
+            else:
+                code.append(NARY_AND if node.operator == TokenType.AND else NARY_OR)
+                args.append(len(node.operands))
+        elif isinstance(node, UnaryExpr) and node.operator == TokenType.NOT:
+            stack.append((node, True))
+            stack.append((node.operand, False))
+        elif isinstance(node, BinaryExpr) and node.operator in BINARY_OPCODES:
+            stack.append((node, True))
+            stack.append((node.l_operand, False))
+            stack.append((node.r_operand, False))
+        elif isinstance(node, NaryExpr) and node.operator in (TokenType.AND, TokenType.OR):
+            stack.append((node, True))
+            stack.extend((operand, False) for operand in reversed(node.operands))
+        else:
+            raise ValueError(f"Cannot compile {type(node).__name__}")
+    return Program(code, args, names)
+
+
+def load(path: str) -> Program:
+    """Map a program written by `Program.dump` without copying its code."""
+    with open(path, "rb") as f:
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    view = memoryview(buffer)
+    magic, names_size, code_size, args_size = HEADER.unpack_from(view)
+    if magic != MAGIC:
+        raise ValueError(f"{path} is not a compiled logic program")
+    offset = HEADER.size
+    names = bytes(view[offset : offset + names_size]).decode().split("\0")[:-1]
+    offset += names_size
+    code = view[offset : offset + code_size]
+    offset += code_size + -(names_size + code_size) % 4
+    args = view[offset : offset + 4 * args_size].cast("I")
+    if sys.byteorder != "little":
+        args = array("I", args)
+        args.byteswap()
+    return Program(code, args, names, buffer)
@@ -0,0 +1,319 @@
+"""Parsed logic files kept on disk, so unchanged files are not parsed again."""
+
+import hashlib
+import json
+import os
+import struct
+import sys
+from array import array
+from dataclasses import dataclass, field
+from functools import lru_cache
+from itertools import accumulate
+from pathlib import Path
+
+from logic_parser.bytecode import (
+    BINARY_OPCODES,
+    LOAD,
+    NARY_AND,
+    NARY_OR,
+    NOT,
+    OPCODE_OPERATORS,
+    PUSH_FALSE,
+    PUSH_TRUE,
+)
+from logic_parser.expr import (
+    BinaryExpr,
+    Expr,
+    LiteralExpr,
+    NaryExpr,
+    NoneExpr,
+    UnaryExpr,
+    VariableExpr,
+)
+from logic_parser.parser import Function
+from logic_parser.token import Token, TokenType
+
+# Node kinds are the opcodes of `logic_parser.bytecode`, plus one for the
+# `NoneExpr` a file may end with.
+NONE = 255
+NARY_KINDS = {TokenType.AND: NARY_AND, TokenType.OR: NARY_OR}
+
+# Entry layout: magic, the modification time of the file in nanoseconds,
+# the SHA-256 digests of its content and of the parser sources, then the
+# sizes in bytes of the body's parts. The body holds the node kinds, one byte each,
+# the node arguments and the statement indexes as little-endian 32-bit
+# integers, and the names, variables and functions as UTF-8 JSON. Nothing
+# in an entry is executed when it is read.
+MAGIC = b"LPCF\x02\x00\x00\x00"
+HEADER = struct.Struct("<8sq32s32s")
+SIZES = struct.Struct("<IIII")
+
+# The modules whose code decides what a file parses to.
+SOURCES = (
+    "token.py",
+    "tokenizer.py",
+    "parser.py",
+    "frame.py",
+    "memo.py",
+    "expr.py",
+    "cache.py",
+)
+
+
+def default_directory() -> Path:
+    """`$LOGIC_PARSER_CACHE_DIR`, or `logic_parser` in the user cache directory."""
+    if directory := os.environ.get("LOGIC_PARSER_CACHE_DIR"):
+        return Path(directory)
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "logic_parser"
+
+
+@lru_cache(maxsize=None)
+def parser_version() -> bytes:
+    """Digest of the parser sources, so entries written by other versions miss."""
+    digest = hashlib.sha256(sys.version.encode())
+    package = Path(__file__).parent
+    for name in SOURCES:
+        digest.update((package / name).read_bytes())
+    return digest.digest()
+
+
+def content_digest(path: str) -> bytes:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(1 << 16):
+            digest.update(chunk)
+    return digest.digest()
+
+
+class NodeTable:
+    """Expressions flattened into an array of node kinds and one of arguments.
+
+    Every distinct node is stored once, after its operands, so the sharing
+    that parsing creates by substituting variables is kept. A variable takes
+    its name index as argument, NOT its operand, binary nodes their left and
+    right operands and n-ary nodes their operand count, then the operands.
+    """
+
+    def __init__(self) -> None:
+        self.kinds = array("B")
+        self.args = array("I")
+        self.names: list[str] = []
+        self.name_index: dict[str, int] = {}
+        self.index: dict[int, int] = {}
+        # Keeps the added nodes alive, so their ids stay unique.
+        self.nodes: list[Expr] = []
+
+    def __len__(self) -> int:
+        return len(self.kinds)
+
+    def add(self, expr: Expr) -> int:
+        """Add `expr` and the nodes under it; return the index of `expr`."""
+        index = self.index
+        stack: list[tuple[Expr, bool]] = [(expr, False)]
+        while stack:
+            node, expanded = stack.pop()
+            if id(node) in index:
+                continue
+            if isinstance(node, UnaryExpr):
+                children = [node.operand]
+            elif isinstance(node, BinaryExpr):
+                children = [node.r_operand, node.l_operand]
+            elif isinstance(node, NaryExpr):
+                children = node.operands
+            else:
+                children = []
+            if not expanded and children:
+                stack.append((node, True))
+                stack.extend((child, False) for child in children)
+                continue
+            args = [index[id(child)] for child in children]
+            if isinstance(node, VariableExpr):
+                if node.name not in self.name_index:
+                    self.name_index[node.name] = len(self.names)
+                    self.names.append(node.name)
+                kind, args = LOAD, [self.name_index[node.name]]
+            elif isinstance(node, LiteralExpr):
+                kind = PUSH_TRUE if node.value else PUSH_FALSE
+            elif isinstance(node, NoneExpr):
+                kind = NONE
+            elif isinstance(node, UnaryExpr) and node.operator == TokenType.NOT:
+                kind = NOT
+            elif isinstance(node, BinaryExpr) and node.operator in BINARY_OPCODES:
+                kind = BINARY_OPCODES[node.operator]
+            elif isinstance(node, NaryExpr) and node.operator in NARY_KINDS:
+                kind = NARY_KINDS[node.operator]
+                args = [len(args)] + args
+            else:
+                raise ValueError(f"Cannot cache {type(node).__name__}")
+            self.kinds.append(kind)
+            self.args.extend(args)
+            index[id(node)] = len(self.nodes)
+            self.nodes.append(node)
+        return index[id(expr)]
+
+
+def build_nodes(kinds: bytes, args: array, names: list[str]) -> list[Expr]:
+    """The nodes of a `NodeTable`, rebuilt in order."""
+    nodes: list[Expr] = []
+    position = 0
+    for kind in kinds:
+        if kind == LOAD:
+            node = VariableExpr(names[args[position]])
+            position += 1
+        elif kind == NOT:
+            node = UnaryExpr(TokenType.NOT, nodes[args[position]])
+            position += 1
+        elif kind in OPCODE_OPERATORS:
+            left, right = nodes[args[position]], nodes[args[position + 1]]
+            node = BinaryExpr(OPCODE_OPERATORS[kind], left, right)
+            position += 2
+        elif kind in (NARY_AND, NARY_OR):
+            count = args[position]
+            operands = [nodes[i] for i in args[position + 1 : position + 1 + count]]
+            operator = TokenType.AND if kind == NARY_AND else TokenType.OR
+            node = NaryExpr(operator, operands)
+            position += 1 + count
+        elif kind in (PUSH_FALSE, PUSH_TRUE):
+            node = LiteralExpr(kind == PUSH_TRUE)
+        elif kind == NONE:
+            node = NoneExpr()
+        else:
+            raise ValueError(f"Invalid node kind {kind}")
+        nodes.append(node)
+    return nodes
+
+
+def _token(token: str, type_name: str, line: int, line_pos: int, value) -> Token:
+    return Token(token, TokenType[type_name], line, line_pos, value)
+
+
+def _integers(data: bytes) -> array:
+    """Little-endian 32-bit integers, as written by `_integer_bytes`."""
+    integers = array("I")
+    integers.frombytes(data)
+    if sys.byteorder == "big":
+        integers.byteswap()
+    return integers
+
+
+def _integer_bytes(integers: array | list[int]) -> bytes:
+    integers = array("I", integers)
+    if sys.byteorder == "big":
+        integers.byteswap()
+    return integers.tobytes()
+
+
+@dataclass
+class CompiledFile:
+    """What parsing a file produced: its statements, variables and functions."""
+
+    statements: list[Expr] = field(default_factory=list)
+    memory: dict[str, Expr] = field(default_factory=dict)
+    functions: dict[str, Function] = field(default_factory=dict)
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+
+
+class Cache:
+    """Parsed files stored in `directory`, one entry per file path.
+
+    An entry is used only while the modification time and content digest of
+    the file, and the parser version, are the ones it was written with;
+    otherwise it is a miss and is replaced by the next `store`.
+    """
+
+    def __init__(self, directory: str | Path | None = None) -> None:
+        self.directory = Path(directory) if directory else default_directory()
+        self.stats = CacheStats()
+
+    def entry_path(self, file_path: str) -> Path:
+        name = hashlib.sha256(os.path.abspath(file_path).encode()).hexdigest()
+        return self.directory / f"{name}.lpcf"
+
+    def key(self, file_path: str) -> tuple[int, bytes, bytes]:
+        """`(mtime, content digest, parser version)` of `file_path` as it is now."""
+        mtime = os.stat(file_path).st_mtime_ns
+        return mtime, content_digest(file_path), parser_version()
+
+    def load(self, file_path: str, key=None) -> CompiledFile | None:
+        """The stored parse of `file_path`, or None if it is missing or stale."""
+        compiled = self._read(file_path, key or self.key(file_path))
+        if compiled is None:
+            self.stats.misses += 1
+        else:
+            self.stats.hits += 1
+        return compiled
+
+    def _read(self, file_path: str, key) -> CompiledFile | None:
+        try:
+            with open(self.entry_path(file_path), "rb") as f:
+                magic, mtime, digest, version = HEADER.unpack(f.read(HEADER.size))
+                if magic != MAGIC or (mtime, digest, version) != key:
+                    return None
+                sizes = SIZES.unpack(f.read(SIZES.size))
+                body = f.read()
+            if len(body) != sum(sizes):
+                raise ValueError("Damaged cache entry")
+            ends = list(accumulate(sizes))
+            kinds, args, statements, metadata = (
+                body[start:end] for start, end in zip([0] + ends, ends)
+            )
+            names, memory, functions = json.loads(metadata)
+            nodes = build_nodes(kinds, _integers(args), names)
+            return CompiledFile(
+                [nodes[i] for i in _integers(statements)],
+                {name: nodes[i] for name, i in memory},
+                {
+                    name: Function(name, params, [_token(*t) for t in tokens])
+                    for name, params, tokens in functions
+                },
+            )
+        except (OSError, ValueError, struct.error, IndexError, KeyError, TypeError):
+            return None
+
+    def store(self, file_path: str, compiled: CompiledFile, key=None) -> bool:
+        """Write the entry of `file_path`, keyed by `key` (default: `self.key`).
+
+        Returns whether it was written; a cache that cannot be written is
+        not an error.
+        """
+        table = NodeTable()
+        statements = [table.add(statement) for statement in compiled.statements]
+        memory = [(name, table.add(value)) for name, value in compiled.memory.items()]
+        functions = [
+            (
+                name,
+                function.args,
+                [
+                    (t.token, t.type.name, t.line, t.line_pos, t.value)
+                    for t in function.tokens
+                ],
+            )
+            for name, function in compiled.functions.items()
+        ]
+        metadata = json.dumps([table.names, memory, functions]).encode()
+        body = [
+            table.kinds.tobytes(),
+            _integer_bytes(table.args),
+            _integer_bytes(statements),
+            metadata,
+        ]
+        mtime, digest, version = key or self.key(file_path)
+        path = self.entry_path(file_path)
+        temporary = path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            with open(temporary, "wb") as f:
+                f.write(HEADER.pack(MAGIC, mtime, digest, version))
+                f.write(SIZES.pack(*map(len, body)))
+                f.write(b"".join(body))
+            os.replace(temporary, path)
+        except OSError:
+            temporary.unlink(missing_ok=True)
+            return False
+        return True
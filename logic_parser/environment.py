@@ -0,0 +1,166 @@
+from dataclasses import dataclass
+from typing import Iterable, Iterator, MutableMapping
+
+from logic_parser.expr import (
+    BinaryExpr,
+    Expr,
+    LiteralExpr,
+    NaryExpr,
+    UnaryExpr,
+    VariableExpr,
+    collect_variables,
+    evaluate,
+)
+
+
+@dataclass
+class EnvironmentStats:
+    recomputed: int = 0
+    cache_hits: int = 0
+    invalidated: int = 0
+
+
+class Environment(MutableMapping[str, bool]):
+    """Variable definitions with spreadsheet semantics.
+
+    Each name maps to the expression it was assigned, in which the names it
+    reads are kept as `VariableExpr` references instead of being replaced by
+    their values. Values are computed lazily and cached; assigning a name
+    marks it and everything that transitively reads it dirty, and the next
+    lookup recomputes only the dirty names its value depends on.
+
+    Reading a name gives its current value, so an environment can be passed
+    to `Expr.eval` directly, and used as `Parser.memory`, in which case
+    assignments parsed by the parser are recorded as definitions.
+    """
+
+    def __init__(self, definitions: dict[str, Expr | bool] | None = None) -> None:
+        self.definitions: dict[str, Expr] = {}
+        self.dependencies: dict[str, set[str]] = {}
+        self.dependents: dict[str, set[str]] = {}
+        self.values: dict[str, bool] = {}
+        self.dirty: set[str] = set()
+        self.stats = EnvironmentStats()
+        for name, value in (definitions or {}).items():
+            self[name] = value
+
+    def __getitem__(self, name: str) -> bool:
+        if name not in self.definitions:
+            raise KeyError(name)
+        if name in self.dirty:
+            self._refresh(name)
+        else:
+            self.stats.cache_hits += 1
+        return self.values[name]
+
+    def __setitem__(self, name: str, value: Expr | bool):
+        expr = LiteralExpr(value) if isinstance(value, bool) else value
+        reads = set(collect_variables(expr))
+        # A definition reading its own name, directly or through others,
+        # uses the value the name has before this assignment.
+        if cyclic := reads & ({name} | self.affected_by(name)):
+            expr = _substitute(expr, {read: self[read] for read in cyclic})
+            reads -= cyclic
+
+        for read in self.dependencies.get(name, ()):
+            self.dependents[read].discard(name)
+        for read in reads:
+            self.dependents.setdefault(read, set()).add(name)
+        self.dependencies[name] = reads
+        self.definitions[name] = expr
+        self.values.pop(name, None)
+        self._invalidate(name)
+
+    def __delitem__(self, name: str):
+        del self.definitions[name]
+        for read in self.dependencies.pop(name):
+            self.dependents[read].discard(name)
+        self.values.pop(name, None)
+        self._invalidate(name)
+        self.dirty.discard(name)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.definitions
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.definitions)
+
+    def __len__(self) -> int:
+        return len(self.definitions)
+
+    def definition(self, name: str) -> Expr:
+        return self.definitions[name]
+
+    def affected_by(self, name: str) -> set[str]:
+        """Names whose value depends, directly or not, on `name`."""
+        return self._closure(self.dependents.get(name, ()), self.dependents)
+
+    def _invalidate(self, name: str):
+        for dependent in {name} | self.affected_by(name):
+            if dependent in self.definitions and dependent not in self.dirty:
+                self.dirty.add(dependent)
+                self.stats.invalidated += 1
+
+    def _refresh(self, name: str):
+        stack = [name]
+        while stack:
+            current = stack[-1]
+            if current not in self.dirty:
+                stack.pop()
+                continue
+            if pending := [
+                read for read in self.dependencies[current] if read in self.dirty
+            ]:
+                stack.extend(pending)
+                continue
+            stack.pop()
+            self.values[current] = bool(evaluate(self.definitions[current], self))
+            self.dirty.discard(current)
+            self.stats.recomputed += 1
+
+    @staticmethod
+    def _closure(start: Iterable[str], edges: dict[str, set[str]]) -> set[str]:
+        seen: set[str] = set()
+        stack = list(start)
+        while stack:
+            name = stack.pop()
+            if name not in seen:
+                seen.add(name)
+                stack.extend(edges.get(name, ()))
+        return seen
+
+
+def _substitute(expr: Expr, values: dict[str, bool]) -> Expr:
+    """Copy of `expr` with the variables in `values` replaced by literals."""
+    built: dict[int, Expr] = {}
+    stack: list[tuple[Expr, bool]] = [(expr, False)]
+    while stack:
+        node, expanded = stack.pop()
+        if id(node) in built:
+            continue
+        children: list[Expr] = []
+        if isinstance(node, UnaryExpr):
+            children = [node.operand]
+        elif isinstance(node, BinaryExpr):
+            children = [node.r_operand, node.l_operand]
+        elif isinstance(node, NaryExpr):
+            children = node.operands
+        if not expanded and children:
+            stack.append((node, True))
+            stack.extend((child, False) for child in children)
+            continue
+        if isinstance(node, VariableExpr) and node.name in values:
+            built[id(node)] = LiteralExpr(values[node.name])
+        elif isinstance(node, UnaryExpr):
+            built[id(node)] = UnaryExpr(node.operator, built[id(node.operand)])
+        elif isinstance(node, BinaryExpr):
+            built[id(node)] = BinaryExpr(
+                node.operator, built[id(node.r_operand)], built[id(node.l_operand)]
+            )
+        elif isinstance(node, NaryExpr):
+            built[id(node)] = NaryExpr(
+                node.operator, [built[id(operand)] for operand in node.operands]
+            )
+        else:
+            built[id(node)] = node
+    return built[id(expr)]
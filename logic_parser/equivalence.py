@@ -0,0 +1,370 @@
+"""Equivalence of the outputs of two logic files.
+
+Each file is parsed with the names it assigns a 0 or 1, and the names it
+reads without assigning, as free inputs; every other name it assigns is an
+output. The outputs the two files share are compared in three steps:
+
+1. All nodes of both files are simulated on random input patterns, many at
+   once: the value of a node under each pattern is one bit of a Python
+   integer, its signature. Outputs whose signatures differ are known to
+   differ without calling a solver.
+2. Nodes of the second file whose signature equals (or is the complement
+   of) the signature of a node of the first are candidates for being the
+   same function. Going from the inputs up, each candidate is proved equal
+   with the SAT solver and the equality is added to it, which makes the
+   proofs of the nodes above it easy (SAT sweeping). A disproof gives a
+   new pattern that tells the two nodes apart, which is added to the
+   signatures.
+3. Outputs not merged by sweeping are checked with the solver directly.
+
+For each output that differs, the assignment that tells the files apart is
+reduced, one input at a time, to a minimal part that still does so for any
+value of the other inputs.
+"""
+
+import random
+from dataclasses import dataclass, field
+from typing import Iterable
+
+from logic_parser.expr import (
+    BinaryExpr,
+    Expr,
+    LiteralExpr,
+    NaryExpr,
+    UnaryExpr,
+    VariableExpr,
+    collect_variables,
+)
+from logic_parser.parser import Parser
+from logic_parser.sat import Solver, TseitinEncoder
+from logic_parser.token import TokenType
+from logic_parser.tokenizer import tokenize_lines
+
+SEED = 49
+PATTERNS = 1024
+
+
+@dataclass
+class Mismatch:
+    """An output that differs, and a minimal assignment of inputs telling so.
+
+    Every assignment extending `assignment` gives the output different
+    values in the two files; `values` are those it has when the other
+    inputs are 0.
+    """
+
+    output: str
+    assignment: dict[str, bool]
+    values: tuple[bool, bool]
+
+
+@dataclass
+class EquivalenceStats:
+    patterns: int = 0
+    sat_calls: int = 0
+    merged: int = 0
+    # Outputs told apart by simulation, merged by sweeping, and checked by
+    # the solver after sweeping.
+    simulated: int = 0
+    swept: int = 0
+    solved: int = 0
+
+
+@dataclass
+class EquivalenceReport:
+    outputs: list[str]
+    mismatches: list[Mismatch] = field(default_factory=list)
+    only_a: list[str] = field(default_factory=list)
+    only_b: list[str] = field(default_factory=list)
+    stats: EquivalenceStats = field(default_factory=EquivalenceStats)
+
+    @property
+    def equivalent(self) -> bool:
+        return not self.mismatches
+
+    def __bool__(self) -> bool:
+        return self.equivalent
+
+
+class _InputMemory(dict):
+    """Parser memory in which names assigned a 0 or 1 stay free inputs."""
+
+    def __setitem__(self, name: str, value):
+        if isinstance(value, LiteralExpr):
+            value = VariableExpr(name)
+        super().__setitem__(name, value)
+
+
+def file_outputs(lines: Iterable[str]) -> dict[str, Expr]:
+    """The outputs of a logic file, in terms of its inputs."""
+    memory = _InputMemory()
+    parser = Parser(tokenize_lines(lines), memory, free_variables=True)
+    for _ in parser.parse_all():
+        pass
+    return {
+        name: value
+        for name, value in memory.items()
+        if not (isinstance(value, VariableExpr) and value.name == name)
+    }
+
+
+def equivalent(
+    file_a: str,
+    file_b: str,
+    outputs: Iterable[str] | None = None,
+    patterns: int = PATTERNS,
+    seed: int = SEED,
+) -> EquivalenceReport:
+    """Compare the outputs shared by the logic files `file_a` and `file_b`."""
+    with open(file_a, "r") as f:
+        a = file_outputs(f)
+    with open(file_b, "r") as f:
+        b = file_outputs(f)
+    return compare_outputs(a, b, outputs, patterns, seed)
+
+
+def compare_outputs(
+    a: dict[str, Expr],
+    b: dict[str, Expr],
+    outputs: Iterable[str] | None = None,
+    patterns: int = PATTERNS,
+    seed: int = SEED,
+) -> EquivalenceReport:
+    """Compare the expressions of the names in both `a` and `b`, or `outputs`."""
+    names = [name for name in a if name in b]
+    if outputs is not None:
+        wanted = set(outputs)
+        names = [name for name in names if name in wanted]
+    report = EquivalenceReport(
+        names,
+        only_a=[name for name in a if name not in b],
+        only_b=[name for name in b if name not in a],
+    )
+    checker = _Checker([a[n] for n in names], [b[n] for n in names], patterns, seed)
+    checker.run(report)
+    return report
+
+
+def _children(node: Expr) -> list[Expr]:
+    if isinstance(node, UnaryExpr):
+        return [node.operand]
+    if isinstance(node, BinaryExpr):
+        return [node.r_operand, node.l_operand]
+    if isinstance(node, NaryExpr):
+        return node.operands
+    return []
+
+
+def _apply(operator: TokenType, values: list[int], mask: int) -> int:
+    match operator:
+        case TokenType.NOT:
+            return values[0] ^ mask
+        case TokenType.AND:
+            result = mask
+            for value in values:
+                result &= value
+            return result
+        case TokenType.OR:
+            result = 0
+            for value in values:
+                result |= value
+            return result
+        case TokenType.XOR:
+            return values[0] ^ values[1]
+        case TokenType.IMPLICATION:
+            return (values[0] ^ mask) | values[1]
+        case TokenType.BICONDITIONAL:
+            return values[0] ^ values[1] ^ mask
+    raise NotImplementedError(f"Operator {operator} not implemented.")
+
+
+class _Checker:
+    def __init__(self, a: list[Expr], b: list[Expr], patterns: int, seed: int):
+        self.a, self.b = a, b
+        # Nodes of both sides, children before parents, and which side each
+        # node was first reached from.
+        self.order: list[Expr] = []
+        self.from_a: set[int] = set()
+        self._collect(a, True)
+        self._collect(b, False)
+        rng = random.Random(seed)
+        self.inputs = sorted(
+            {node.name for node in self.order if isinstance(node, VariableExpr)}
+        )
+        self.width = patterns
+        self.patterns = {name: rng.getrandbits(patterns) for name in self.inputs}
+        self.signatures = self._simulate(self.patterns, (1 << patterns) - 1)
+        self.encoder = TseitinEncoder()
+        self.solver = Solver()
+        self.fed = 0
+        # Literals of nodes of `b` proved equal to literals of nodes of `a`.
+        self.merged: dict[int, int] = {}
+        self.sat_calls = 0
+
+    def _collect(self, roots: list[Expr], side_a: bool):
+        seen = {id(node) for node in self.order}
+        for root in roots:
+            stack = [(root, False)]
+            while stack:
+                node, expanded = stack.pop()
+                if expanded:
+                    self.order.append(node)
+                    if side_a:
+                        self.from_a.add(id(node))
+                    continue
+                if id(node) in seen:
+                    continue
+                seen.add(id(node))
+                stack.append((node, True))
+                stack.extend((child, False) for child in _children(node))
+
+    def _simulate(self, patterns: dict[str, int], mask: int) -> dict[int, int]:
+        signatures: dict[int, int] = {}
+        for node in self.order:
+            if isinstance(node, VariableExpr):
+                value = patterns[node.name]
+            elif isinstance(node, LiteralExpr):
+                value = mask if node.value else 0
+            else:
+                operator = (
+                    TokenType.NOT if isinstance(node, UnaryExpr) else node.operator
+                )
+                children = [signatures[id(child)] for child in _children(node)]
+                value = _apply(operator, children, mask)
+            signatures[id(node)] = value
+        return signatures
+
+    def _add_pattern(self, assignment: dict[str, bool]):
+        """Append the pattern `assignment` to every signature, as bit 0."""
+        pattern = {name: int(assignment.get(name, False)) for name in self.inputs}
+        bits = self._simulate(pattern, 1)
+        self.width += 1
+        for name, bit in pattern.items():
+            self.patterns[name] = (self.patterns[name] << 1) | bit
+        for key, bit in bits.items():
+            self.signatures[key] = (self.signatures[key] << 1) | bit
+
+    def _literal(self, node: Expr) -> int:
+        literal = self.encoder.encode(node)
+        self._feed()
+        return literal
+
+    def _feed(self):
+        clauses = self.encoder.cnf.clauses
+        for clause in clauses[self.fed :]:
+            self.solver.add_clause(clause)
+        self.fed = len(clauses)
+
+    def _differ(self, x: int, y: int) -> int:
+        """A literal true exactly when the literals `x` and `y` differ."""
+        difference = self.encoder.gate(TokenType.XOR, [x, y])
+        self._feed()
+        return difference
+
+    def _solve(self, assumptions: list[int]) -> dict[str, bool] | None:
+        self.sat_calls += 1
+        if not self.solver.solve(assumptions):
+            return None
+        model = self.solver.model
+        variables = self.encoder.cnf.variables
+        return {name: model.get(variables[name], False) for name in variables}
+
+    def _resolve(self, literal: int) -> int:
+        if literal in self.merged:
+            return self.merged[literal]
+        if -literal in self.merged:
+            return -self.merged[-literal]
+        return literal
+
+    def _sweep(self) -> int:
+        """Merge nodes of `b` into nodes of `a` with the same function."""
+        candidates = [
+            node
+            for node in self.order
+            if id(node) not in self.from_a
+            and not isinstance(node, (VariableExpr, LiteralExpr))
+        ]
+        merged = 0
+        representatives = self._representatives()
+        i = 0
+        while i < len(candidates):
+            node = candidates[i]
+            key, complement = self._normalize(self.signatures[id(node)])
+            if (representative := representatives.get(key)) is None:
+                i += 1
+                continue
+            x = self._literal(representative[0])
+            y = self._literal(node)
+            if complement != representative[1]:
+                y = -y
+            counterexample = self._solve([self._differ(x, y)])
+            if counterexample is None:
+                self.solver.add_clause([-x, y])
+                self.solver.add_clause([x, -y])
+                self.merged[y] = x
+                merged += 1
+                i += 1
+            else:
+                # The pattern separates the two; look at the node again.
+                self._add_pattern(counterexample)
+                representatives = self._representatives()
+        return merged
+
+    def _representatives(self) -> dict[int, tuple[Expr, bool]]:
+        representatives: dict[int, tuple[Expr, bool]] = {}
+        for node in self.order:
+            if id(node) in self.from_a and not isinstance(node, LiteralExpr):
+                key, complement = self._normalize(self.signatures[id(node)])
+                representatives.setdefault(key, (node, complement))
+        return representatives
+
+    def _normalize(self, signature: int) -> tuple[int, bool]:
+        if signature & 1:
+            return signature ^ ((1 << self.width) - 1), True
+        return signature, False
+
+    def _minimize(
+        self, difference: int, assignment: dict[str, bool], support: list[str]
+    ) -> dict[str, bool]:
+        """Drop inputs from `assignment` while it still forces `difference`."""
+        variables = self.encoder.cnf.variables
+        kept = {name: assignment.get(name, False) for name in support}
+        for name in list(kept):
+            rest = [
+                variables[other] if value else -variables[other]
+                for other, value in kept.items()
+                if other != name
+            ]
+            if self._solve(rest + [-difference]) is None:
+                del kept[name]
+        return kept
+
+    def run(self, report: EquivalenceReport):
+        stats = report.stats
+        stats.merged = self._sweep() if self.a else 0
+        for name, a, b in zip(report.outputs, self.a, self.b):
+            x, y = self._literal(a), self._literal(b)
+            signatures_differ = self.signatures[id(a)] != self.signatures[id(b)]
+            if not signatures_differ and self._resolve(y) == x:
+                stats.swept += 1
+                continue
+            difference = self._differ(x, y)
+            if signatures_differ:
+                stats.simulated += 1
+                diff = self.signatures[id(a)] ^ self.signatures[id(b)]
+                bit = (diff & -diff).bit_length() - 1
+                counterexample = {
+                    i: bool(self.patterns[i] >> bit & 1) for i in self.inputs
+                }
+            else:
+                stats.solved += 1
+                if (counterexample := self._solve([difference])) is None:
+                    continue
+            support = sorted(set(collect_variables(a)) | set(collect_variables(b)))
+            assignment = self._minimize(difference, counterexample, support)
+            pattern = {i: int(assignment.get(i, False)) for i in self.inputs}
+            bits = self._simulate(pattern, 1)
+            values = (bool(bits[id(a)]), bool(bits[id(b)]))
+            report.mismatches.append(Mismatch(name, assignment, values))
+        stats.patterns = self.width
+        stats.sat_calls = self.sat_calls
@@ -12,3 +12,14 @@ class ParserError(Exception):
     def __init__(self, *args: object, token: Token | None = None) -> None:
         self.token = token
         super().__init__(*args)
+
+
+class ServerError(Exception):
+    """An error the server answered a request with."""
+
+    def __init__(
+        self, *args: object, line: int | None = None, column: int | None = None
+    ) -> None:
+        self.line = line
+        self.column = column
+        super().__init__(*args)
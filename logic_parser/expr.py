@@ -1,34 +1,42 @@
 import abc
+import time
 from dataclasses import dataclass
-from typing import Any
+from typing import Any, Mapping
 
+from logic_parser import profiling
 from logic_parser.token import TokenType
 
 
 class Expr(abc.ABC):
     @abc.abstractmethod
-    def eval(self) -> bool: ...
+    def eval(self, env: Mapping[str, bool] | None = None) -> bool: ...
 
 
 @dataclass
 class LiteralExpr(Expr):
     value: Any
 
-    def eval(self):
+    def eval(self, env=None):
         return self.value
 
 
+@dataclass
+class VariableExpr(Expr):
+    name: str
+
+    def eval(self, env=None):
+        if env is None or self.name not in env:
+            raise ValueError(f"No value found for variable name '{self.name}'")
+        return env[self.name]
+
+
 @dataclass
 class UnaryExpr(Expr):
     operator: TokenType
     operand: Expr
 
-    def eval(self):
-        match self.operator:
-            case TokenType.NOT:
-                return not self.operand.eval()
-            case _:
-                raise NotImplementedError(f"Operator {self.operator} not implemented.")
+    def eval(self, env=None):
+        return evaluate(self, env)
 
 
 @dataclass
@@ -37,24 +45,206 @@ class BinaryExpr(Expr):
     r_operand: Expr
     l_operand: Expr
 
-    def eval(self):
-        A = self.r_operand.eval()
-        B = self.l_operand.eval()
-        match self.operator:
-            case TokenType.BICONDITIONAL:
-                return (A and B) or (not A and not B)
-            case TokenType.IMPLICATION:
-                return (not A) or B
-            case TokenType.OR:
-                return A or B
-            case TokenType.XOR:
-                return (A or B) and not (A and B)
-            case TokenType.AND:
-                return A and B
-            case _:
-                raise NotImplementedError(f"Operator {self.operator} not implemented.")
+    def eval(self, env=None):
+        return evaluate(self, env)
+
+
+@dataclass
+class NaryExpr(Expr):
+    """An AND or OR over any number of operands."""
+
+    operator: TokenType
+    operands: list[Expr]
+
+    def eval(self, env=None):
+        return evaluate(self, env)
 
 
+@dataclass
 class NoneExpr(Expr):
-    def eval(self):
+    def eval(self, env=None):
         return None
+
+
+def apply_binary(operator: TokenType, A, B):
+    match operator:
+        case TokenType.BICONDITIONAL:
+            return (A and B) or (not A and not B)
+        case TokenType.IMPLICATION:
+            return (not A) or B
+        case TokenType.OR:
+            return A or B
+        case TokenType.XOR:
+            return (A or B) and not (A and B)
+        case TokenType.AND:
+            return A and B
+        case _:
+            raise NotImplementedError(f"Operator {operator} not implemented.")
+
+
+# Continuations pushed on the stack of `evaluate`, tagged by their first item.
+_NEGATE = ("negate",)
+_LEFT = "left"
+_COMBINE = "combine"
+_NEXT = "next"
+
+
+class _CountingStack(list):
+    """The stack of `evaluate` under a profiler, counting the nodes popped."""
+
+    __slots__ = ("visits",)
+
+    def pop(self):
+        item = super().pop()
+        if type(item) is not tuple:
+            self.visits += 1
+        return item
+
+
+def evaluate(expr: Expr, env: Mapping[str, bool] | None = None):
+    """Evaluate `expr` without recursion, skipping operands that cannot matter.
+
+    Nodes still to evaluate and the continuations waiting for their values
+    share one explicit stack, so deep trees do not hit the recursion limit.
+    The right operand of AND, OR and `=>` is only evaluated when the left one
+    does not decide the result, and `NaryExpr` operands stop at the first
+    deciding one. Results are the same as the operators' Python expressions
+    in `apply_binary` give.
+    """
+    values: list = []
+    if (profiler := profiling.ACTIVE) is None:
+        stack: list = [expr]
+    else:
+        stack = _CountingStack([expr])
+        stack.visits = 0
+        start = time.perf_counter()
+    push = stack.append
+    while stack:
+        node = stack.pop()
+        kind = type(node)
+        if kind is tuple:
+            step = node[0]
+            if step is _LEFT:
+                node = node[1]
+                operator = node.operator
+                a = values[-1]
+                if operator is TokenType.AND and not a or operator is TokenType.OR and a:
+                    continue
+                if operator is TokenType.IMPLICATION and not a:
+                    values[-1] = True
+                    continue
+                push((_COMBINE, node))
+                push(node.l_operand)
+            elif step is _COMBINE:
+                b = values.pop()
+                values[-1] = apply_binary(node[1].operator, values[-1], b)
+            elif step is _NEXT:
+                _, node, index = node
+                decisive = node.operator is TokenType.OR
+                if bool(values.pop()) is decisive:
+                    values.append(decisive)
+                elif index + 1 < len(node.operands):
+                    push((_NEXT, node, index + 1))
+                    push(node.operands[index + 1])
+                else:
+                    values.append(not decisive)
+            else:
+                values[-1] = not values[-1]
+        elif kind is BinaryExpr:
+            push((_LEFT, node))
+            push(node.r_operand)
+        elif kind is VariableExpr:
+            if env is None or node.name not in env:
+                raise ValueError(f"No value found for variable name '{node.name}'")
+            values.append(env[node.name])
+        elif kind is LiteralExpr:
+            values.append(node.value)
+        elif kind is UnaryExpr:
+            if node.operator is not TokenType.NOT:
+                raise NotImplementedError(f"Operator {node.operator} not implemented.")
+            push(_NEGATE)
+            push(node.operand)
+        elif kind is NaryExpr:
+            if node.operator not in (TokenType.AND, TokenType.OR):
+                raise NotImplementedError(f"Operator {node.operator} not implemented.")
+            if node.operands:
+                push((_NEXT, node, 0))
+                push(node.operands[0])
+            else:
+                values.append(node.operator is TokenType.AND)
+        else:
+            values.append(node.eval(env))
+    if profiler is not None:
+        profiler.evaluated(time.perf_counter() - start, stack.visits)
+    return values.pop()
+
+
+def collect_variables(expr: Expr) -> list[str]:
+    """Return the names of the free variables in `expr`, in order of appearance."""
+    names: dict[str, None] = {}
+    seen: set[int] = set()
+    stack = [expr]
+    while stack:
+        node = stack.pop()
+        if id(node) in seen:
+            continue
+        seen.add(id(node))
+        if isinstance(node, VariableExpr):
+            names.setdefault(node.name)
+        elif isinstance(node, UnaryExpr):
+            stack.append(node.operand)
+        elif isinstance(node, BinaryExpr):
+            stack.append(node.l_operand)
+            stack.append(node.r_operand)
+        elif isinstance(node, NaryExpr):
+            stack.extend(reversed(node.operands))
+    return list(names)
+
+
+# Binding strength of each operator, matching the parser's precedence levels.
+PRECEDENCE = {
+    TokenType.BICONDITIONAL: 1,
+    TokenType.IMPLICATION: 2,
+    TokenType.OR: 3,
+    TokenType.XOR: 4,
+    TokenType.AND: 5,
+    TokenType.NOT: 6,
+}
+ATOM_PRECEDENCE = 7
+
+
+def format_expr(expr: Expr) -> str:
+    """Render `expr` in the source syntax, with only the parentheses it needs.
+
+    Binary operators are left associative, so parsing the result gives back
+    a tree of the same shape.
+    """
+    return _format(expr)[0]
+
+
+def _format(node: Expr) -> tuple[str, int]:
+    if isinstance(node, LiteralExpr):
+        return ("1" if node.value else "0"), ATOM_PRECEDENCE
+    if isinstance(node, VariableExpr):
+        return node.name, ATOM_PRECEDENCE
+    if isinstance(node, UnaryExpr):
+        text, precedence = _format(node.operand)
+        if precedence < PRECEDENCE[node.operator]:
+            text = f"({text})"
+        return f"{node.operator.value}{text}", PRECEDENCE[node.operator]
+    if isinstance(node, (BinaryExpr, NaryExpr)):
+        operands = (
+            [node.r_operand, node.l_operand]
+            if isinstance(node, BinaryExpr)
+            else node.operands
+        )
+        own = PRECEDENCE[node.operator]
+        parts = []
+        for i, operand in enumerate(operands):
+            text, precedence = _format(operand)
+            # The first operand may be a chain of the same operator, the others not.
+            if precedence < own or (i > 0 and precedence == own):
+                text = f"({text})"
+            parts.append(text)
+        return f" {node.operator.value} ".join(parts), own
+    raise ValueError(f"Cannot format {type(node).__name__}")
@@ -0,0 +1,52 @@
+from typing import Callable
+
+from logic_parser.expr import Expr
+
+
+class Frame(dict):
+    """One scope of variables: a dict of their values, and the scope it is in.
+
+    Names missing from a frame are looked up in its `parent`, so the frame
+    of a function call, holding the call's arguments, also sees the
+    variables of the frame it was called from. A call from a parser whose
+    memory is not a frame, such as an `Environment`, gets a frame whose
+    `outer` function looks names up the way that parser does. Assignment,
+    deletion, iteration and `len` only concern the frame itself.
+    """
+
+    __slots__ = ("parent", "outer")
+
+    def __init__(
+        self,
+        parent: "Frame | None" = None,
+        outer: Callable[[str], Expr | None] | None = None,
+    ) -> None:
+        super().__init__()
+        self.parent = parent
+        self.outer = outer
+
+    def child(self) -> "Frame":
+        return Frame(self)
+
+    def lookup(self, name: str) -> Expr | None:
+        frame = self
+        while (value := dict.get(frame, name)) is None:
+            if frame.parent is None:
+                return None if frame.outer is None else frame.outer(name)
+            frame = frame.parent
+        return value
+
+    def __getitem__(self, name: str) -> Expr:
+        if (value := self.lookup(name)) is None:
+            raise KeyError(name)
+        return value
+
+    def __contains__(self, name: object) -> bool:
+        return isinstance(name, str) and self.lookup(name) is not None
+
+    def get(self, name: str, default=None):
+        value = self.lookup(name)
+        return default if value is None else value
+
+    def __repr__(self) -> str:
+        return f"Frame({dict(self)!r})"
@@ -1,52 +1,501 @@
+import argparse
+import glob
+import os
 import sys
-from logic_parser.exceptions import ParserError, TokenizerError
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from itertools import repeat
+from logic_parser import sat
+from logic_parser.cache import Cache, CompiledFile
+from logic_parser.equivalence import equivalent
+from logic_parser.exceptions import ParserError, ServerError, TokenizerError
+from logic_parser.expr import Expr, evaluate, format_expr
+from logic_parser.minimizer import minimize
+from logic_parser.optimizer import Optimizer
 from logic_parser.repl import REPL
-from logic_parser.parser import Parser
-from logic_parser.tokenizer import Tokenizer
+from logic_parser.server import Client, serve
+from logic_parser.slicing import slice_lines
+from logic_parser.parser import Parser, parse_formula
+from logic_parser.profiling import Profiler
+from logic_parser.tokenizer import tokenize_lines
+from logic_parser.truth_table import write_csv, write_gray_bits
 
 
-def usage():
-    print("Usage:")
-    print("  python -m logic_parser.main [file]")
-    print("    [file]   Path to a file with logic expressions to evaluate.")
-    print("    -h      Show this help message.")
-    print("If no file is provided, starts the interactive REPL.")
+def build_arg_parser():
+    arg_parser = argparse.ArgumentParser(
+        prog="python -m logic_parser.main",
+        description="Evaluate logic files or start the interactive REPL.",
+        epilog="If no file is provided, starts the interactive REPL.",
+    )
+    arg_parser.add_argument(
+        "files",
+        nargs="*",
+        metavar="file",
+        help="Paths or glob patterns of files with logic expressions to evaluate.",
+    )
+    arg_parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Evaluate files in N processes. Results keep the order of the files.",
+    )
+    arg_parser.add_argument(
+        "--optimize",
+        action="store_true",
+        help="Simplify each statement before evaluating it and report "
+        "the node counts on stderr.",
+    )
+    arg_parser.add_argument(
+        "--outputs",
+        metavar="R1,R2",
+        help="Print only the last values of these comma-separated names, "
+        "evaluating just the statements they depend on.",
+    )
+    arg_parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Parse files even if an up-to-date parse of them is cached.",
+    )
+    arg_parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="Evaluate REPL lines from stdin without prompts, as is done "
+        "when stdin is not a terminal.",
+    )
+    arg_parser.add_argument(
+        "--serve",
+        metavar="SOCKET",
+        help="Serve sessions of variables and functions on the unix socket SOCKET.",
+    )
+    arg_parser.add_argument(
+        "--connect",
+        metavar="SOCKET",
+        help="Send each file, or stdin, as one batch to the server on SOCKET.",
+    )
+    arg_parser.add_argument(
+        "--session",
+        default="default",
+        help="Name of the server session to use with --connect.",
+    )
+    arg_parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Print the time and counts of each phase on stderr. With -j, "
+        "work done in other processes is not included.",
+    )
+    arg_parser.add_argument(
+        "--profile-json",
+        metavar="PATH",
+        help="Write the profile as JSON to PATH.",
+    )
+    checks = arg_parser.add_mutually_exclusive_group()
+    checks.add_argument(
+        "--sat", metavar="FORMULA", help="Check whether FORMULA is satisfiable."
+    )
+    checks.add_argument(
+        "--tautology", metavar="FORMULA", help="Check whether FORMULA is always true."
+    )
+    checks.add_argument(
+        "--model", metavar="FORMULA", help="Print an assignment satisfying FORMULA."
+    )
+    checks.add_argument(
+        "--count",
+        metavar="FORMULA",
+        help="Print the number of assignments satisfying FORMULA.",
+    )
+    checks.add_argument(
+        "--minimize",
+        metavar="FORMULA",
+        help="Print a minimal sum of products equivalent to FORMULA.",
+    )
+    checks.add_argument(
+        "--equivalent",
+        nargs=2,
+        metavar="FORMULA",
+        help="Check whether two formulas agree under every assignment.",
+    )
+    checks.add_argument(
+        "--equivalent-files",
+        nargs=2,
+        metavar="FILE",
+        help="Check whether the outputs the two logic files share agree under "
+        "every assignment of their inputs, and show where they do not.",
+    )
+    checks.add_argument(
+        "--to-dimacs",
+        metavar="FORMULA",
+        help="Print the Tseitin CNF of FORMULA in DIMACS format.",
+    )
+    checks.add_argument(
+        "--solve-dimacs", metavar="CNF_FILE", help="Solve a DIMACS CNF file."
+    )
+    checks.add_argument(
+        "--truth-table",
+        metavar="FORMULA",
+        help="Print the truth table of FORMULA, rows in Gray-code order.",
+    )
+    arg_parser.add_argument(
+        "--format",
+        choices=["csv", "gray-bits"],
+        default="csv",
+        help="Truth table format: CSV rows, or one bit per row in Gray-code order.",
+    )
+    arg_parser.add_argument(
+        "--output",
+        metavar="PATH",
+        help="Write the truth table to PATH instead of stdout.",
+    )
+    return arg_parser
 
 
-def run_file(file_path: str):
-    try:
+def parse_file(file_path: str, cache: Cache | None = None, report: bool = True):
+    """Yield the statements of `file_path`, from `cache` when it is up to date.
+
+    On a miss the statements are parsed as the file is read, and the cache
+    entry is written once all of them were parsed without error. Hits and
+    misses are printed on stderr if `report` is set.
+    """
+    if cache is None:
         with open(file_path, "r") as f:
-            content = f.read()
-        tokens = Tokenizer(content).tokenize()
-        for result in Parser(tokens).parse_all():
-            print(result.eval())
+            yield from Parser(tokenize_lines(f)).parse_all()
+        return
+    key = cache.key(file_path)
+    if (compiled := cache.load(file_path, key)) is not None:
+        if report:
+            print(f"{file_path}: cache hit.", file=sys.stderr)
+        yield from compiled.statements
+        return
+    if report:
+        print(f"{file_path}: cache miss.", file=sys.stderr)
+    compiled = CompiledFile()
+    with open(file_path, "r") as f:
+        parser = Parser(tokenize_lines(f))
+        for statement in parser.parse_all():
+            compiled.statements.append(statement)
+            yield statement
+    # A file changed while it was read is parsed again next time.
+    if os.stat(file_path).st_mtime_ns == key[0]:
+        compiled.memory = dict(parser.memory)
+        compiled.functions = parser.functions
+        cache.store(file_path, compiled, key)
+
+
+def run_file(file_path: str, optimize: bool = False, cache: Cache | None = None):
+    try:
+        optimizer = Optimizer() if optimize else None
+        for result in parse_file(file_path, cache):
+            if optimizer:
+                result = optimizer.optimize(result)
+                optimizer.forget()
+            print(evaluate(result), flush=True)
+        if optimizer:
+            report = optimizer.report
+            print(
+                f"{file_path}: optimized {report.nodes_before} nodes "
+                f"to {report.nodes_after}.",
+                file=sys.stderr,
+            )
+    except Exception as e:
+        print(error_message(file_path, e))
+        exit(1)
+
+
+def error_message(source: str, err: Exception) -> str:
+    """`source:line:col: message.`, without the position if `err` has none."""
+    if isinstance(err, TokenizerError):
+        return f"{source}:{err.line}:{err.line_pos + 1}: {err}."
+    if isinstance(err, ParserError) and err.token:
+        return f"{source}:{err.token.line}:{err.token.line_pos + 1}: {err}."
+    return f"{source}: {err}."
+
+
+@dataclass
+class FileRun:
+    """What `evaluate_file` found evaluating one file."""
+
+    path: str
+    results: list = field(default_factory=list)
+    error: str | None = None
+    seconds: float = 0.0
+    cache_hit: bool | None = None
+    optimized: tuple[int, int] | None = None
+
+
+def evaluate_file(
+    file_path: str, optimize: bool = False, cache: Cache | None = None
+) -> FileRun:
+    """Evaluate `file_path` like `run_file`, collecting results and errors."""
+    run = FileRun(file_path)
+    start = time.perf_counter()
+    hits = cache.stats.hits if cache else 0
+    optimizer = Optimizer() if optimize else None
+    try:
+        for result in parse_file(file_path, cache, report=False):
+            if optimizer:
+                result = optimizer.optimize(result)
+                optimizer.forget()
+            run.results.append(evaluate(result))
+    except Exception as e:
+        run.error = error_message(file_path, e)
+    run.seconds = time.perf_counter() - start
+    if cache:
+        run.cache_hit = cache.stats.hits > hits
+    if optimizer:
+        run.optimized = (optimizer.report.nodes_before, optimizer.report.nodes_after)
+    return run
+
+
+def expand_paths(patterns: list[str]) -> list[str]:
+    """Paths matching each glob pattern, sorted; patterns matching none stay."""
+    paths = []
+    for pattern in patterns:
+        matches = []
+        if any(c in pattern for c in "*?["):
+            matches = sorted(glob.glob(pattern, recursive=True))
+        paths.extend(matches or [pattern])
+    return paths
+
+
+def run_files(
+    file_paths: list[str],
+    jobs: int = 1,
+    optimize: bool = False,
+    cache: Cache | None = None,
+):
+    """Evaluate several files, in `jobs` processes, printing them in order.
+
+    The results of each file follow a `==> path <==` line, then its error if
+    it has one. Each file's time and a summary are printed on stderr.
+    """
+    start = time.perf_counter()
+    executor = ProcessPoolExecutor(jobs) if jobs > 1 else None
+    if executor:
+        runs = executor.map(evaluate_file, file_paths, repeat(optimize), repeat(cache))
+    else:
+        runs = (evaluate_file(path, optimize, cache) for path in file_paths)
+    failed = 0
+    with executor or nullcontext():
+        for run in runs:
+            print(f"==> {run.path} <==")
+            for value in run.results:
+                print(value)
+            if run.error:
+                print(run.error)
+                failed += 1
+            sys.stdout.flush()
+            status = f"{len(run.results)} results"
+            if run.error:
+                status = "failed"
+            elif run.cache_hit is not None:
+                status += ", cache hit" if run.cache_hit else ", cache miss"
+            if run.optimized and not run.error:
+                status += ", optimized {} nodes to {}".format(*run.optimized)
+            print(f"{run.path}: {status} in {run.seconds:.3f}s.", file=sys.stderr)
+    print(
+        f"{len(file_paths)} files, {failed} failed "
+        f"in {time.perf_counter() - start:.3f}s.",
+        file=sys.stderr,
+    )
+    if failed:
+        exit(1)
+
+
+def run_outputs(file_paths: list[str], outputs: list[str]):
+    """Print the last values of `outputs` in each file, evaluating only their cone.
+
+    The number of statements evaluated out of those in the file is printed
+    on stderr.
+    """
+    for path in file_paths:
+        if len(file_paths) > 1:
+            print(f"==> {path} <==")
+        try:
+            with open(path, "r") as f:
+                program = slice_lines(f, outputs)
+            values = program.evaluate()
+        except Exception as e:
+            print(error_message(path, e))
+            exit(1)
+        print_model(values)
+        sys.stdout.flush()
+        print(
+            f"{path}: evaluated {len(program.statements)} of "
+            f"{program.total} statements.",
+            file=sys.stderr,
+        )
+
+
+def run_client(socket_path: str, file_paths: list[str], session: str):
+    sources = file_paths or ["<stdin>"]
+    source = sources[0]
+    try:
+        with Client(socket_path) as client:
+            for source in sources:
+                if file_paths:
+                    with open(source, "r") as f:
+                        text = f.read()
+                else:
+                    text = sys.stdin.read()
+                for result in client.run(text, session):
+                    print(result)
+    except ServerError as s_err:
+        if s_err.line is not None:
+            print(f"{source}:{s_err.line}:{s_err.column}: {s_err}.")
+        else:
+            print(f"{source}: {s_err}.")
+        exit(1)
+    except Exception as e:
+        print(f"{source}: {e}.")
+        exit(1)
+
+
+def print_model(model: dict[str, bool]):
+    for name, value in model.items():
+        print(f"{name} := {int(value)}")
+
+
+def print_truth_table(expr: Expr, format: str, output: str | None):
+    if format == "csv":
+        with open(output, "w") if output else nullcontext(sys.stdout) as f:
+            write_csv(expr, f)
+    else:
+        with open(output, "wb") if output else nullcontext(sys.stdout.buffer) as f:
+            write_gray_bits(expr, f)
+
+
+def print_equivalence(file_a: str, file_b: str) -> bool:
+    report = equivalent(file_a, file_b)
+    for mismatch in report.mismatches:
+        assignment = ", ".join(
+            f"{name} := {int(value)}" for name, value in mismatch.assignment.items()
+        )
+        a, b = mismatch.values
+        print(
+            f"{mismatch.output} differs with {assignment or 'any inputs'}: "
+            f"{a} in {file_a}, {b} in {file_b}"
+        )
+    for path, names in [(file_a, report.only_a), (file_b, report.only_b)]:
+        if names:
+            print(f"Only in {path}: {', '.join(names)}", file=sys.stderr)
+    differ = len(report.mismatches)
+    print(
+        f"{len(report.outputs)} outputs compared, "
+        f"{differ} differ{'s' if differ == 1 else ''}."
+    )
+    return report.equivalent
+
+
+def run_check(args: argparse.Namespace):
+    source = "<formula>"
+    try:
+        if args.solve_dimacs is not None:
+            source = args.solve_dimacs
+            with open(args.solve_dimacs, "r") as f:
+                cnf = sat.read_dimacs(f)
+            model = sat.solve_cnf(cnf)
+            if model is None:
+                print("s UNSATISFIABLE")
+            else:
+                print("s SATISFIABLE")
+                print("v " + " ".join(str(v if model[v] else -v) for v in model) + " 0")
+        elif args.sat is not None:
+            print(sat.is_satisfiable(parse_formula(args.sat)))
+        elif args.tautology is not None:
+            print(sat.is_tautology(parse_formula(args.tautology)))
+        elif args.model is not None:
+            model = sat.find_model(parse_formula(args.model))
+            if model is None:
+                print("UNSAT")
+            else:
+                print_model(model)
+        elif args.count is not None:
+            print(sat.count_models(parse_formula(args.count)))
+        elif args.minimize is not None:
+            print(format_expr(minimize(parse_formula(args.minimize))))
+        elif args.equivalent is not None:
+            left, right = (parse_formula(f) for f in args.equivalent)
+            print(sat.are_equivalent(left, right))
+        elif args.equivalent_files is not None:
+            source = args.equivalent_files[0]
+            if not print_equivalence(*args.equivalent_files):
+                exit(1)
+        elif args.to_dimacs is not None:
+            cnf, root = sat.tseitin(parse_formula(args.to_dimacs))
+            cnf.add_clause(root)
+            print(sat.to_dimacs(cnf), end="")
+        elif args.truth_table is not None:
+            print_truth_table(parse_formula(args.truth_table), args.format, args.output)
     except TokenizerError as t_err:
-        print(f"{file_path}:{t_err.line}:{t_err.line_pos + 1}: {t_err}.")
+        print(f"{source}:{t_err.line}:{t_err.line_pos + 1}: {t_err}.")
         exit(1)
     except ParserError as p_err:
         if p_err.token:
-            print(
-                f"{file_path}:{p_err.token.line}:{p_err.token.line_pos + 1}: {p_err}."
-            )
+            print(f"{source}:{p_err.token.line}:{p_err.token.line_pos + 1}: {p_err}.")
         else:
-            print(f"{file_path}: {p_err}.")
+            print(f"{source}: {p_err}.")
         exit(1)
     except Exception as e:
-        print(f"{file_path}: {e}.")
+        print(f"{source}: {e}.")
         exit(1)
 
 
 def main():
-    if len(sys.argv) > 1:
-        if sys.argv[1] == "-h":
-            usage()
-            return
+    args = build_arg_parser().parse_args()
+    profiler = Profiler() if args.profile or args.profile_json else None
+    try:
+        with profiler or nullcontext():
+            dispatch(args)
+    finally:
+        if profiler:
+            report_profile(profiler, args.profile, args.profile_json)
 
-        run_file(sys.argv[1])
 
+def dispatch(args: argparse.Namespace):
+    checks = (
+        args.sat,
+        args.tautology,
+        args.model,
+        args.count,
+        args.minimize,
+        args.equivalent,
+        args.equivalent_files,
+        args.to_dimacs,
+        args.solve_dimacs,
+        args.truth_table,
+    )
+    if any(check is not None for check in checks):
+        run_check(args)
+    elif args.serve:
+        serve(args.serve)
+    elif args.connect:
+        run_client(args.connect, expand_paths(args.files), args.session)
+    elif args.files:
+        cache = None if args.no_cache else Cache()
+        paths = expand_paths(args.files)
+        if args.outputs:
+            outputs = [name.strip() for name in args.outputs.split(",")]
+            run_outputs(paths, [name for name in outputs if name])
+        elif len(paths) == 1:
+            run_file(paths[0], optimize=args.optimize, cache=cache)
+        else:
+            run_files(paths, args.jobs, optimize=args.optimize, cache=cache)
+    elif args.batch or not sys.stdin.isatty():
+        REPL().run_batch()
     else:
         REPL().run()
 
 
+def report_profile(profiler: Profiler, show: bool, json_path: str | None):
+    if show:
+        print(profiler.report(), file=sys.stderr)
+    if json_path:
+        with open(json_path, "w") as f:
+            profiler.write_json(f)
+
+
 if __name__ == "__main__":
     main()
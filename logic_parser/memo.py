@@ -0,0 +1,163 @@
+"""Results of user-function calls, kept for calls with the same argument values."""
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from logic_parser.expr import (
+    BinaryExpr,
+    Expr,
+    LiteralExpr,
+    NaryExpr,
+    UnaryExpr,
+    VariableExpr,
+    apply_binary,
+)
+from logic_parser.token import Token, TokenType
+
+if TYPE_CHECKING:
+    from logic_parser.parser import Function
+
+MAXSIZE = 4096
+# The truth values of argument nodes are forgotten once this many are kept.
+MAX_VALUES = 1 << 16
+
+
+@dataclass
+class CallStats:
+    hits: int = 0
+    misses: int = 0
+    # Calls whose arguments were not all known, which are never cached.
+    uncached: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        calls = self.hits + self.misses
+        return self.hits / calls if calls else 0.0
+
+
+class CallCache:
+    """The values of the last `maxsize` function calls.
+
+    A call is keyed by its function, by identity, and the truth values of
+    its arguments. Only calls of functions whose body reads nothing but
+    their arguments are cached, and only when every argument has a known
+    value: arguments that are free variables, or references into an
+    `Environment`, may change, so those calls are parsed every time.
+    Entries of a function are dropped when it is redefined.
+
+    Arguments built by substituting variables share subtrees, so the truth
+    value of each node is computed once and kept in `values` by id.
+    """
+
+    def __init__(self, maxsize: int = MAXSIZE) -> None:
+        self.maxsize = maxsize
+        # Entries keep their function, so its id is not reused while they live.
+        self.entries: OrderedDict[tuple[int, tuple[bool, ...]], tuple[Any, bool]] = (
+            OrderedDict()
+        )
+        # Each value keeps its node, so the id is not reused while it lives.
+        self.values: dict[int, tuple[Any, bool | None]] = {}
+        self.stats = CallStats()
+
+    def key(self, function: "Function", args: list) -> tuple | None:
+        """The key of calling `function` with `args`, or None if it is not cached."""
+        if not self.maxsize or not function.closed:
+            return None
+        if len(self.values) > MAX_VALUES:
+            self.values.clear()
+        values = []
+        for arg in args:
+            if (value := truth_value(arg, self.values)) is None:
+                self.stats.uncached += 1
+                return None
+            values.append(value)
+        return id(function), tuple(values)
+
+    def get(self, key: tuple) -> bool | None:
+        if (entry := self.entries.get(key)) is None:
+            self.stats.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.stats.hits += 1
+        return entry[1]
+
+    def put(self, key: tuple, function: "Function", value: bool):
+        self.entries[key] = (function, value)
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    def forget(self, function: "Function"):
+        """Drop the entries of `function`, which was redefined."""
+        for key in [k for k, (f, _) in self.entries.items() if f is function]:
+            del self.entries[key]
+
+    def clear(self):
+        self.entries.clear()
+        self.values.clear()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+
+def truth_value(value, memo: dict | None = None) -> bool | None:
+    """The value of an argument, or None if it depends on unassigned variables.
+
+    Expressions are evaluated bottom-up without recursion, each node once,
+    keeping `(node, value)` in `memo` by the node's id. An operand that
+    decides its operator, such as a false operand of AND, gives a value even
+    if the other operand has none.
+    """
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, Token):
+        return value.value == "1" if value.value in ("0", "1") else None
+    if not isinstance(value, Expr):
+        return None
+    memo = {} if memo is None else memo
+    stack = [value]
+    while stack:
+        node = stack[-1]
+        if id(node) in memo:
+            stack.pop()
+            continue
+        operands = _operands(node)
+        if pending := [child for child in operands if id(child) not in memo]:
+            stack.extend(pending)
+            continue
+        stack.pop()
+        known = [memo[id(child)][1] for child in operands]
+        memo[id(node)] = (node, _known_value(node, known))
+    return memo[id(value)][1]
+
+
+def _operands(node: Expr) -> list[Expr]:
+    if isinstance(node, UnaryExpr):
+        return [node.operand]
+    if isinstance(node, BinaryExpr):
+        return [node.r_operand, node.l_operand]
+    if isinstance(node, NaryExpr):
+        return node.operands
+    return []
+
+
+def _known_value(node: Expr, operands: list[bool | None]) -> bool | None:
+    """The value of `node` from those of its operands, None where unknown."""
+    if isinstance(node, LiteralExpr):
+        return bool(node.value)
+    if isinstance(node, UnaryExpr):
+        return None if operands[0] is None else not operands[0]
+    if not isinstance(node, (BinaryExpr, NaryExpr)):
+        return None
+    operator = node.operator
+    if operator is TokenType.AND and False in operands:
+        return False
+    if operator is TokenType.OR and True in operands:
+        return True
+    if operator is TokenType.IMPLICATION and operands in ([False, None], [None, True]):
+        return True
+    if None in operands:
+        return None
+    if isinstance(node, NaryExpr):
+        return all(operands) if operator is TokenType.AND else any(operands)
+    return bool(apply_binary(operator, operands[0], operands[1]))
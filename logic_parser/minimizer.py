@@ -0,0 +1,320 @@
+from typing import Iterable
+
+from logic_parser.bdd import BDD
+from logic_parser.expr import (
+    Expr,
+    LiteralExpr,
+    NaryExpr,
+    UnaryExpr,
+    VariableExpr,
+    collect_variables,
+)
+from logic_parser.token import TokenType
+
+# A cube is a pair of bitmasks `(mask, value)` over the variable indexes:
+# variable i appears in the cube when bit i of `mask` is set, positively
+# when bit i of `value` is set too. `value` never has bits outside `mask`.
+Cube = tuple[int, int]
+
+EXACT_LIMIT = 8
+MAX_PRODUCTS = 256
+
+
+def _literals(cube: Cube) -> int:
+    return cube[0].bit_count()
+
+
+def _cost(cover: list[Cube]) -> tuple[int, int]:
+    return len(cover), sum(_literals(cube) for cube in cover)
+
+
+def _contains(outer: Cube, inner: Cube) -> bool:
+    mask, value = outer
+    return mask & inner[0] == mask and inner[1] & mask == value
+
+
+def _intersects(a: Cube, b: Cube) -> bool:
+    return not (a[1] ^ b[1]) & a[0] & b[0]
+
+
+def _cofactor(cover: Iterable[Cube], cube: Cube) -> list[Cube]:
+    """The cubes of `cover` restricted to the subspace `cube`."""
+    mask, value = cube
+    return [(m & ~mask, v & ~mask) for m, v in cover if not (v ^ value) & m & mask]
+
+
+def _is_tautology(cover: list[Cube]) -> bool:
+    """Whether the union of `cover` is the whole space (unate recursive paradigm)."""
+    stack = [cover]
+    while stack:
+        cubes = stack.pop()
+        if any(mask == 0 for mask, _ in cubes):
+            continue
+        if not cubes:
+            return False
+        support = 0
+        for mask, _ in cubes:
+            support |= mask
+        width = support.bit_count()
+        if sum(1 << (width - mask.bit_count()) for mask, _ in cubes) < 1 << width:
+            return False
+
+        counts: dict[int, list[int]] = {}
+        for mask, value in cubes:
+            while mask:
+                bit = mask & -mask
+                mask ^= bit
+                counts.setdefault(bit, [0, 0])[bool(value & bit)] += 1
+        if all(min(both) == 0 for both in counts.values()):
+            # A unate cover is a tautology only if it has the universal cube.
+            return False
+        bit = max(counts, key=lambda b: (min(counts[b]), sum(counts[b])))
+        stack.append(_cofactor(cubes, (bit, 0)))
+        stack.append(_cofactor(cubes, (bit, bit)))
+    return True
+
+
+def _covers(cover: list[Cube], cube: Cube) -> bool:
+    return _is_tautology(_cofactor(cover, cube))
+
+
+def _to_expr(cover: list[Cube], names: list[str]) -> Expr:
+    if not cover:
+        return LiteralExpr(False)
+    def order(cube: Cube) -> tuple:
+        mask, value = cube
+        present = [i for i in range(len(names)) if mask >> i & 1]
+        return len(present), present, [not value >> i & 1 for i in present]
+
+    terms: list[Expr] = []
+    for mask, value in sorted(cover, key=order):
+        literals: list[Expr] = []
+        for i, name in enumerate(names):
+            if mask >> i & 1:
+                variable = VariableExpr(name)
+                positive = value >> i & 1
+                literals.append(variable if positive else UnaryExpr(TokenType.NOT, variable))
+        if not literals:
+            return LiteralExpr(True)
+        terms.append(literals[0] if len(literals) == 1 else NaryExpr(TokenType.AND, literals))
+    return terms[0] if len(terms) == 1 else NaryExpr(TokenType.OR, terms)
+
+
+def prime_implicants(minterms: Iterable[int], num_vars: int) -> list[Cube]:
+    """Quine-McCluskey: merge implicants differing in one variable until none merge."""
+    full = (1 << num_vars) - 1
+    current = {(full, m) for m in minterms}
+    primes: list[Cube] = []
+    while current:
+        merged: set[Cube] = set()
+        used: set[Cube] = set()
+        for mask, value in current:
+            bits = mask
+            while bits:
+                bit = bits & -bits
+                bits ^= bit
+                if value & bit and (mask, value ^ bit) in current:
+                    merged.add((mask ^ bit, value ^ bit))
+                    used.add((mask, value))
+                    used.add((mask, value ^ bit))
+        primes.extend(cube for cube in current if cube not in used)
+        current = merged
+    return primes
+
+
+def _petrick(
+    uncovered: set[int], primes: list[Cube], max_products: int
+) -> list[int]:
+    """Cheapest set of prime indexes covering `uncovered`.
+
+    Multiplies out the product of sums "some prime covering m" for every
+    minterm m, removing products absorbed by smaller ones. Sums and products
+    are bitmasks over the prime indexes. If the expansion grows past
+    `max_products`, only the cheapest products are kept, which makes the
+    result near-minimal instead of minimal.
+    """
+    sums = set()
+    for m in uncovered:
+        sums.add(sum(1 << i for i, p in enumerate(primes) if _contains(p, (-1, m))))
+    # A sum containing another sum is implied by it.
+    ordered = sorted(sums, key=int.bit_count)
+    clauses: list[int] = []
+    for clause in ordered:
+        if not any(kept & clause == kept for kept in clauses):
+            clauses.append(clause)
+
+    def cost(product: int) -> tuple[int, int]:
+        literals = sum(_literals(p) for i, p in enumerate(primes) if product >> i & 1)
+        return product.bit_count(), literals
+
+    products = [0]
+    for clause in clauses:
+        expanded: set[int] = set()
+        for product in products:
+            if product & clause:
+                expanded.add(product)
+                continue
+            bits = clause
+            while bits:
+                bit = bits & -bits
+                bits ^= bit
+                expanded.add(product | bit)
+        products = []
+        for product in sorted(expanded, key=int.bit_count):
+            if not any(kept & product == kept for kept in products):
+                products.append(product)
+        if len(products) > max_products:
+            products = sorted(products, key=cost)[:max_products]
+    best = min(products, key=cost)
+    return [i for i in range(len(primes)) if best >> i & 1]
+
+
+def quine_mccluskey(
+    minterms: Iterable[int], num_vars: int, max_products: int = MAX_PRODUCTS
+) -> list[Cube]:
+    """A minimum sum-of-products cover of `minterms`.
+
+    Prime implicants covering a minterm no other prime covers are essential;
+    the rest of the cover is chosen by Petrick's method.
+    """
+    minterms = set(minterms)
+    primes = prime_implicants(minterms, num_vars)
+    cover: list[Cube] = []
+    uncovered = set(minterms)
+    for m in minterms:
+        candidates = [p for p in primes if _contains(p, (-1, m))]
+        if len(candidates) == 1 and candidates[0] not in cover:
+            cover.append(candidates[0])
+    for p in cover:
+        uncovered = {m for m in uncovered if not _contains(p, (-1, m))}
+    if uncovered:
+        remaining = [p for p in primes if p not in cover]
+        cover.extend(remaining[i] for i in _petrick(uncovered, remaining, max_products))
+    return cover
+
+
+def _expand(onset: list[Cube], offset: list[Cube]) -> list[Cube]:
+    """Grow every cube into a prime by dropping literals while it stays off the offset."""
+    expanded: list[Cube] = []
+    for cube in sorted(onset, key=_literals):
+        if any(_contains(prime, cube) for prime in expanded):
+            continue
+        mask, value = cube
+        bits = mask
+        while bits:
+            bit = bits & -bits
+            bits ^= bit
+            candidate = (mask ^ bit, value & ~bit)
+            if not any(_intersects(c, candidate) for c in offset):
+                mask, value = candidate
+        expanded.append((mask, value))
+    return [
+        cube
+        for cube in expanded
+        if not any(other != cube and _contains(other, cube) for other in expanded)
+    ]
+
+
+def _irredundant(cover: list[Cube]) -> list[Cube]:
+    """Drop cubes covered by the others, most specific first."""
+    for cube in sorted(cover, key=_literals, reverse=True):
+        i = cover.index(cube)
+        others = cover[:i] + cover[i + 1 :]
+        if _covers(others, cube):
+            cover = others
+    return cover
+
+
+def _reduce(cover: list[Cube]) -> list[Cube]:
+    """Shrink each cube to the part of it the other cubes do not cover."""
+    cover = sorted(cover, key=_literals)
+    for i in range(len(cover)):
+        mask, value = cover[i]
+        others = cover[:i] + cover[i + 1 :]
+        for bit in _free_bits(mask, cover):
+            for half in (value, value | bit):
+                if _covers(others, (mask | bit, half)):
+                    mask, value = mask | bit, half ^ bit
+                    break
+        cover[i] = (mask, value)
+    return cover
+
+
+def _free_bits(mask: int, cover: list[Cube]) -> list[int]:
+    support = 0
+    for m, _ in cover:
+        support |= m
+    support &= ~mask
+    bits = []
+    while support:
+        bit = support & -support
+        support ^= bit
+        bits.append(bit)
+    return bits
+
+
+def espresso(onset: list[Cube], offset: list[Cube]) -> list[Cube]:
+    """A near-minimal cover of `onset` that avoids `offset`.
+
+    Alternates the expand, irredundant and reduce steps of Espresso until
+    the cost (number of cubes, then of literals) stops improving.
+    """
+    cover = _irredundant(_expand(onset, offset))
+    best = cover
+    while True:
+        cover = _irredundant(_expand(_reduce(list(cover)), offset))
+        if _cost(cover) >= _cost(best):
+            return best
+        best = cover
+
+
+def minimize(
+    expr: Expr,
+    exact_limit: int = EXACT_LIMIT,
+    variables: Iterable[str] | None = None,
+) -> Expr:
+    """A minimal or near-minimal sum of products equivalent to `expr`.
+
+    Formulas over at most `exact_limit` variables are minimized exactly with
+    Quine-McCluskey and Petrick's method; larger ones with the Espresso
+    heuristic, starting from the disjoint cubes of the formula's BDD.
+    Variables appear in terms in the order of `variables`, which defaults
+    to their order of appearance in `expr`.
+    """
+    names = collect_variables(expr)
+    if variables is not None:
+        variables = list(variables)
+        if missing := set(names) - set(variables):
+            raise ValueError(f"Variables {sorted(missing)} are used but not listed")
+        names = variables
+    index = {name: i for i, name in enumerate(names)}
+    bdd = BDD(names)
+    f = bdd.add_expr(expr)
+
+    def cubes(g) -> list[Cube]:
+        result = []
+        for assignment in g.cubes():
+            mask = value = 0
+            for name, positive in assignment.items():
+                mask |= 1 << index[name]
+                value |= positive << index[name]
+            result.append((mask, value))
+        return result
+
+    if f.is_false or f.is_true:
+        return LiteralExpr(f.is_true)
+    if len(names) <= exact_limit:
+        full = (1 << len(names)) - 1
+        minterms = set()
+        for mask, value in cubes(f):
+            free = full & ~mask
+            subset = free
+            while True:
+                minterms.add(value | subset)
+                if subset == 0:
+                    break
+                subset = (subset - 1) & free
+        cover = quine_mccluskey(minterms, len(names))
+    else:
+        cover = espresso(cubes(f), cubes(~f))
+    return _to_expr(cover, names)
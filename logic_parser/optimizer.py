@@ -0,0 +1,221 @@
+from dataclasses import dataclass
+
+from logic_parser.expr import (
+    BinaryExpr,
+    Expr,
+    LiteralExpr,
+    NaryExpr,
+    NoneExpr,
+    UnaryExpr,
+    VariableExpr,
+)
+from logic_parser.token import TokenType
+
+ASSOCIATIVE = (TokenType.AND, TokenType.OR)
+
+
+def count_nodes(expr: Expr) -> int:
+    """Number of nodes `Expr.eval` visits, counting shared subtrees every time."""
+    sizes: dict[int, int] = {}
+    stack = [expr]
+    while stack:
+        node = stack[-1]
+        if id(node) in sizes:
+            stack.pop()
+            continue
+        children = _children(node)
+        if pending := [child for child in children if id(child) not in sizes]:
+            stack.extend(pending)
+            continue
+        stack.pop()
+        sizes[id(node)] = 1 + sum(sizes[id(child)] for child in children)
+    return sizes[id(expr)]
+
+
+def _children(node: Expr) -> list[Expr]:
+    if isinstance(node, UnaryExpr):
+        return [node.operand]
+    if isinstance(node, BinaryExpr):
+        return [node.r_operand, node.l_operand]
+    if isinstance(node, NaryExpr):
+        return node.operands
+    return []
+
+
+@dataclass
+class OptimizationReport:
+    nodes_before: int = 0
+    nodes_after: int = 0
+
+
+class Optimizer:
+    """Simplifies expression trees without changing what they evaluate to.
+
+    Applies constant folding, double negation removal, idempotence,
+    complement and absorption, and flattens chains of AND/OR into `NaryExpr`
+    nodes. Simplified nodes are hash-consed, so structurally equal subtrees
+    become the same object and the rules compare operands by identity.
+    The optimizer keeps its tables between calls, so the statements passed
+    to it share the work done on their common subtrees until `forget` is
+    called.
+    """
+
+    def __init__(self) -> None:
+        self.report = OptimizationReport()
+        self.memo: dict[int, Expr] = {}
+        self.interned: dict[tuple, Expr] = {}
+        # Original nodes are kept alive so their ids stay unique.
+        self.originals: list[Expr] = []
+
+    def optimize(self, expr: Expr) -> Expr:
+        stack: list[tuple[Expr, bool]] = [(expr, False)]
+        while stack:
+            node, expanded = stack.pop()
+            if id(node) in self.memo:
+                continue
+            if not expanded:
+                stack.append((node, True))
+                stack.extend((child, False) for child in _children(node))
+                continue
+            self.originals.append(node)
+            self.memo[id(node)] = self.simplify(node)
+
+        result = self.memo[id(expr)]
+        self.report.nodes_before += count_nodes(expr)
+        self.report.nodes_after += count_nodes(result)
+        return result
+
+    def forget(self):
+        """Drop the tables of everything but variables and literals.
+
+        The memo keeps the original of every node it has seen alive, so an
+        optimizer reused for a whole file should forget between statements
+        to hold memory proportional to one statement instead of the file.
+        """
+        self.memo.clear()
+        self.originals.clear()
+        self.interned = {
+            key: node
+            for key, node in self.interned.items()
+            if key[0] in ("var", "literal")
+        }
+
+    def simplify(self, node: Expr) -> Expr:
+        if isinstance(node, LiteralExpr):
+            return self.literal(bool(node.value))
+        if isinstance(node, VariableExpr):
+            return self.intern(("var", node.name), lambda: VariableExpr(node.name))
+        if isinstance(node, UnaryExpr) and node.operator == TokenType.NOT:
+            return self.negate(self.memo[id(node.operand)])
+        if isinstance(node, NaryExpr) and node.operator in ASSOCIATIVE:
+            operands = [self.memo[id(operand)] for operand in node.operands]
+            return self.associative(node.operator, operands)
+        if isinstance(node, BinaryExpr):
+            a = self.memo[id(node.r_operand)]
+            b = self.memo[id(node.l_operand)]
+            if isinstance(a, NoneExpr) or isinstance(b, NoneExpr):
+                return BinaryExpr(node.operator, a, b)
+            if node.operator in ASSOCIATIVE:
+                return self.associative(node.operator, [a, b])
+            return self.binary(node.operator, a, b)
+        return node
+
+    def intern(self, key: tuple, build) -> Expr:
+        if (node := self.interned.get(key)) is None:
+            node = self.interned[key] = build()
+        return node
+
+    def literal(self, value: bool) -> Expr:
+        return self.intern(("literal", value), lambda: LiteralExpr(value))
+
+    def negate(self, operand: Expr) -> Expr:
+        if isinstance(operand, LiteralExpr):
+            return self.literal(not operand.value)
+        if isinstance(operand, UnaryExpr) and operand.operator == TokenType.NOT:
+            return operand.operand
+        if isinstance(operand, NoneExpr):
+            return UnaryExpr(TokenType.NOT, operand)
+        return self.intern(
+            ("not", id(operand)), lambda: UnaryExpr(TokenType.NOT, operand)
+        )
+
+    @staticmethod
+    def complement_of(node: Expr) -> Expr | None:
+        if isinstance(node, UnaryExpr) and node.operator == TokenType.NOT:
+            return node.operand
+        return None
+
+    def associative(self, operator: TokenType, operands: list[Expr]) -> Expr:
+        # AND absorbs its zero (False) and drops its identity (True); OR the reverse.
+        zero = operator == TokenType.OR
+        other = TokenType.OR if operator == TokenType.AND else TokenType.AND
+
+        flat: dict[int, Expr] = {}
+        stack = list(reversed(operands))
+        while stack:
+            operand = stack.pop()
+            if isinstance(operand, NaryExpr) and operand.operator == operator:
+                stack.extend(reversed(operand.operands))
+            elif isinstance(operand, NoneExpr):
+                return NaryExpr(operator, operands)
+            elif isinstance(operand, LiteralExpr):
+                if operand.value == zero:
+                    return self.literal(zero)
+            else:
+                flat.setdefault(id(operand), operand)
+
+        for operand in flat.values():
+            if (complement := self.complement_of(operand)) is not None:
+                if id(complement) in flat:
+                    return self.literal(zero)
+
+        # Absorption: x ^ (x v y) = x and x v (x ^ y) = x.
+        kept = [
+            operand
+            for operand in flat.values()
+            if not (
+                isinstance(operand, NaryExpr)
+                and operand.operator == other
+                and any(id(inner) in flat for inner in operand.operands)
+            )
+        ]
+
+        if not kept:
+            return self.literal(not zero)
+        if len(kept) == 1:
+            return kept[0]
+        key = (operator, frozenset(id(operand) for operand in kept))
+        return self.intern(key, lambda: NaryExpr(operator, kept))
+
+    def binary(self, operator: TokenType, a: Expr, b: Expr) -> Expr:
+        a_value = a.value if isinstance(a, LiteralExpr) else None
+        b_value = b.value if isinstance(b, LiteralExpr) else None
+        complementary = self.complement_of(a) is b or self.complement_of(b) is a
+        match operator:
+            case TokenType.IMPLICATION:
+                if a_value is False or b_value is True or a is b:
+                    return self.literal(True)
+                if a_value is True or complementary:
+                    return b
+                if b_value is False:
+                    return self.negate(a)
+            case TokenType.XOR | TokenType.BICONDITIONAL:
+                # a <=> b is ~(a != b); `inverted` tracks the extra negation.
+                inverted = operator == TokenType.BICONDITIONAL
+                if a is b:
+                    return self.literal(inverted)
+                if complementary:
+                    return self.literal(not inverted)
+                if a_value is not None:
+                    return b if a_value == inverted else self.negate(b)
+                if b_value is not None:
+                    return a if b_value == inverted else self.negate(a)
+            case _:
+                raise NotImplementedError(f"Operator {operator} not implemented.")
+        return self.intern(
+            (operator, id(a), id(b)), lambda: BinaryExpr(operator, a, b)
+        )
+
+
+def optimize(expr: Expr) -> Expr:
+    return Optimizer().optimize(expr)
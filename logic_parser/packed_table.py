@@ -0,0 +1,193 @@
+"""Complete truth tables stored one bit per assignment.
+
+Bit k of a table is assignment k, unlike the headerless Gray-code rows of
+`truth_table.write_gray_bits`, which these files cannot be read from.
+
+Requires NumPy (`pip install paser-lang[tables]`).
+"""
+
+import struct
+from typing import Iterable, Mapping
+
+import numpy as np
+
+from logic_parser.expr import (
+    BinaryExpr,
+    Expr,
+    LiteralExpr,
+    NaryExpr,
+    UnaryExpr,
+    VariableExpr,
+    collect_variables,
+)
+from logic_parser.optimizer import _children
+from logic_parser.token import TokenType
+
+# File layout: magic, then the number of variables and the size of their
+# names as little-endian uint32, then the names (UTF-8, each followed by a
+# NUL) padded to a multiple of 8 bytes, then the bits. Bit k of the table,
+# counting from the most significant bit of the first byte as
+# `numpy.packbits` does, is the value of assignment k, in which variable i
+# is true when bit i of k is set.
+MAGIC = b"LPTT\x01\x00\x00\x00"
+HEADER = struct.Struct("<8sII")
+CHUNK_BITS = 16
+
+OPERATIONS = {
+    "and": np.bitwise_and,
+    "or": np.bitwise_or,
+    "xor": np.bitwise_xor,
+    "andnot": lambda a, b: np.bitwise_and(a, np.bitwise_not(b)),
+}
+
+if hasattr(np, "bitwise_count"):
+    _popcount = np.bitwise_count
+else:
+    _POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+    def _popcount(chunk: np.ndarray) -> np.ndarray:
+        return _POPCOUNT[chunk]
+
+
+def evaluate_range(
+    expr: Expr, names: list[str], start: int, count: int
+) -> np.ndarray:
+    """Values of `expr` for assignments `start` to `start + count - 1`."""
+    assignments = np.arange(start, start + count, dtype=np.uint64)
+    columns = {
+        name: ((assignments >> np.uint64(i)) & np.uint64(1)).astype(bool)
+        for i, name in enumerate(names)
+    }
+    values: dict[int, np.ndarray] = {}
+    stack: list[tuple[Expr, bool]] = [(expr, False)]
+    while stack:
+        node, expanded = stack.pop()
+        if id(node) in values:
+            continue
+        children = _children(node)
+        if not expanded and children:
+            stack.append((node, True))
+            stack.extend((child, False) for child in children)
+            continue
+        args = [values[id(child)] for child in children]
+        if isinstance(node, VariableExpr):
+            if node.name not in columns:
+                raise ValueError(f"Variable '{node.name}' is used but not listed")
+            result = columns[node.name]
+        elif isinstance(node, LiteralExpr):
+            result = np.full(count, bool(node.value))
+        elif isinstance(node, UnaryExpr) and node.operator == TokenType.NOT:
+            result = ~args[0]
+        elif isinstance(node, BinaryExpr):
+            a, b = args
+            match node.operator:
+                case TokenType.AND:
+                    result = a & b
+                case TokenType.OR:
+                    result = a | b
+                case TokenType.XOR:
+                    result = a ^ b
+                case TokenType.IMPLICATION:
+                    result = ~a | b
+                case TokenType.BICONDITIONAL:
+                    result = ~(a ^ b)
+                case _:
+                    raise NotImplementedError(f"Operator {node.operator} not implemented.")
+        elif isinstance(node, NaryExpr) and node.operator == TokenType.AND:
+            result = np.logical_and.reduce(args) if args else np.ones(count, bool)
+        elif isinstance(node, NaryExpr) and node.operator == TokenType.OR:
+            result = np.logical_or.reduce(args) if args else np.zeros(count, bool)
+        else:
+            raise ValueError(f"Cannot tabulate {type(node).__name__}")
+        values[id(node)] = result
+    return values[id(expr)]
+
+
+def _header(names: list[str]) -> bytes:
+    encoded = b"".join(name.encode() + b"\0" for name in names)
+    header = HEADER.pack(MAGIC, len(names), len(encoded)) + encoded
+    return header + bytes(-len(header) % 8)
+
+
+def write_table(
+    expr: Expr,
+    path: str,
+    variables: Iterable[str] | None = None,
+    chunk_bits: int = CHUNK_BITS,
+) -> "PackedTable":
+    """Evaluate `expr` on every assignment, `2 ** chunk_bits` at a time, into `path`."""
+    names = collect_variables(expr) if variables is None else list(variables)
+    total = 1 << len(names)
+    chunk = 1 << max(chunk_bits, 3)
+    with open(path, "wb") as f:
+        f.write(_header(names))
+        for start in range(0, total, chunk):
+            values = evaluate_range(expr, names, start, min(chunk, total - start))
+            f.write(np.packbits(values).tobytes())
+    return PackedTable(path)
+
+
+class PackedTable:
+    """A stored truth table, mapped into memory with `numpy.memmap`."""
+
+    def __init__(self, path: str) -> None:
+        with open(path, "rb") as f:
+            magic, num_vars, names_size = HEADER.unpack(f.read(HEADER.size))
+            if magic != MAGIC:
+                raise ValueError(f"{path} is not a packed truth table")
+            names = f.read(names_size).decode().split("\0")[:-1]
+        self.path = path
+        self.names = names
+        self.size = 1 << num_vars
+        offset = len(_header(names))
+        self.bits = np.memmap(
+            path, dtype=np.uint8, mode="r", offset=offset, shape=((self.size + 7) // 8,)
+        )
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __getitem__(self, assignment: int | Mapping[str, bool]) -> bool:
+        if not isinstance(assignment, int):
+            assignment = sum(
+                1 << i for i, name in enumerate(self.names) if assignment[name]
+            )
+        if not 0 <= assignment < self.size:
+            raise IndexError(assignment)
+        return bool(self.bits[assignment >> 3] >> (7 - (assignment & 7)) & 1)
+
+    def chunks(self, chunk_bytes: int = 1 << 20):
+        for start in range(0, len(self.bits), chunk_bytes):
+            yield self.bits[start : start + chunk_bytes]
+
+    def count(self) -> int:
+        """Number of satisfying assignments."""
+        return sum(int(_popcount(chunk).sum(dtype=np.uint64)) for chunk in self.chunks())
+
+    def _check_compatible(self, other: "PackedTable"):
+        if self.names != other.names:
+            raise ValueError(
+                f"Tables are over different variables: {self.names} and {other.names}"
+            )
+
+    def count_with(self, other: "PackedTable", operation: str) -> int:
+        """Satisfying assignments of `self <operation> other`, without storing it."""
+        self._check_compatible(other)
+        combine = OPERATIONS[operation]
+        return sum(
+            int(_popcount(combine(a, b)).sum(dtype=np.uint64))
+            for a, b in zip(self.chunks(), other.chunks())
+        )
+
+    def combine(self, other: "PackedTable", operation: str, path: str) -> "PackedTable":
+        """Store the table of `self <operation> other` in `path`.
+
+        `operation` is one of "and", "or", "xor" and "andnot".
+        """
+        self._check_compatible(other)
+        combine = OPERATIONS[operation]
+        with open(path, "wb") as f:
+            f.write(_header(self.names))
+            for a, b in zip(self.chunks(), other.chunks()):
+                f.write(combine(a, b).tobytes())
+        return PackedTable(path)
@@ -1,8 +1,34 @@
+from collections import deque
 from dataclasses import dataclass
-from typing import Callable
+from functools import cached_property
+from typing import Iterable
+from logic_parser import profiling
+from logic_parser.environment import Environment
 from logic_parser.exceptions import ParserError
-from logic_parser.expr import BinaryExpr, Expr, LiteralExpr, NoneExpr, UnaryExpr
+from logic_parser.frame import Frame
+from logic_parser.memo import CallCache, truth_value
+from logic_parser.expr import (
+    PRECEDENCE,
+    BinaryExpr,
+    Expr,
+    LiteralExpr,
+    NoneExpr,
+    UnaryExpr,
+    VariableExpr,
+)
 from logic_parser.token import Token, TokenType
+from logic_parser.tokenizer import scan
+
+# Operator stack entries of `Parser.parse_expression`.
+NOT_ENTRY = (PRECEDENCE[TokenType.NOT], TokenType.NOT)
+OPEN_P_ENTRY = (-1, TokenType.OPEN_P)
+GROUP_ENTRY = (-1, None)
+CALL_OR_ASSIGN = (TokenType.OPEN_P, TokenType.ASSIGN)
+BINARY_ENTRIES = {
+    operator.value: (precedence, operator)
+    for operator, precedence in PRECEDENCE.items()
+    if operator != TokenType.NOT
+}
 
 
 @dataclass
@@ -11,21 +37,76 @@ class Function:
     args: list[str]
     tokens: list[Token]
 
+    @cached_property
+    def closed(self) -> bool:
+        """Whether the body reads only the arguments, so calls depend on nothing else."""
+        args = set(self.args)
+        return all(
+            t.type != TokenType.IDENTIFIER or t.value in args for t in self.tokens
+        )
+
+
+class TokenStream:
+    """Tokens pulled from an iterable, keeping at most `lookahead` of them buffered."""
+
+    def __init__(self, tokens: Iterable[Token], lookahead: int = 2) -> None:
+        self.tokens = iter(tokens)
+        self.lookahead = lookahead
+        self.buffer: deque[Token] = deque()
+
+    def peek(self, offset: int = 0) -> Token | None:
+        if offset < len(self.buffer):
+            return self.buffer[offset]
+        if offset >= self.lookahead:
+            raise ValueError(f"Cannot look {offset} tokens ahead")
+        while len(self.buffer) <= offset:
+            if (token := next(self.tokens, None)) is None:
+                return None
+            self.buffer.append(token)
+        return self.buffer[offset]
+
+    def advance(self) -> Token:
+        return self.buffer.popleft()
+
 
 class Parser:
     def __init__(
-        self, tokens: list[Token], memory: dict[str, Expr | bool] = {}
+        self,
+        tokens: Iterable[Token],
+        memory: dict[str, Expr | bool] | Environment | Frame | None = None,
+        free_variables: bool = False,
+        calls: CallCache | None = None,
     ) -> None:
-        self.tokens = tokens
-        self.memory = memory
+        # Lists of tokens, such as function bodies, were tokenized earlier.
+        if profiling.ACTIVE is not None and not isinstance(tokens, list):
+            tokens = profiling.ACTIVE.tokens(tokens)
+        self.tokens = TokenStream(tokens)
+        # Each parser gets its own frame unless it is given a memory to share.
+        self.memory = Frame() if memory is None else memory
+        self.free_variables = free_variables
         self.functions: dict[str, Function] = {}
-        self.pos = 0
+        # Parsed calls of `functions`, shared with the parsers of their bodies.
+        self.calls = CallCache() if calls is None else calls
 
     def peek(self, next: int = 0):
-        pos = self.pos + next
-        if pos < len(self.tokens):
-            return self.tokens[pos]
-        return None
+        return self.tokens.peek(next)
+
+    def recall(self, key: str):
+        """Look `key` up in memory. Names in an `Environment` stay references."""
+        if type(self.memory) is Frame:
+            # Most names are found in the parser's own frame, with no call.
+            if (value := dict.get(self.memory, key)) is not None:
+                return value
+            return self.memory.lookup(key)
+        if isinstance(self.memory, Environment):
+            return VariableExpr(key) if key in self.memory else None
+        return self.memory.get(key)
+
+    def call_frame(self) -> Frame:
+        """A frame for the arguments of a function called from this parser."""
+        if isinstance(self.memory, Frame):
+            return Frame(self.memory)
+        return Frame(outer=self.recall)
 
     def consume(self, expected_type: TokenType):
         if not (t := self.peek()):
@@ -35,70 +116,148 @@ class Parser:
                 f"Expected type '{expected_type.value}' got '{t.type.value}'",
                 token=t,
             )
-        self.pos += 1
+        self.tokens.advance()
         return t
 
-    def parse_binary_op(self, next_parse: Callable[[], Expr], type: TokenType):
-        node = next_parse()
-        while (t := self.peek()) and t.type == type:
-            self.consume(type)
-            right = next_parse()
-            node = BinaryExpr(type, node, right)
-        return node
-
     def parse_all(self):
-        while self.pos < len(self.tokens):
+        profiler = profiling.ACTIVE
+        while self.peek() is not None:
             while (t := self.peek()) and t.type in [
                 TokenType.WHITESPACE,
                 TokenType.NEW_LINE,
             ]:
                 self.consume(t.type)
-            if self.pos >= len(self.tokens):
+            if self.peek() is None:
                 break
-            yield self.parse_commentary()
+            if profiler is None:
+                yield self.parse_expression()
+            else:
+                yield profiler.statement(self.parse_expression)
 
     def parse(self):
-        return self.parse_commentary()
+        return self.parse_expression()
 
     def parse_commentary(self):
-        if (t := self.peek()) and t.type == TokenType.COMMENT:
-            self.consume(TokenType.COMMENT)
-        return self.parse_biconditional()
-
-    def parse_biconditional(self):
-        return self.parse_binary_op(self.parse_implication, TokenType.BICONDITIONAL)
-
-    def parse_implication(self):
-        return self.parse_binary_op(self.parse_or, TokenType.IMPLICATION)
-
-    def parse_or(self):
-        return self.parse_binary_op(self.parse_xor, TokenType.OR)
-
-    def parse_xor(self):
-        return self.parse_binary_op(self.parse_and, TokenType.XOR)
+        # Comments, blank lines and assignments ahead of an expression are
+        # consumed in a loop instead of recursing into what follows them, so
+        # long runs of assignments do not grow the call stack.
+        while t := self.peek():
+            if t.type in [TokenType.COMMENT, TokenType.NEW_LINE, TokenType.WHITESPACE]:
+                self.consume(t.type)
+            elif (
+                t.type == TokenType.IDENTIFIER
+                and (next_t := self.peek(1))
+                and next_t.type == TokenType.ASSIGN
+            ):
+                self.consume(TokenType.IDENTIFIER)
+                self.consume(TokenType.ASSIGN)
+                self.memory[t.value] = self.parse_assignment()
+            else:
+                break
 
-    def parse_and(self):
-        return self.parse_binary_op(self.parse_not, TokenType.AND)
+    def parse_expression(self) -> Expr:
+        """Parse one expression by precedence climbing.
+
+        Pending operators live on an explicit stack as `(precedence,
+        operator)` pairs, with `(` marking an open parenthesis and None a
+        nested expression that an operand started (after a line break or an
+        assignment); both markers have precedence -1 so reductions stop at
+        them. A group ends at the first token that is not a binary operator,
+        so nesting depth is not limited by Python recursion. All binary
+        operators are left associative and `~` binds tighter than any of them.
+        """
+        operands: list[Expr] = []
+        operators: list[tuple[int, TokenType | None]] = []
+        # The token buffer is read and refilled directly: this loop looks at
+        # nearly every token, so it avoids a method call for each of them.
+        buffer = self.tokens.buffer
+        source = self.tokens.tokens
+        peek = self.tokens.peek
+        advance = buffer.popleft
+        reduce = self.reduce
+        self.parse_commentary()
+        while True:
+            if buffer:
+                t = buffer[0]
+            elif t := next(source, None):
+                buffer.append(t)
+            kind = t.type if t else None
+            if kind is TokenType.NOT:
+                advance()
+                operators.append(NOT_ENTRY)
+                continue
+            if kind is TokenType.OPEN_P:
+                advance()
+                operators.append(OPEN_P_ENTRY)
+                self.parse_commentary()
+                continue
+            if kind is TokenType.LITERAL:
+                advance()
+                operands.append(LiteralExpr(t.value == "1"))
+            elif (
+                kind is TokenType.IDENTIFIER
+                and isinstance(t.value, str)
+                and (
+                    (next_t := peek(1)) is None
+                    or next_t.type not in CALL_OR_ASSIGN
+                )
+            ):
+                advance()
+                operands.append(self.resolve(t.value, t, next_t))
+            elif (operand := self.parse_identifier()) is None:
+                operators.append(GROUP_ENTRY)
+                self.parse_commentary()
+                continue
+            else:
+                operands.append(operand)
+
+            while True:
+                if buffer:
+                    t = buffer[0]
+                elif t := next(source, None):
+                    buffer.append(t)
+                # Operator tokens are keyed by their text, which is cheaper to
+                # hash than the token type and never matches an identifier.
+                if t and (entry := BINARY_ENTRIES.get(t.token)):
+                    if operators and operators[-1][0] >= entry[0]:
+                        reduce(operands, operators, entry[0])
+                    advance()
+                    operators.append(entry)
+                    break
+                if operators:
+                    reduce(operands, operators, 0)
+                if not operators:
+                    return operands.pop()
+                if operators.pop() is OPEN_P_ENTRY:
+                    self.consume(TokenType.CLOSE_P)
 
-    def parse_not(self):
-        if (t := self.peek()) and t.type == TokenType.NOT:
-            self.consume(TokenType.NOT)
-            operand = self.parse_not()
-            return UnaryExpr(TokenType.NOT, operand)
-        else:
-            return self.parse_identifier()
+    @staticmethod
+    def reduce(
+        operands: list[Expr],
+        operators: list[tuple[int, TokenType | None]],
+        precedence: int,
+    ):
+        """Apply stacked operators binding at least as tightly as `precedence`."""
+        while operators and operators[-1][0] >= precedence:
+            operator = operators.pop()[1]
+            if operator is TokenType.NOT:
+                operands.append(UnaryExpr(operator, operands.pop()))
+            else:
+                right = operands.pop()
+                operands.append(BinaryExpr(operator, operands.pop(), right))
 
-    def parse_identifier(self):
+    def parse_identifier(self) -> Expr | None:
+        """Parse an operand, or return None if it is a nested expression."""
         if not (t := self.peek()):
             return NoneExpr()
 
         if t.type in [TokenType.NEW_LINE, TokenType.WHITESPACE]:
             self.consume(t.type)
-            return self.parse()
+            return None
 
         if t.type == TokenType.LITERAL:
             self.consume(TokenType.LITERAL)
-            return LiteralExpr(t.value)
+            return LiteralExpr(t.value == "1")
 
         if t and t.type == TokenType.IDENTIFIER:
             key = self.consume(TokenType.IDENTIFIER).value
@@ -134,8 +293,10 @@ class Parser:
                             break
                         func_tokens.append(func_t)
 
+                    if (previous := self.functions.get(key)) is not None:
+                        self.calls.forget(previous)
                     self.functions[key] = Function(key, args, func_tokens)
-                    return self.parse()
+                    return None
 
                 if next_t and next_t.type == TokenType.COMMA:
                     func = self.functions[key]
@@ -145,50 +306,78 @@ class Parser:
                             token=next_t,
                         )
 
-                    local_memory = {}
-                    for i, arg in enumerate(func.args):
-                        if val := self.memory.get(args[i]):
-                            local_memory[arg] = val
-                        else:
+                    values = []
+                    for name in args:
+                        if not (val := self.recall(name)):
                             raise ParserError(
                                 f"No value found for variable name '{key}'", token=t
                             )
-
-                    local_parser = Parser(func.tokens, local_memory)
-                    return local_parser.parse()
+                        values.append(val)
+                    return self.call(func, values)
 
             if next_t and next_t.type == TokenType.ASSIGN:
                 self.consume(TokenType.ASSIGN)
                 value = self.parse_assignment()
                 self.memory[key] = value
-                return self.parse()
+                return None
 
-            value = self.memory.get(key)
-            if value is None:
-                raise ParserError(f"No value found for variable name '{key}'", token=t)
-            if isinstance(value, Expr):
-                return value
-            if isinstance(value, Token):
-                if value.value == "0":
-                    return LiteralExpr(False)
-                if value.value == "1":
-                    return LiteralExpr(True)
-                else:
-                    raise ParserError(
-                        f"Invalid token value '{value.value}'",
-                        token=next_t,
-                    )
-            if isinstance(value, bool):
+            return self.resolve(key, t, next_t)
+        else:
+            raise ParserError(f"Unexpected Token: '{t.token}'", token=t)
+
+    def call(self, func: Function, args: list) -> Expr:
+        """Parse the body of `func` with its arguments bound to `args`.
+
+        Calls with the same argument values reuse the value of an earlier
+        call from `calls` when it can be cached.
+        """
+        if (key := self.calls.key(func, args)) is not None:
+            if (cached := self.calls.get(key)) is not None:
+                if profiling.ACTIVE is not None:
+                    profiling.ACTIVE.memo_hit(func.name)
+                return LiteralExpr(cached)
+        local_memory = self.call_frame()
+        for name, arg in zip(func.args, args):
+            local_memory[name] = arg
+        local_parser = Parser(
+            func.tokens, local_memory, self.free_variables, self.calls
+        )
+        if profiling.ACTIVE is not None:
+            expr = profiling.ACTIVE.function_call(
+                func.name, len(func.tokens), local_parser.parse
+            )
+        else:
+            expr = local_parser.parse()
+        if key is not None:
+            # The body reads only the arguments, whose values are all known.
+            if (value := truth_value(expr, self.calls.values)) is not None:
+                self.calls.put(key, func, value)
                 return LiteralExpr(value)
+        return expr
+
+    def resolve(self, key: str, t: Token, next_t: Token | None) -> Expr:
+        """The value of variable `key`, read at token `t`."""
+        value = self.recall(key)
+        if value is None and self.free_variables:
+            return VariableExpr(key)
+        if value is None:
+            raise ParserError(f"No value found for variable name '{key}'", token=t)
+        if isinstance(value, Expr):
+            return value
+        if isinstance(value, Token):
+            if value.value == "0":
+                return LiteralExpr(False)
+            if value.value == "1":
+                return LiteralExpr(True)
             else:
-                raise ParserError(f"Invalid assignment value '{value}'", token=next_t)
-        elif t and t.type == TokenType.OPEN_P:
-            self.consume(TokenType.OPEN_P)
-            expr = self.parse()
-            self.consume(TokenType.CLOSE_P)
-            return expr
+                raise ParserError(
+                    f"Invalid token value '{value.value}'",
+                    token=next_t,
+                )
+        if isinstance(value, bool):
+            return LiteralExpr(value)
         else:
-            raise ParserError(f"Unexpected Token: '{t.token}'", token=t)
+            raise ParserError(f"Invalid assignment value '{value}'", token=next_t)
 
     def parse_assignment(self):
         t = self.peek()
@@ -250,10 +439,13 @@ class Parser:
                     token=next_t,
                 )
 
-            local_memory = {arg: args[i] for i, arg in enumerate(expected_args)}
-            local_parser = Parser(func.tokens, local_memory)
-
-            return local_parser.parse()
+            return self.call(func, args)
 
         else:
             return self.parse()
+
+
+def parse_formula(formula: str) -> Expr:
+    """Parse `formula`, treating every unassigned identifier as a free variable."""
+    tokens = list(scan(formula))
+    return Parser(tokens, {}, free_variables=True).parse()
@@ -0,0 +1,215 @@
+"""Time and counts per phase of tokenizing, parsing and evaluating.
+
+While a `Profiler` is active, as in
+
+    with Profiler() as profiler:
+        for statement in Parser(tokenize_lines(f)).parse_all():
+            evaluate(statement)
+    print(profiler.report())
+
+the parser and `evaluate` report to it. When none is active they only
+check `ACTIVE` once per parser, statement, function call and evaluation.
+"""
+
+import json
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, field
+from typing import Callable, Iterable, Iterator, TextIO
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+# The profiler that parsers and `evaluate` report to, if any.
+ACTIVE: "Profiler | None" = None
+
+
+@dataclass
+class Phase:
+    seconds: float = 0.0
+    calls: int = 0
+
+
+@dataclass
+class FunctionCalls:
+    calls: int = 0
+    seconds: float = 0.0
+    # Tokens of the body parsed again, over all calls.
+    tokens: int = 0
+    # Calls answered from the parser's `CallCache`, not counted in `calls`.
+    cached: int = 0
+
+
+@dataclass
+class Report:
+    seconds: float
+    tokenize: Phase
+    parse: Phase
+    evaluate: Phase
+    tokens: int
+    tokens_per_second: float
+    statements: int
+    ast_nodes: int
+    eval_visits: int
+    functions: dict[str, FunctionCalls] = field(default_factory=dict)
+    peak_rss_bytes: int | None = None
+    peak_traced_bytes: int | None = None
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self), indent=2)
+
+    def __str__(self) -> str:
+        lines = [
+            f"total     {self.seconds:>9.3f}s",
+            f"tokenize  {self.tokenize.seconds:>9.3f}s {self.tokens} tokens, "
+            f"{self.tokens_per_second:,.0f}/s",
+            f"parse     {self.parse.seconds:>9.3f}s {self.statements} statements, "
+            f"{self.ast_nodes} nodes",
+            f"evaluate  {self.evaluate.seconds:>9.3f}s {self.evaluate.calls} calls, "
+            f"{self.eval_visits} nodes visited",
+        ]
+        for name, calls in self.functions.items():
+            lines.append(
+                f"{'call ' + name:<10}{calls.seconds:>9.3f}s {calls.calls} calls, "
+                f"{calls.tokens} tokens parsed, {calls.cached} cached"
+            )
+        if self.peak_rss_bytes is not None:
+            lines.append(f"peak RSS  {self.peak_rss_bytes / 1e6:>9.1f} MB")
+        if self.peak_traced_bytes is not None:
+            lines.append(f"peak heap {self.peak_traced_bytes / 1e6:>9.1f} MB")
+        return "\n".join(lines)
+
+
+class Profiler:
+    """Collects timings and counts while it is active.
+
+    Parse time excludes the time spent pulling tokens, which is counted as
+    tokenizing; calls to user functions are part of parse time and are also
+    listed per function. `trace_memory` records the peak of the Python heap
+    with `tracemalloc`, which slows everything down several times; the peak
+    resident set size of the process is always reported where available.
+    """
+
+    def __init__(self, trace_memory: bool = False) -> None:
+        self.trace_memory = trace_memory
+        self.tokenize = Phase()
+        self.parse = Phase()
+        self.evaluate = Phase()
+        self.statements = 0
+        self.ast_nodes = 0
+        self.eval_visits = 0
+        self.functions: dict[str, FunctionCalls] = {}
+        self.seconds = 0.0
+        self.peak_traced_bytes: int | None = None
+        self._start = 0.0
+        self._previous: Profiler | None = None
+
+    def __enter__(self) -> "Profiler":
+        global ACTIVE
+        self._previous, ACTIVE = ACTIVE, self
+        if self.trace_memory:
+            tracemalloc.start()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        global ACTIVE
+        self.seconds += time.perf_counter() - self._start
+        if self.trace_memory:
+            self.peak_traced_bytes = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        ACTIVE = self._previous
+
+    def tokens(self, tokens: Iterable) -> Iterator:
+        """`tokens`, counting them and the time spent producing them."""
+        clock = time.perf_counter
+        phase = self.tokenize
+        iterator = iter(tokens)
+        while True:
+            start = clock()
+            try:
+                token = next(iterator)
+            except StopIteration:
+                phase.seconds += clock() - start
+                return
+            phase.seconds += clock() - start
+            phase.calls += 1
+            yield token
+
+    def statement(self, parse: Callable):
+        """Parse one statement with `parse`, timing it apart from tokenizing."""
+        # Imported here: the parser and `evaluate` import this module.
+        from logic_parser.optimizer import count_nodes
+
+        tokenizing = self.tokenize.seconds
+        start = time.perf_counter()
+        expr = parse()
+        elapsed = time.perf_counter() - start
+        self.parse.seconds += elapsed - (self.tokenize.seconds - tokenizing)
+        self.parse.calls += 1
+        self.statements += 1
+        self.ast_nodes += count_nodes(expr)
+        return expr
+
+    def function_call(self, name: str, tokens: int, parse: Callable):
+        """Parse the body of a call to `name` with `parse`, timing it."""
+        calls = self.calls_of(name)
+        start = time.perf_counter()
+        try:
+            return parse()
+        finally:
+            calls.seconds += time.perf_counter() - start
+            calls.calls += 1
+            calls.tokens += tokens
+
+    def memo_hit(self, name: str):
+        self.calls_of(name).cached += 1
+
+    def calls_of(self, name: str) -> FunctionCalls:
+        calls = self.functions.get(name)
+        if calls is None:
+            calls = self.functions[name] = FunctionCalls()
+        return calls
+
+    def evaluated(self, seconds: float, visits: int):
+        self.evaluate.seconds += seconds
+        self.evaluate.calls += 1
+        self.eval_visits += visits
+
+    def report(self) -> Report:
+        seconds = self.seconds
+        if ACTIVE is self:
+            seconds += time.perf_counter() - self._start
+        return Report(
+            seconds=seconds,
+            tokenize=self.tokenize,
+            parse=self.parse,
+            evaluate=self.evaluate,
+            tokens=self.tokenize.calls,
+            tokens_per_second=(
+                self.tokenize.calls / self.tokenize.seconds
+                if self.tokenize.seconds
+                else 0.0
+            ),
+            statements=self.statements,
+            ast_nodes=self.ast_nodes,
+            eval_visits=self.eval_visits,
+            functions=self.functions,
+            peak_rss_bytes=peak_rss(),
+            peak_traced_bytes=self.peak_traced_bytes,
+        )
+
+    def write_json(self, f: TextIO):
+        f.write(self.report().to_json() + "\n")
+
+
+def peak_rss() -> int | None:
+    """Peak resident set size of this process in bytes, if it can be read."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes.
+    return peak if sys.platform == "darwin" else peak * 1024
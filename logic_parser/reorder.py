@@ -0,0 +1,147 @@
+from logic_parser.expr import (
+    BinaryExpr,
+    Expr,
+    NaryExpr,
+    UnaryExpr,
+    apply_binary,
+    evaluate,
+)
+from logic_parser.optimizer import _children, count_nodes
+from logic_parser.token import TokenType
+
+# The operand value that decides each short-circuiting operator.
+DECIDING = {TokenType.AND: False, TokenType.OR: True}
+
+
+class Profile:
+    """How often each subtree evaluates to true or false.
+
+    `evaluate` short-circuits like `logic_parser.expr.evaluate` and counts
+    the nodes it evaluates and the nodes of the operands it skips. The
+    counts of a node are keyed by its id, so profiled nodes are kept alive.
+    """
+
+    def __init__(self) -> None:
+        self.counts: dict[int, list[int]] = {}
+        self.sizes: dict[int, int] = {}
+        self.nodes: dict[int, Expr] = {}
+        self.evaluated = 0
+        self.skipped = 0
+
+    def record(self, node: Expr, value) -> None:
+        self.evaluated += 1
+        if (counts := self.counts.get(id(node))) is None:
+            counts = self.counts[id(node)] = [0, 0]
+            self.nodes[id(node)] = node
+        counts[bool(value)] += 1
+
+    def skip(self, nodes: list[Expr]) -> None:
+        for node in nodes:
+            self.skipped += self.size(node)
+
+    def size(self, node: Expr) -> int:
+        if (size := self.sizes.get(id(node))) is None:
+            size = self.sizes[id(node)] = count_nodes(node)
+            self.nodes[id(node)] = node
+        return size
+
+    def probability(self, node: Expr, value: bool) -> float:
+        """Estimated chance that `node` evaluates to `value`, smoothed."""
+        false, true = self.counts.get(id(node), (0, 0))
+        return ((true if value else false) + 1) / (false + true + 2)
+
+    def evaluate(self, expr: Expr, env=None):
+        values: list = []
+        stack: list[tuple[Expr, int]] = [(expr, 0)]
+        while stack:
+            node, state = stack.pop()
+            if isinstance(node, BinaryExpr):
+                operator = node.operator
+                if state == 0:
+                    stack.append((node, 1))
+                    stack.append((node.r_operand, 0))
+                    continue
+                if state == 1:
+                    a = values[-1]
+                    if DECIDING.get(operator) == bool(a) or (
+                        operator == TokenType.IMPLICATION and not a
+                    ):
+                        self.skip([node.l_operand])
+                        values[-1] = a if operator in DECIDING else True
+                        self.record(node, values[-1])
+                        continue
+                    stack.append((node, 2))
+                    stack.append((node.l_operand, 0))
+                    continue
+                b = values.pop()
+                values[-1] = apply_binary(operator, values[-1], b)
+            elif isinstance(node, NaryExpr) and node.operator in DECIDING:
+                deciding = DECIDING[node.operator]
+                if state > 0 and bool(values.pop()) == deciding:
+                    self.skip(node.operands[state:])
+                    values.append(deciding)
+                elif state < len(node.operands):
+                    stack.append((node, state + 1))
+                    stack.append((node.operands[state], 0))
+                    continue
+                else:
+                    values.append(not deciding)
+            elif isinstance(node, UnaryExpr) and node.operator == TokenType.NOT:
+                if state == 0:
+                    stack.append((node, 1))
+                    stack.append((node.operand, 0))
+                    continue
+                values[-1] = not values[-1]
+            else:
+                values.append(evaluate(node, env))
+            self.record(node, values[-1])
+        return values.pop()
+
+    def score(self, node: Expr, deciding: bool) -> float:
+        """Expected nodes spent per evaluation that decides its parent."""
+        return self.size(node) / self.probability(node, deciding)
+
+
+def reorder(expr: Expr, profile: Profile) -> Expr:
+    """Copy of `expr` with the operands of AND and OR in profile order.
+
+    Operands that are cheap and likely to decide their operator, relative
+    to their size, move first, so short-circuiting skips more of the rest.
+    The result evaluates to the same value for every assignment, but may
+    no longer reach an operand that would raise, such as an unset variable.
+    """
+    built: dict[int, Expr] = {}
+    stack: list[tuple[Expr, bool]] = [(expr, False)]
+    while stack:
+        node, expanded = stack.pop()
+        if id(node) in built:
+            continue
+        children = _children(node)
+        if not expanded and children:
+            stack.append((node, True))
+            stack.extend((child, False) for child in children)
+            continue
+        if isinstance(node, UnaryExpr):
+            built[id(node)] = UnaryExpr(node.operator, built[id(node.operand)])
+        elif isinstance(node, BinaryExpr):
+            left, right = node.r_operand, node.l_operand
+            if node.operator in DECIDING:
+                deciding = DECIDING[node.operator]
+                if profile.score(right, deciding) < profile.score(left, deciding):
+                    left, right = right, left
+            built[id(node)] = BinaryExpr(
+                node.operator, built[id(left)], built[id(right)]
+            )
+        elif isinstance(node, NaryExpr):
+            operands = node.operands
+            if node.operator in DECIDING:
+                deciding = DECIDING[node.operator]
+                operands = sorted(
+                    operands, key=lambda operand: profile.score(operand, deciding)
+                )
+            built[id(node)] = NaryExpr(
+                node.operator, [built[id(operand)] for operand in operands]
+            )
+        else:
+            built[id(node)] = node
+    return built[id(expr)]
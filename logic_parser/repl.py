@@ -1,11 +1,44 @@
+import sys
+from collections import OrderedDict
+from typing import TextIO
+
+from logic_parser.cache import CacheStats
+from logic_parser.environment import Environment
 from logic_parser.exceptions import ParserError, TokenizerError
-from logic_parser.parser import Parser
-from logic_parser.tokenizer import Tokenizer
+from logic_parser.expr import Expr, NoneExpr, evaluate
+from logic_parser.memo import CallCache
+from logic_parser.parser import Function, Parser
+from logic_parser.token import Token, TokenType
+from logic_parser.tokenizer import scan
+
+PARSE_CACHE_SIZE = 4096
+BLOCK_SIZE = 1 << 16
 
 
 class REPL:
-    def __init__(self) -> None:
-        self.memory = {}
+    """Evaluates lines one at a time, keeping variables and functions between them.
+
+    Lines without assignments are parsed once. Variables of the
+    `Environment` stay references, so once a line parses its parse stays
+    valid while the function definitions are the same; lines with errors
+    are parsed again. The last `cache_size` parses are kept, keyed by their
+    text and `version`, which each change to the functions increases.
+
+    The tokens of the last `cache_size` lines are kept as well, keyed by
+    their text alone, since they do not depend on variables or functions.
+    Assignments and lines parsed again after a definition are not
+    tokenized again.
+    """
+
+    def __init__(self, cache_size: int = PARSE_CACHE_SIZE) -> None:
+        self.memory = Environment()
+        self.functions: dict[str, Function] = {}
+        self.calls = CallCache()
+        self.cache_size = cache_size
+        self.parsed: OrderedDict[tuple[str, int], Expr] = OrderedDict()
+        self.tokenized: OrderedDict[str, list[Token]] = OrderedDict()
+        self.version = 0
+        self.stats = CacheStats()
 
     def run(self):
         print("Positional Logic REPL")
@@ -18,21 +51,98 @@ class REPL:
             if expr == "exit":
                 print("\nExiting REPL")
                 return False
-            tokens = Tokenizer(expr).tokenize()
-            parsed = Parser(tokens, self.memory).parse()
-            result = parsed.eval()
-            print(result)
-        except KeyboardInterrupt:
+            print(self.execute(expr))
+        except (KeyboardInterrupt, EOFError):
             print("\nExiting REPL")
             return False
+        return True
+
+    def run_batch(
+        self,
+        stream: TextIO = sys.stdin,
+        out: TextIO = sys.stdout,
+        block_size: int = BLOCK_SIZE,
+    ):
+        """Evaluate the lines of `stream` without prompts, until `exit` or its end.
+
+        `stream` is read `block_size` characters at a time and the results
+        of each block are written together. Blank lines and assignments
+        print nothing.
+        """
+        pending = ""
+        while block := stream.read(block_size):
+            lines = (pending + block).split("\n")
+            pending = lines.pop()
+            if not self.run_lines(lines, out):
+                return
+        if pending:
+            self.run_lines([pending], out)
+
+    def run_lines(self, lines: list[str], out: TextIO) -> bool:
+        """Evaluate `lines` for `run_batch`; False if one of them is `exit`."""
+        outputs = []
+        running = True
+        for line in lines:
+            line = line.rstrip("\r")
+            if line == "exit":
+                running = False
+                break
+            if line.strip() and (output := self.execute(line)) is not None:
+                outputs.append(output)
+        if outputs:
+            out.write("\n".join(outputs) + "\n")
+            out.flush()
+        return running
+
+    def execute(self, line: str) -> str | None:
+        """What the REPL prints for `line`: its value, an error, or None."""
+        try:
+            parsed = self.parse(line)
+            if isinstance(parsed, NoneExpr):
+                return None
+            return str(evaluate(parsed, self.memory))
         except TokenizerError as t_err:
-            print(f"Error at position {t_err.line_pos + 1}: {t_err}.")
+            return f"Error at position {t_err.line_pos + 1}: {t_err}."
         except ParserError as p_err:
             if p_err.token:
-                print(f"Error at position {p_err.token.line_pos + 1}: {p_err}.")
-            else:
-                print(f"Error: {p_err}.")
+                return f"Error at position {p_err.token.line_pos + 1}: {p_err}."
+            return f"Error: {p_err}."
         except Exception as e:
-            print(e)
+            return str(e)
 
-        return True
+    def parse(self, line: str) -> Expr:
+        """Parse `line`, from the parse cache if it holds it."""
+        key = (line, self.version)
+        if (parsed := self.parsed.get(key)) is not None:
+            self.parsed.move_to_end(key)
+            self.stats.hits += 1
+            return parsed
+        self.stats.misses += 1
+        tokens = self.tokenize(line)
+        parser = Parser(tokens, self.memory, calls=self.calls)
+        parser.functions = self.functions
+        if any(t.type is TokenType.ASSIGN for t in tokens):
+            functions = dict(self.functions)
+            try:
+                return parser.parse()
+            finally:
+                if self.functions != functions:
+                    self.version += 1
+        parsed = parser.parse()
+        if self.cache_size:
+            self.parsed[key] = parsed
+            if len(self.parsed) > self.cache_size:
+                self.parsed.popitem(last=False)
+        return parsed
+
+    def tokenize(self, line: str) -> list[Token]:
+        """The tokens of `line`, which the parser reads but does not change."""
+        if (tokens := self.tokenized.get(line)) is not None:
+            self.tokenized.move_to_end(line)
+            return tokens
+        tokens = list(scan(line))
+        if self.cache_size:
+            self.tokenized[line] = tokens
+            if len(self.tokenized) > self.cache_size:
+                self.tokenized.popitem(last=False)
+        return tokens
@@ -0,0 +1,61 @@
+from logic_parser.expr import Expr, UnaryExpr
+from logic_parser.sat.cnf import CNF, TseitinEncoder, tseitin
+from logic_parser.sat.counter import ModelCounter, count_models
+from logic_parser.sat.dimacs import parse_dimacs, read_dimacs, to_dimacs, write_dimacs
+from logic_parser.sat.solver import Solver
+from logic_parser.token import TokenType
+
+__all__ = [
+    "CNF",
+    "ModelCounter",
+    "Solver",
+    "TseitinEncoder",
+    "are_equivalent",
+    "count_models",
+    "find_model",
+    "is_satisfiable",
+    "is_tautology",
+    "parse_dimacs",
+    "read_dimacs",
+    "solve_cnf",
+    "to_dimacs",
+    "tseitin",
+    "write_dimacs",
+]
+
+
+def solve_cnf(cnf: CNF, assumptions: list[int] | None = None) -> dict[int, bool] | None:
+    """Solve `cnf` and return a model indexed by variable, or None if UNSAT."""
+    solver = Solver(cnf.num_vars)
+    for clause in cnf.clauses:
+        if not solver.add_clause(clause):
+            return None
+    if not solver.solve(assumptions or ()):
+        return None
+    return solver.model
+
+
+def find_model(expr: Expr) -> dict[str, bool] | None:
+    """Return an assignment of the free variables satisfying `expr`, if any."""
+    cnf, root = tseitin(expr)
+    if (model := solve_cnf(cnf, [root])) is None:
+        return None
+    return {name: model[index] for name, index in cnf.variables.items()}
+
+
+def is_satisfiable(expr: Expr) -> bool:
+    return find_model(expr) is not None
+
+
+def is_tautology(expr: Expr) -> bool:
+    return not is_satisfiable(UnaryExpr(TokenType.NOT, expr))
+
+
+def are_equivalent(left: Expr, right: Expr) -> bool:
+    """Return True if both expressions agree under every assignment."""
+    encoder = TseitinEncoder()
+    a = encoder.encode(left)
+    b = encoder.encode(right)
+    encoder.cnf.add_clause(a, b)
+    encoder.cnf.add_clause(-a, -b)
+    return solve_cnf(encoder.cnf) is None
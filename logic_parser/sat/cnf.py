@@ -0,0 +1,188 @@
+from dataclasses import dataclass, field
+
+from logic_parser.expr import (
+    BinaryExpr,
+    Expr,
+    LiteralExpr,
+    NaryExpr,
+    NoneExpr,
+    UnaryExpr,
+    VariableExpr,
+)
+from logic_parser.token import TokenType
+
+
+@dataclass
+class CNF:
+    """A formula in conjunctive normal form using DIMACS-style integer literals.
+
+    `variables` maps the names of the original (non auxiliary) variables to
+    their DIMACS index; every other index up to `num_vars` is a Tseitin
+    auxiliary.
+    """
+
+    num_vars: int = 0
+    clauses: list[list[int]] = field(default_factory=list)
+    variables: dict[str, int] = field(default_factory=dict)
+
+    def new_var(self) -> int:
+        self.num_vars += 1
+        return self.num_vars
+
+    def var(self, name: str) -> int:
+        if (index := self.variables.get(name)) is None:
+            index = self.variables[name] = self.new_var()
+        return index
+
+    def add_clause(self, *literals: int):
+        self.clauses.append(list(literals))
+
+
+class TseitinEncoder:
+    """Encodes `Expr` trees into an equisatisfiable CNF.
+
+    Chains of the same associative operator become a single n-ary gate, so
+    a formula that is already in CNF encodes to (a renaming of) itself;
+    links of a chain with more than one parent get gates of their own.
+    Every gate output gets an auxiliary variable constrained in both
+    directions, so auxiliaries are fully determined by the original
+    variables and the encoding also preserves the number of models.
+    Subtrees shared between expressions (as produced by variable
+    substitution in the parser) are encoded only once.
+    """
+
+    def __init__(self, cnf: CNF | None = None) -> None:
+        self.cnf = cnf if cnf is not None else CNF()
+        self.cache: dict[int, int] = {}
+        self.nodes: list[Expr] = []
+        self.true_lit: int | None = None
+
+    def constant(self, value: bool) -> int:
+        if self.true_lit is None:
+            self.true_lit = self.cnf.new_var()
+            self.cnf.add_clause(self.true_lit)
+        return self.true_lit if value else -self.true_lit
+
+    def encode(self, expr: Expr) -> int:
+        """Return the literal that is true exactly when `expr` is true."""
+        parents = self.count_parents(expr)
+        # Flattened operands of the nodes being encoded, until they are.
+        operands: dict[int, list[Expr]] = {}
+        stack: list[tuple[Expr, bool]] = [(expr, False)]
+        while stack:
+            node, expanded = stack.pop()
+            if id(node) in self.cache:
+                continue
+            if expanded:
+                self.cache[id(node)] = self.encode_node(node, operands.pop(id(node)))
+                continue
+            # Keep the node alive so its id() cannot be reused.
+            self.nodes.append(node)
+            children = operands[id(node)] = self.children(node, parents)
+            stack.append((node, True))
+            stack.extend((child, False) for child in reversed(children))
+        return self.cache[id(expr)]
+
+    def count_parents(self, expr: Expr) -> dict[int, int]:
+        """How many parents each node below `expr` not yet encoded has."""
+        parents: dict[int, int] = {}
+        stack = [expr]
+        while stack:
+            node = stack.pop()
+            if id(node) in self.cache:
+                continue
+            for child in _operands(node):
+                count = parents.get(id(child), 0)
+                parents[id(child)] = count + 1
+                if not count:
+                    stack.append(child)
+        return parents
+
+    def children(self, node: Expr, parents: dict[int, int]) -> list[Expr]:
+        """Operands of `node`, with chains of AND or OR flattened into one gate.
+
+        A chain stops at nodes that are already encoded or have other
+        parents: those are encoded once, as gates of their own, so shared
+        subtrees are not flattened again into every gate above them.
+        """
+        if not isinstance(node, (BinaryExpr, NaryExpr)) or node.operator not in (
+            TokenType.AND,
+            TokenType.OR,
+        ):
+            return _operands(node)
+        stack = list(reversed(_operands(node)))
+        operands = []
+        while stack:
+            child = stack.pop()
+            if (
+                isinstance(child, (BinaryExpr, NaryExpr))
+                and child.operator == node.operator
+                and id(child) not in self.cache
+                and parents.get(id(child), 0) <= 1
+            ):
+                stack.extend(reversed(_operands(child)))
+            else:
+                operands.append(child)
+        return operands
+
+    def encode_node(self, node: Expr, children: list[Expr]) -> int:
+        if isinstance(node, LiteralExpr):
+            return self.constant(bool(node.value))
+        if isinstance(node, VariableExpr):
+            return self.cnf.var(node.name)
+        if isinstance(node, UnaryExpr):
+            if node.operator != TokenType.NOT:
+                raise NotImplementedError(f"Operator {node.operator} not implemented.")
+            return -self.cache[id(node.operand)]
+        if isinstance(node, (BinaryExpr, NaryExpr)):
+            operands = [self.cache[id(child)] for child in children]
+            return self.gate(node.operator, operands)
+        if isinstance(node, NoneExpr):
+            raise ValueError("Cannot encode an empty expression")
+        raise NotImplementedError(f"Expression {type(node).__name__} not supported.")
+
+    def gate(self, operator: TokenType, operands: list[int]) -> int:
+        add = self.cnf.add_clause
+        match operator:
+            case TokenType.AND:
+                g = self.cnf.new_var()
+                for a in operands:
+                    add(-g, a)
+                add(g, *(-a for a in operands))
+            case TokenType.OR:
+                g = self.cnf.new_var()
+                for a in operands:
+                    add(g, -a)
+                add(-g, *operands)
+            case TokenType.IMPLICATION:
+                a, b = operands
+                g = self.gate(TokenType.OR, [-a, b])
+            case TokenType.XOR:
+                a, b = operands
+                g = self.cnf.new_var()
+                add(-g, a, b)
+                add(-g, -a, -b)
+                add(g, -a, b)
+                add(g, a, -b)
+            case TokenType.BICONDITIONAL:
+                g = -self.gate(TokenType.XOR, operands)
+            case _:
+                raise NotImplementedError(f"Operator {operator} not implemented.")
+        return g
+
+
+def _operands(node: Expr) -> list[Expr]:
+    if isinstance(node, UnaryExpr):
+        return [node.operand]
+    if isinstance(node, BinaryExpr):
+        return [node.r_operand, node.l_operand]
+    if isinstance(node, NaryExpr):
+        return node.operands
+    return []
+
+
+def tseitin(expr: Expr) -> tuple[CNF, int]:
+    """Encode `expr` and return the CNF together with its root literal."""
+    encoder = TseitinEncoder()
+    root = encoder.encode(expr)
+    return encoder.cnf, root
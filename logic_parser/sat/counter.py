@@ -0,0 +1,215 @@
+import heapq
+from dataclasses import dataclass
+from typing import Iterable
+
+from logic_parser.expr import Expr, collect_variables
+from logic_parser.sat.cnf import CNF, tseitin
+
+Clause = tuple[int, ...]
+
+
+@dataclass
+class CounterStats:
+    decisions: int = 0
+    components: int = 0
+    cache_hits: int = 0
+
+
+class ModelCounter:
+    """Exact model counter (#SAT) for a CNF.
+
+    Counts by DPLL-style branching with unit propagation after every
+    decision. After propagation the remaining clauses are split into
+    components that share no variables; their counts multiply, and each
+    component's count is cached by its clause set, so identical
+    subproblems reached through different branches are counted once.
+    Variables that disappear from the clauses without being assigned
+    contribute a factor of two each.
+
+    Branching follows a min-degree elimination order of the clauses'
+    variable graph, taking the variable eliminated last first: those are
+    the separators of the graph, so assigning them splits it into
+    components early.
+    """
+
+    def __init__(self, cnf: CNF, cache_size: int = 1 << 18) -> None:
+        self.cnf = cnf
+        self.cache_size = cache_size
+        self.cache: dict[frozenset[Clause], int] = {}
+        self.rank: dict[int, int] = {}
+        self.stats = CounterStats()
+
+    def count(self) -> int:
+        """Number of assignments to variables 1..num_vars satisfying the CNF."""
+        clauses = []
+        for clause in self.cnf.clauses:
+            literals = set(clause)
+            if any(-lit in literals for lit in literals):
+                continue
+            clauses.append(tuple(sorted(literals)))
+        all_vars = set(range(1, self.cnf.num_vars + 1))
+
+        if (reduced := self._propagate(clauses, [])) is None:
+            return 0
+        remaining, assigned = reduced
+        self.rank = self._elimination_rank(remaining)
+        free = all_vars - assigned - self._variables(remaining)
+        return self._count(remaining) << len(free)
+
+    def _count(self, clauses: list[Clause]) -> int:
+        result = 1
+        for component in self._components(clauses):
+            self.stats.components += 1
+            key = frozenset(component)
+            if (count := self.cache.get(key)) is not None:
+                self.stats.cache_hits += 1
+            else:
+                count = self._count_component(component)
+                if len(self.cache) >= self.cache_size:
+                    del self.cache[next(iter(self.cache))]
+                self.cache[key] = count
+            result *= count
+            if result == 0:
+                break
+        return result
+
+    def _count_component(self, clauses: list[Clause]) -> int:
+        variables = self._variables(clauses)
+        var = self._choose(clauses)
+        self.stats.decisions += 1
+        total = 0
+        for lit in (var, -var):
+            if (reduced := self._propagate(clauses, [lit])) is None:
+                continue
+            remaining, assigned = reduced
+            free = variables - assigned - self._variables(remaining)
+            total += self._count(remaining) << len(free)
+        return total
+
+    def _choose(self, clauses: list[Clause]) -> int:
+        variables = (abs(lit) for clause in clauses for lit in clause)
+        return max(variables, key=self.rank.__getitem__)
+
+    @staticmethod
+    def _elimination_rank(clauses: list[Clause]) -> dict[int, int]:
+        """Position of each variable in a greedy min-degree elimination order."""
+        neighbours: dict[int, set[int]] = {}
+        for clause in clauses:
+            for lit in clause:
+                neighbours.setdefault(abs(lit), set()).update(abs(other) for other in clause)
+        for var, adjacent in neighbours.items():
+            adjacent.discard(var)
+        heap = [(len(adj), var) for var, adj in neighbours.items()]
+        heapq.heapify(heap)
+        rank = {}
+        while heap:
+            degree, var = heapq.heappop(heap)
+            if var in rank or degree != len(neighbours[var]):
+                continue
+            rank[var] = len(rank)
+            adjacent = neighbours.pop(var)
+            for other in adjacent:
+                neighbours[other].discard(var)
+                neighbours[other].update(adjacent - {other})
+                heapq.heappush(heap, (len(neighbours[other]), other))
+        return rank
+
+    @staticmethod
+    def _propagate(
+        clauses: list[Clause], units: list[int]
+    ) -> tuple[list[Clause], set[int]] | None:
+        """Assign `units` and every literal they force.
+
+        Returns the simplified clauses and the assigned variables, or None
+        on conflict.
+        """
+        occurrences: dict[int, list[int]] = {}
+        for i, clause in enumerate(clauses):
+            for lit in clause:
+                occurrences.setdefault(lit, []).append(i)
+        remaining = [len(clause) for clause in clauses]
+        satisfied = [False] * len(clauses)
+        assigned: dict[int, int] = {}
+        pending = list(units) + [clause[0] for clause in clauses if len(clause) == 1]
+
+        while pending:
+            lit = pending.pop()
+            var = abs(lit)
+            if var in assigned:
+                if assigned[var] != lit:
+                    return None
+                continue
+            assigned[var] = lit
+            for i in occurrences.get(lit, ()):
+                satisfied[i] = True
+            for i in occurrences.get(-lit, ()):
+                if satisfied[i]:
+                    continue
+                remaining[i] -= 1
+                if remaining[i] == 0:
+                    return None
+                if remaining[i] == 1:
+                    for other in clauses[i]:
+                        if abs(other) not in assigned:
+                            pending.append(other)
+                            break
+
+        if not assigned:
+            return clauses, set()
+        simplified = [
+            tuple(lit for lit in clause if abs(lit) not in assigned)
+            for i, clause in enumerate(clauses)
+            if not satisfied[i]
+        ]
+        return simplified, set(assigned)
+
+    @staticmethod
+    def _variables(clauses: list[Clause]) -> set[int]:
+        return {abs(lit) for clause in clauses for lit in clause}
+
+    @staticmethod
+    def _components(clauses: list[Clause]) -> list[list[Clause]]:
+        parent: dict[int, int] = {}
+
+        def find(var: int) -> int:
+            root = var
+            while parent[root] != root:
+                root = parent[root]
+            while parent[var] != root:
+                parent[var], var = root, parent[var]
+            return root
+
+        for clause in clauses:
+            first = abs(clause[0])
+            parent.setdefault(first, first)
+            for lit in clause[1:]:
+                var = abs(lit)
+                parent.setdefault(var, var)
+                a, b = find(first), find(var)
+                if a != b:
+                    parent[b] = a
+
+        groups: dict[int, list[Clause]] = {}
+        for clause in clauses:
+            groups.setdefault(find(abs(clause[0])), []).append(clause)
+        return list(groups.values())
+
+
+def count_models(expr: Expr, variables: Iterable[str] | None = None) -> int:
+    """Number of assignments to `variables` that satisfy `expr`.
+
+    `variables` defaults to the free variables of `expr`; names in
+    `variables` that `expr` does not use double the count.
+    """
+    names = collect_variables(expr)
+    extra = 0
+    if variables is not None:
+        variables = set(variables)
+        if missing := set(names) - variables:
+            raise ValueError(f"Variables {sorted(missing)} are used but not counted")
+        extra = len(variables) - len(names)
+
+    cnf, root = tseitin(expr)
+    cnf.add_clause(root)
+    counter = ModelCounter(cnf)
+    return counter.count() << extra
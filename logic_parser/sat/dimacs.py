@@ -0,0 +1,66 @@
+from typing import TextIO
+
+from logic_parser.sat.cnf import CNF
+
+
+def to_dimacs(cnf: CNF) -> str:
+    """Serialize `cnf` in DIMACS format.
+
+    Named variables are recorded in `c var <index> <name>` comment lines so
+    that `parse_dimacs` can restore them.
+    """
+    lines = [f"c var {index} {name}" for name, index in cnf.variables.items()]
+    lines.append(f"p cnf {cnf.num_vars} {len(cnf.clauses)}")
+    lines.extend(" ".join(map(str, clause)) + " 0" for clause in cnf.clauses)
+    return "\n".join(lines) + "\n"
+
+
+def parse_dimacs(content: str) -> CNF:
+    cnf = CNF()
+    declared_vars = None
+    clause: list[int] = []
+    for line_no, line in enumerate(content.splitlines(), start=1):
+        fields = line.split()
+        if not fields or fields[0] == "%":
+            continue
+        if fields[0] == "c":
+            if len(fields) == 4 and fields[1] == "var" and fields[2].isdigit():
+                cnf.variables[fields[3]] = int(fields[2])
+            continue
+        if fields[0] == "p":
+            if len(fields) != 4 or fields[1] != "cnf":
+                raise ValueError(f"line {line_no}: Invalid problem line '{line}'")
+            try:
+                declared_vars = int(fields[2])
+            except ValueError:
+                raise ValueError(f"line {line_no}: Invalid problem line '{line}'")
+            continue
+        if declared_vars is None:
+            raise ValueError(f"line {line_no}: Clause before problem line")
+        for field in fields:
+            try:
+                lit = int(field)
+            except ValueError:
+                raise ValueError(f"line {line_no}: Invalid literal '{field}'")
+            if abs(lit) > declared_vars:
+                raise ValueError(
+                    f"line {line_no}: Literal {lit} exceeds declared {declared_vars} variables"
+                )
+            if lit == 0:
+                cnf.clauses.append(clause)
+                clause = []
+            else:
+                clause.append(lit)
+
+    if clause:
+        cnf.clauses.append(clause)
+    cnf.num_vars = declared_vars or 0
+    return cnf
+
+
+def write_dimacs(cnf: CNF, file: TextIO):
+    file.write(to_dimacs(cnf))
+
+
+def read_dimacs(file: TextIO) -> CNF:
+    return parse_dimacs(file.read())
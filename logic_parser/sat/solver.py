@@ -0,0 +1,353 @@
+import heapq
+from dataclasses import dataclass
+from typing import Iterable
+
+TRUE = 1
+FALSE = -1
+UNASSIGNED = 0
+
+RESTART_BASE = 100
+VAR_DECAY = 0.95
+
+
+@dataclass
+class SolverStats:
+    decisions: int = 0
+    propagations: int = 0
+    conflicts: int = 0
+    learned: int = 0
+    restarts: int = 0
+
+
+def luby(i: int) -> int:
+    """Return the i-th (zero based) element of the Luby restart sequence."""
+    size, seq = 1, 0
+    while size < i + 1:
+        seq += 1
+        size = 2 * size + 1
+    while size - 1 != i:
+        size = (size - 1) >> 1
+        seq -= 1
+        i = i % size
+    return 2**seq
+
+
+class Solver:
+    """A CDCL SAT solver over DIMACS-style integer literals.
+
+    Uses two watched literals per clause, first-UIP clause learning with
+    clause minimization and non-chronological backjumping, VSIDS branching
+    with phase saving, Luby restarts and periodic removal of long learned
+    clauses. Clauses may be added between calls to `solve`, and `solve`
+    accepts assumption literals, so a solver can be reused for many related
+    queries.
+
+    Internally a literal for variable `v` is encoded as `2 * v` when positive
+    and `2 * v + 1` when negative, so negation is `lit ^ 1` and the values of
+    literals can be kept in a flat list.
+    """
+
+    def __init__(self, num_vars: int = 0) -> None:
+        self.num_vars = 0
+        self.ok = True
+        self.clauses: list[list[int]] = []
+        self.learnts: list[list[int]] = []
+        self.max_learnts = 1000.0
+        # Indexed by encoded literal.
+        self.values: list[int] = [UNASSIGNED, UNASSIGNED]
+        self.watches: list[list[list[int]]] = [[], []]
+        # Indexed by variable.
+        self.level: list[int] = [0]
+        self.reason: list[list[int] | None] = [None]
+        self.activity: list[float] = [0.0]
+        self.phase: list[bool] = [False]
+        self.trail: list[int] = []
+        self.trail_lim: list[int] = []
+        self.qhead = 0
+        self.var_inc = 1.0
+        self.heap: list[tuple[float, int]] = []
+        self.model: dict[int, bool] = {}
+        self.stats = SolverStats()
+        self.ensure_vars(num_vars)
+
+    def ensure_vars(self, num_vars: int):
+        while self.num_vars < num_vars:
+            self.num_vars += 1
+            self.values += [UNASSIGNED, UNASSIGNED]
+            self.watches += [[], []]
+            self.level.append(0)
+            self.reason.append(None)
+            self.activity.append(0.0)
+            self.phase.append(False)
+            heapq.heappush(self.heap, (0.0, self.num_vars))
+
+    @staticmethod
+    def _encode(lit: int) -> int:
+        if lit == 0:
+            raise ValueError("Literal 0 is not a valid variable")
+        return 2 * lit if lit > 0 else -2 * lit + 1
+
+    def value(self, lit: int) -> int:
+        """Return TRUE, FALSE or UNASSIGNED for a DIMACS literal."""
+        self.ensure_vars(abs(lit))
+        return self.values[self._encode(lit)]
+
+    def decision_level(self) -> int:
+        return len(self.trail_lim)
+
+    def add_clause(self, literals: Iterable[int]) -> bool:
+        """Add a clause, returning False if the formula became unsatisfiable."""
+        if not self.ok:
+            return False
+        self._backtrack(0)
+        clause: list[int] = []
+        for lit in literals:
+            self.ensure_vars(abs(lit))
+            code = self._encode(lit)
+            value = self.values[code]
+            if value == TRUE or code ^ 1 in clause:
+                return True
+            if value == UNASSIGNED and code not in clause:
+                clause.append(code)
+
+        if not clause:
+            self.ok = False
+        elif len(clause) == 1:
+            self._enqueue(clause[0], None)
+            self.ok = self._propagate() is None
+        else:
+            self.clauses.append(clause)
+            self._watch(clause)
+        return self.ok
+
+    def solve(self, assumptions: Iterable[int] = ()) -> bool:
+        """Return True if the clauses are satisfiable under `assumptions`."""
+        for lit in (assumptions := list(assumptions)):
+            self.ensure_vars(abs(lit))
+        codes = [self._encode(lit) for lit in assumptions]
+        self.model = {}
+        if not self.ok:
+            return False
+        self._backtrack(0)
+        if self._propagate() is not None:
+            self.ok = False
+            return False
+
+        self.max_learnts = max(self.max_learnts, len(self.clauses) / 3)
+        restarts = 0
+        while True:
+            status = self._search(luby(restarts) * RESTART_BASE, codes)
+            if status is not None:
+                if status:
+                    self.model = {
+                        var: self.values[2 * var] == TRUE
+                        for var in range(1, self.num_vars + 1)
+                    }
+                self._backtrack(0)
+                return status
+            restarts += 1
+            self.stats.restarts += 1
+            if len(self.learnts) > self.max_learnts:
+                self._reduce_learnts()
+
+    def _search(self, budget: int, assumptions: list[int]) -> bool | None:
+        conflicts = 0
+        while True:
+            conflict = self._propagate()
+            if conflict is not None:
+                conflicts += 1
+                self.stats.conflicts += 1
+                if self.decision_level() == 0:
+                    self.ok = False
+                    return False
+                learnt, backjump = self._analyze(conflict)
+                self._backtrack(backjump)
+                if len(learnt) == 1:
+                    self._enqueue(learnt[0], None)
+                else:
+                    self.learnts.append(learnt)
+                    self._watch(learnt)
+                    self._enqueue(learnt[0], learnt)
+                self.stats.learned += 1
+                self.var_inc /= VAR_DECAY
+                continue
+
+            if conflicts >= budget:
+                self._backtrack(0)
+                return None
+
+            lit = None
+            while self.decision_level() < len(assumptions):
+                assumption = assumptions[self.decision_level()]
+                value = self.values[assumption]
+                if value == TRUE:
+                    self.trail_lim.append(len(self.trail))
+                elif value == FALSE:
+                    return False
+                else:
+                    lit = assumption
+                    break
+
+            if lit is None:
+                if (var := self._pick_branch_var()) is None:
+                    return True
+                lit = 2 * var if self.phase[var] else 2 * var + 1
+                self.stats.decisions += 1
+
+            self.trail_lim.append(len(self.trail))
+            self._enqueue(lit, None)
+
+    def _watch(self, clause: list[int]):
+        self.watches[clause[0]].append(clause)
+        self.watches[clause[1]].append(clause)
+
+    def _enqueue(self, lit: int, reason: list[int] | None):
+        var = lit >> 1
+        self.values[lit] = TRUE
+        self.values[lit ^ 1] = FALSE
+        self.level[var] = len(self.trail_lim)
+        self.reason[var] = reason
+        self.trail.append(lit)
+
+    def _propagate(self) -> list[int] | None:
+        """Propagate the trail, returning a conflicting clause if any."""
+        values = self.values
+        watches = self.watches
+        trail = self.trail
+        while self.qhead < len(trail):
+            false_lit = trail[self.qhead] ^ 1
+            self.qhead += 1
+            self.stats.propagations += 1
+            watchers = watches[false_lit]
+            kept: list[list[int]] = []
+            conflict = None
+            for position, clause in enumerate(watchers):
+                first = clause[0]
+                if first == false_lit:
+                    first = clause[0] = clause[1]
+                    clause[1] = false_lit
+                if values[first] == TRUE:
+                    kept.append(clause)
+                    continue
+
+                for k in range(2, len(clause)):
+                    other = clause[k]
+                    if values[other] != FALSE:
+                        clause[1] = other
+                        clause[k] = false_lit
+                        watches[other].append(clause)
+                        break
+                else:
+                    kept.append(clause)
+                    if values[first] == FALSE:
+                        kept.extend(watchers[position + 1 :])
+                        conflict = clause
+                        break
+                    self._enqueue(first, clause)
+
+            watches[false_lit] = kept
+            if conflict is not None:
+                self.qhead = len(trail)
+                return conflict
+        return None
+
+    def _analyze(self, conflict: list[int]) -> tuple[list[int], int]:
+        """Derive a minimized first-UIP clause and the level to backjump to."""
+        level = self.level
+        seen = set()
+        learnt = [0]
+        pending = 0
+        lit = -1
+        clause = conflict
+        position = len(self.trail) - 1
+        current_level = self.decision_level()
+
+        while True:
+            for q in clause if lit < 0 else clause[1:]:
+                var = q >> 1
+                if var not in seen and level[var] > 0:
+                    seen.add(var)
+                    self._bump(var)
+                    if level[var] >= current_level:
+                        pending += 1
+                    else:
+                        learnt.append(q)
+            while self.trail[position] >> 1 not in seen:
+                position -= 1
+            lit = self.trail[position]
+            position -= 1
+            pending -= 1
+            if pending == 0:
+                break
+            seen.discard(lit >> 1)
+            clause = self.reason[lit >> 1]  # type: ignore[assignment]
+
+        learnt[0] = lit ^ 1
+        # Drop literals implied by the rest of the clause.
+        learnt[1:] = [q for q in learnt[1:] if not self._redundant(q, seen)]
+        if len(learnt) == 1:
+            return learnt, 0
+
+        deepest = max(range(1, len(learnt)), key=lambda i: level[learnt[i] >> 1])
+        learnt[1], learnt[deepest] = learnt[deepest], learnt[1]
+        return learnt, level[learnt[1] >> 1]
+
+    def _redundant(self, lit: int, seen: set[int]) -> bool:
+        if (reason := self.reason[lit >> 1]) is None:
+            return False
+        return all(q >> 1 in seen or self.level[q >> 1] == 0 for q in reason[1:])
+
+    def _reduce_learnts(self):
+        """Forget the longer half of the learned clauses (at decision level 0)."""
+        self.learnts.sort(key=len)
+        keep = len(self.learnts) // 2
+        self.learnts = self.learnts[:keep] + [
+            clause for clause in self.learnts[keep:] if len(clause) <= 2
+        ]
+        self.max_learnts *= 1.1
+        self.watches = [[] for _ in self.watches]
+        for clause in self.clauses:
+            self._watch(clause)
+        for clause in self.learnts:
+            self._watch(clause)
+
+    def _bump(self, var: int):
+        self.activity[var] += self.var_inc
+        if self.activity[var] > 1e100:
+            for v in range(1, self.num_vars + 1):
+                self.activity[v] *= 1e-100
+            self.var_inc *= 1e-100
+            self._rebuild_heap()
+        elif self.values[2 * var] == UNASSIGNED:
+            heapq.heappush(self.heap, (-self.activity[var], var))
+
+    def _rebuild_heap(self):
+        self.heap = [
+            (-self.activity[v], v)
+            for v in range(1, self.num_vars + 1)
+            if self.values[2 * v] == UNASSIGNED
+        ]
+        heapq.heapify(self.heap)
+
+    def _pick_branch_var(self) -> int | None:
+        if len(self.heap) > 4 * self.num_vars + 64:
+            self._rebuild_heap()
+        while self.heap:
+            _, var = heapq.heappop(self.heap)
+            if self.values[2 * var] == UNASSIGNED:
+                return var
+        return None
+
+    def _backtrack(self, level: int):
+        if self.decision_level() <= level:
+            return
+        start = self.trail_lim[level]
+        for lit in reversed(self.trail[start:]):
+            var = lit >> 1
+            self.values[lit] = self.values[lit ^ 1] = UNASSIGNED
+            self.reason[var] = None
+            self.phase[var] = not lit & 1
+            heapq.heappush(self.heap, (-self.activity[var], var))
+        del self.trail[start:]
+        del self.trail_lim[level:]
+        self.qhead = len(self.trail)
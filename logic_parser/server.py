@@ -0,0 +1,213 @@
+"""A daemon keeping named sessions of variables and functions, and its client.
+
+Messages in both directions are a JSON object preceded by its size in bytes
+as a big-endian uint32. A request names a session and gives the source of a
+batch of statements:
+
+    {"session": "build", "source": "A := 1\\nNAND(x, y) := ~(x ^ y)\\nNAND(A, A)\\n"}
+
+and is answered with the value of each expression, in order, and the
+message and location of the first error if there was one:
+
+    {"results": [false]}
+    {"results": [true], "error": {"message": "...", "line": 2, "column": 3}}
+
+Statements before an error keep their effect on the session. A request
+with `"drop": true` forgets the session instead.
+"""
+
+import asyncio
+import json
+import os
+import socket
+import stat
+import struct
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from logic_parser.exceptions import ParserError, ServerError, TokenizerError
+from logic_parser.expr import NoneExpr, evaluate
+from logic_parser.frame import Frame
+from logic_parser.memo import CallCache
+from logic_parser.parser import Function, Parser
+from logic_parser.tokenizer import scan
+
+SIZE = struct.Struct(">I")
+MAX_MESSAGE = 1 << 26
+# Batches with at least this many characters of source run on the worker
+# pool instead of the event loop.
+HEAVY_BATCH = 4096
+
+
+class Session:
+    """The variables and functions defined by the requests of one session."""
+
+    def __init__(self) -> None:
+        self.memory = Frame()
+        self.functions: dict[str, Function] = {}
+        self.calls = CallCache()
+        # Batches of one session run one at a time, in the order received.
+        self.lock = asyncio.Lock()
+
+    def run(self, source: str) -> dict:
+        parser = Parser(scan(source), self.memory, calls=self.calls)
+        parser.functions = self.functions
+        results = []
+        try:
+            for statement in parser.parse_all():
+                if not isinstance(statement, NoneExpr):
+                    results.append(evaluate(statement))
+        except TokenizerError as t_err:
+            return failure(results, t_err, t_err.line, t_err.line_pos + 1)
+        except ParserError as p_err:
+            if t := p_err.token:
+                return failure(results, p_err, t.line, t.line_pos + 1)
+            return failure(results, p_err)
+        except Exception as e:
+            return failure(results, e)
+        return {"results": results}
+
+
+def failure(
+    results: list,
+    error: Exception | str,
+    line: int | None = None,
+    column: int | None = None,
+) -> dict:
+    message = {"message": str(error), "line": line, "column": column}
+    return {"results": results, "error": message}
+
+
+async def read_message(reader: asyncio.StreamReader) -> dict | None:
+    """The next message, or None once the peer closed the connection."""
+    try:
+        (size,) = SIZE.unpack(await reader.readexactly(SIZE.size))
+    except asyncio.IncompleteReadError:
+        return None
+    if size > MAX_MESSAGE:
+        raise ValueError(f"Message of {size} bytes is too large")
+    return json.loads(await reader.readexactly(size))
+
+
+def encode_message(message: dict) -> bytes:
+    payload = json.dumps(message).encode()
+    return SIZE.pack(len(payload)) + payload
+
+
+class Server:
+    """Answers requests on a unix socket at `path`.
+
+    Small batches are run on the event loop as soon as they arrive. Batches
+    of `heavy` characters or more run on a pool of `workers` threads, so
+    that the loop keeps answering small requests of other sessions while
+    they run.
+    """
+
+    def __init__(
+        self, path: str, workers: int | None = None, heavy: int = HEAVY_BATCH
+    ) -> None:
+        self.path = path
+        self.heavy = heavy
+        self.sessions: dict[str, Session] = {}
+        self.pool = ThreadPoolExecutor(workers)
+
+    async def dispatch(self, request) -> dict:
+        if not isinstance(request, dict) or not isinstance(
+            request.get("source", ""), str
+        ):
+            return failure([], "Invalid request")
+        name = str(request.get("session", "default"))
+        if request.get("drop"):
+            self.sessions.pop(name, None)
+            return {"results": []}
+        session = self.sessions.setdefault(name, Session())
+        source = request.get("source", "")
+        async with session.lock:
+            if len(source) >= self.heavy:
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(self.pool, session.run, source)
+            return session.run(source)
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                try:
+                    request = await read_message(reader)
+                except ValueError as e:
+                    writer.write(encode_message(failure([], e)))
+                    break
+                if request is None:
+                    break
+                writer.write(encode_message(await self.dispatch(request)))
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def run(self, started: threading.Event | None = None):
+        """Serve until `close`; `started` is set once connections are accepted."""
+        if os.path.exists(self.path) and stat.S_ISSOCK(os.stat(self.path).st_mode):
+            os.unlink(self.path)
+        self.closing = asyncio.Event()
+        server = await asyncio.start_unix_server(self.handle, self.path)
+        try:
+            async with server:
+                if started:
+                    started.set()
+                await self.closing.wait()
+        finally:
+            self.pool.shutdown(cancel_futures=True)
+            if os.path.exists(self.path):
+                os.unlink(self.path)
+
+    def close(self):
+        """Stop `run`. Call it from the event loop, like `loop.call_soon_threadsafe`."""
+        self.closing.set()
+
+
+def serve(path: str, workers: int | None = None):
+    """Run a server on `path` until interrupted."""
+    try:
+        asyncio.run(Server(path, workers).run())
+    except KeyboardInterrupt:
+        pass
+
+
+class Client:
+    """A blocking connection to a server, for one request at a time."""
+
+    def __init__(self, path: str) -> None:
+        self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.socket.connect(path)
+        self.file = self.socket.makefile("rb")
+
+    def request(self, message: dict) -> dict:
+        self.socket.sendall(encode_message(message))
+        header = self.file.read(SIZE.size)
+        if len(header) < SIZE.size:
+            raise ConnectionError("The server closed the connection")
+        (size,) = SIZE.unpack(header)
+        return json.loads(self.file.read(size))
+
+    def run(self, source: str, session: str = "default") -> list:
+        """Values of the statements of `source`; raises `ServerError` on an error."""
+        response = self.request({"session": session, "source": source})
+        if error := response.get("error"):
+            raise ServerError(
+                error["message"], line=error["line"], column=error["column"]
+            )
+        return response["results"]
+
+    def drop(self, session: str):
+        self.request({"session": session, "drop": True})
+
+    def close(self):
+        self.file.close()
+        self.socket.close()
+
+    def __enter__(self) -> "Client":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
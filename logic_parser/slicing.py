@@ -0,0 +1,169 @@
+"""Evaluating only the statements that some outputs of a file depend on.
+
+A pre-scan reads each line with a few regular expressions, without
+tokenizing or parsing it, to find the statements of the file, the name each
+assignment or function definition defines, and the names it reads. Every
+read refers to the last definition of the name before the statement, and a
+call also reads the variables the function's body reads besides its
+arguments, as they are when it is called. Following these references back
+from the last definitions of the requested outputs gives their cone of
+influence; only its statements are tokenized, parsed and evaluated:
+
+    with open("rules.lp") as f:
+        evaluate_outputs(f, ["R1", "R2"])  # {'R1': True, 'R2': False}
+
+Statements outside the cone are never checked for errors. Assignments and
+function definitions are recognized at the start of a line only, as they
+are written in logic files.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Iterable, Iterator
+
+from logic_parser.exceptions import TokenizerError
+from logic_parser.expr import evaluate
+from logic_parser.parser import Parser
+from logic_parser.token import Token, TokenType
+from logic_parser.tokenizer import scan
+
+# An identifier, and the `(` of a call if one follows it. Identifiers start
+# with a letter other than `v`, which is the OR operator.
+NAME = re.compile(r"((?!v)[^\W\d_][^\s()^~><!=:/,]*)\s*(\()?")
+# The head of an assignment `X :=` or of a function definition `F(a, b) :=`.
+DEFINITION = re.compile(
+    r"\s*((?!v)[^\W\d_][^\s()^~><!=:/,]*)\s*(?:\(([^()]*)\))?\s*:="
+)
+# A line ending in one of these continues on the next one.
+OPEN_ENDINGS = ("^", "~", "=", ">", ",", "(")
+
+
+@dataclass
+class Statement:
+    """Lines of a file that are parsed as one assignment or definition."""
+
+    line: int
+    lines: list[str]
+    name: str | None = None
+    function: bool = False
+    # Statements whose definitions this one reads.
+    reads: list[int] = field(default_factory=list)
+
+
+@dataclass
+class Slice:
+    """The statements of a file in the cone of influence of `outputs`."""
+
+    outputs: list[str]
+    statements: list[Statement]
+    total: int
+
+    def tokens(self) -> Iterator[Token]:
+        """The tokens of the statements, with their lines in the file."""
+        for statement in self.statements:
+            for offset, line in enumerate(statement.lines):
+                yield from scan(line, line=statement.line + offset)
+
+    def evaluate(self) -> dict[str, bool]:
+        """Parse and evaluate the statements, and return the values of `outputs`."""
+        parser = Parser(self.tokens())
+        for _ in parser.parse_all():
+            pass
+        return {name: bool(evaluate(parser.memory[name])) for name in self.outputs}
+
+
+class Program:
+    """The statements of a file and the definitions they read, from a pre-scan."""
+
+    def __init__(self, lines: Iterable[str]) -> None:
+        self.statements: list[Statement] = []
+        # The last statement defining each variable and function.
+        self.variables: dict[str, int] = {}
+        self.functions: dict[str, int] = {}
+        # Variables that the bodies of function definitions read.
+        self.globals: dict[int, set[str]] = {}
+        current: Statement | None = None
+        depth = 0
+        for number, line in enumerate(lines, start=1):
+            code = line.split("//", 1)[0]
+            if current is None:
+                if not code.strip():
+                    continue
+                current = Statement(number, [])
+                depth = 0
+            current.lines.append(line)
+            depth += code.count("(") - code.count(")")
+            if depth > 0 or _continues(code):
+                continue
+            self._add(current)
+            current = None
+        if current is not None:
+            self._add(current)
+
+    def _add(self, statement: Statement):
+        index = len(self.statements)
+        self.statements.append(statement)
+        code = "".join(line.split("//", 1)[0] for line in statement.lines)
+        if (head := DEFINITION.match(code)) is None:
+            return
+        name, args = head.groups()
+        words = NAME.findall(code, head.end())
+        if args is not None:
+            arguments = {arg.strip() for arg in args.split(",")}
+            self.globals[index] = {
+                word for word, call in words if not call and word not in arguments
+            }
+            statement.name, statement.function = name, True
+            self.functions[name] = index
+            return
+        reads: set[int] = set()
+        for word, call in words:
+            if not call:
+                if (defined := self.variables.get(word)) is not None:
+                    reads.add(defined)
+            elif (defined := self.functions.get(word)) is not None:
+                reads.add(defined)
+                for read in self.globals[defined]:
+                    if (value := self.variables.get(read)) is not None:
+                        reads.add(value)
+        statement.name = name
+        statement.reads = sorted(reads)
+        self.variables[name] = index
+
+    def slice(self, outputs: Iterable[str]) -> Slice:
+        """The statements that the last values of `outputs` depend on."""
+        outputs = list(outputs)
+        if missing := [name for name in outputs if name not in self.variables]:
+            raise ValueError(f"No assignment of outputs {missing}")
+        kept = {self.variables[name] for name in outputs}
+        pending = list(kept)
+        while pending:
+            for read in self.statements[pending.pop()].reads:
+                if read not in kept:
+                    kept.add(read)
+                    pending.append(read)
+        statements = [self.statements[i] for i in sorted(kept)]
+        return Slice(outputs, statements, len(self.statements))
+
+
+def _continues(code: str) -> bool:
+    """Whether the statement on a line without comments goes on to the next."""
+    code = code.rstrip()
+    if code.endswith("v"):
+        # `v` may also end an identifier.
+        try:
+            tokens = list(scan(code))
+        except TokenizerError:
+            return False
+        return tokens[-1].type is TokenType.OR
+    return code.endswith(OPEN_ENDINGS)
+
+
+def slice_lines(lines: Iterable[str], outputs: Iterable[str]) -> Slice:
+    """Pre-scan the file of `lines` and slice it to the cone of `outputs`."""
+    return Program(lines).slice(outputs)
+
+
+def evaluate_outputs(lines: Iterable[str], outputs: Iterable[str]) -> dict[str, bool]:
+    """The last values of `outputs` in the file of `lines`, from their cone."""
+    return slice_lines(lines, outputs).evaluate()
@@ -0,0 +1,201 @@
+"""Frozen definitions that any number of threads can evaluate at once.
+
+A `Snapshot` holds definitions with the spreadsheet semantics of an
+`Environment`, where the names a definition reads stay references, but
+never changes once built:
+
+    snapshot = freeze(open("rules.pl"))
+    snapshot.evaluate("R", {"A": True})
+
+Evaluating takes per-call bindings, which override definitions of the same
+name, and keeps the values it computes in a `Scope` of its own, so calls
+share nothing they write. Assigning returns a new snapshot whose layer of
+changes sits on the one it came from.
+"""
+
+from types import MappingProxyType
+from typing import Iterable, Iterator, Mapping
+
+from logic_parser.environment import Environment
+from logic_parser.expr import (
+    Expr,
+    LiteralExpr,
+    VariableExpr,
+    collect_variables,
+    evaluate,
+)
+from logic_parser.memo import CallCache
+from logic_parser.parser import Function, Parser
+from logic_parser.tokenizer import scan, tokenize_lines
+
+# Snapshots more layers deep than this are flattened into one layer.
+MAX_LAYERS = 8
+
+
+class Snapshot(Mapping[str, Expr]):
+    """Immutable definitions and functions. Reading a name gives its definition."""
+
+    __slots__ = ("_definitions", "_dependencies", "_parent", "_layers", "functions")
+
+    def __init__(
+        self,
+        definitions: Mapping[str, Expr | bool] | None = None,
+        functions: Mapping[str, Function] | None = None,
+        parent: "Snapshot | None" = None,
+    ) -> None:
+        own: dict[str, Expr] = {}
+        dependencies: dict[str, frozenset[str]] = {}
+        for name, value in (definitions or {}).items():
+            expr = LiteralExpr(value) if isinstance(value, bool) else value
+            own[name] = expr
+            dependencies[name] = frozenset(collect_variables(expr))
+        if parent is not None and parent._layers >= MAX_LAYERS:
+            own = {**parent._flat_definitions(), **own}
+            dependencies = {**parent._flat_dependencies(), **dependencies}
+            parent = None
+        self._definitions = MappingProxyType(own)
+        self._dependencies = MappingProxyType(dependencies)
+        self._parent = parent
+        self._layers = 1 if parent is None else parent._layers + 1
+        if functions is None:
+            functions = parent.functions if parent is not None else {}
+        self.functions = MappingProxyType(dict(functions))
+
+    @classmethod
+    def of(cls, env: Environment, functions: Mapping[str, Function] | None = None):
+        """A snapshot of the current definitions of `env`."""
+        return cls(env.definitions, functions)
+
+    def assign(self, definitions: Mapping[str, Expr | bool]) -> "Snapshot":
+        """A new snapshot with `definitions` added or replaced."""
+        return Snapshot(definitions, parent=self)
+
+    def definition(self, name: str) -> Expr | None:
+        layer = self
+        while layer is not None:
+            if (expr := layer._definitions.get(name)) is not None:
+                return expr
+            layer = layer._parent
+        return None
+
+    def dependencies(self, name: str) -> frozenset[str]:
+        layer = self
+        while layer is not None:
+            if (reads := layer._dependencies.get(name)) is not None:
+                return reads
+            layer = layer._parent
+        return frozenset()
+
+    def parse(self, formula: str) -> Expr:
+        """Parse `formula` with the functions of the snapshot; names stay references.
+
+        Assignments and functions in `formula` only last while it is parsed.
+        """
+        tokens = list(scan(formula))
+        parser = Parser(tokens, {}, free_variables=True, calls=CallCache())
+        parser.functions = dict(self.functions)
+        return parser.parse()
+
+    def scope(self, bindings: Mapping[str, bool] | None = None) -> "Scope":
+        return Scope(self, bindings)
+
+    def evaluate(
+        self, target: str | Expr, bindings: Mapping[str, bool] | None = None
+    ) -> bool:
+        """The value of the name or expression `target` under `bindings`."""
+        if isinstance(target, str):
+            target = VariableExpr(target)
+        return bool(evaluate(target, Scope(self, bindings)))
+
+    def _flat_definitions(self) -> dict[str, Expr]:
+        parent = self._parent._flat_definitions() if self._parent else {}
+        return {**parent, **self._definitions}
+
+    def _flat_dependencies(self) -> dict[str, frozenset[str]]:
+        parent = self._parent._flat_dependencies() if self._parent else {}
+        return {**parent, **self._dependencies}
+
+    def __getitem__(self, name: str) -> Expr:
+        if (expr := self.definition(name)) is None:
+            raise KeyError(name)
+        return expr
+
+    def __contains__(self, name: object) -> bool:
+        return isinstance(name, str) and self.definition(name) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._flat_definitions())
+
+    def __len__(self) -> int:
+        return len(self._flat_definitions())
+
+    def __repr__(self) -> str:
+        return f"Snapshot({dict(self._flat_definitions())!r})"
+
+
+class Scope(Mapping[str, bool]):
+    """Values of the names of a snapshot for one evaluation.
+
+    Bound names take their binding; other names are computed from their
+    definitions when first read, without recursion, and kept in this scope
+    only.
+    """
+
+    __slots__ = ("snapshot", "bindings", "values")
+
+    def __init__(
+        self, snapshot: Snapshot, bindings: Mapping[str, bool] | None = None
+    ) -> None:
+        self.snapshot = snapshot
+        self.bindings = bindings or {}
+        self.values: dict[str, bool] = {}
+
+    def __getitem__(self, name: str) -> bool:
+        if name in self.bindings:
+            return self.bindings[name]
+        if (value := self.values.get(name)) is None:
+            if name not in self.snapshot:
+                raise KeyError(name)
+            self._compute(name)
+            value = self.values[name]
+        return value
+
+    def _compute(self, name: str):
+        snapshot, bindings, values = self.snapshot, self.bindings, self.values
+        stack = [name]
+        while stack:
+            current = stack[-1]
+            if current in values:
+                stack.pop()
+                continue
+            if pending := [
+                read
+                for read in snapshot.dependencies(current)
+                if read not in bindings and read not in values and read in snapshot
+            ]:
+                stack.extend(pending)
+                continue
+            stack.pop()
+            values[current] = bool(evaluate(snapshot.definition(current), self))
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.bindings or name in self.snapshot
+
+    def __iter__(self) -> Iterator[str]:
+        return iter({**dict.fromkeys(self.snapshot), **dict.fromkeys(self.bindings)})
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+
+def freeze(source: str | Iterable[str]) -> Snapshot:
+    """Parse the definitions of `source`, a text or lines, into a snapshot.
+
+    Expressions in `source` are parsed but not evaluated.
+    """
+    env = Environment()
+    lines = source.splitlines(keepends=True) if isinstance(source, str) else source
+    parser = Parser(tokenize_lines(lines), env)
+    for _ in parser.parse_all():
+        pass
+    return Snapshot.of(env, parser.functions)
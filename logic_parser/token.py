@@ -34,7 +34,7 @@ class TokenType(enum.Enum):
     COMMA = ","
 
 
-@dataclass
+@dataclass(slots=True)
 class Token:
     token: str
     type: TokenType
@@ -1,4 +1,5 @@
-from typing import Any
+import re
+from typing import Any, Iterable, Iterator
 from logic_parser.exceptions import TokenizerError
 from logic_parser.token import Token, TokenType
 
@@ -19,13 +20,43 @@ RESERVED_SYMBOLS = [
     TokenType.COMMA.value,
 ]
 
+# Alternatives are tried in order, so longer operators come before their
+# prefixes, and `v`, `0` and `1` before identifiers. An identifier runs
+# until a reserved symbol, but must start with a letter, which `scan`
+# checks separately.
+TOKEN_PATTERN = re.compile(
+    r"""
+    (?P<SKIP>[ \t]+)
+    | (?P<NEW_LINE>\n)
+    | (?P<COMMENT>//[^\n]*)
+    | (?P<BICONDITIONAL><=>)
+    | (?P<IMPLICATION>=>)
+    | (?P<XOR>!=)
+    | (?P<ASSIGN>:=)
+    | (?P<LITERAL>[01])
+    | (?P<SYMBOL>[~^v(),=])
+    | (?P<IDENTIFIER>[^ \n()^~><!=:/,]+)
+    """,
+    re.VERBOSE,
+)
+
+SYMBOL_TYPES = {
+    "~": TokenType.NOT,
+    "^": TokenType.AND,
+    "v": TokenType.OR,
+    "(": TokenType.OPEN_P,
+    ")": TokenType.CLOSE_P,
+    ",": TokenType.COMMA,
+    "=": TokenType.EQUAL,
+}
+
 
 class Tokenizer:
-    def __init__(self, content: str) -> None:
+    def __init__(self, content: str, line: int = 1) -> None:
         self.content = content
         self.tokens = []
         self.pos = 0
-        self.line = 1
+        self.line = line
         self.line_pos = 0
 
     def peek(self, next: int = 0):
@@ -55,20 +86,25 @@ class Tokenizer:
         )
 
     def tokenize(self):
+        self.tokens.extend(self.stream())
+        return self.tokens
+
+    def stream(self) -> Iterator[Token]:
+        """Yield the tokens of the content one at a time."""
         while (c := self.peek()) is not None:
             match c:
                 case "~":
-                    self.tokens.append(self.consume("~", TokenType.NOT))
+                    yield self.consume("~", TokenType.NOT)
                 case "^":
-                    self.tokens.append(self.consume("^", TokenType.AND))
+                    yield self.consume("^", TokenType.AND)
                 case "v":
-                    self.tokens.append(self.consume("v", TokenType.OR))
+                    yield self.consume("v", TokenType.OR)
                 case "(":
-                    self.tokens.append(self.consume("(", TokenType.OPEN_P))
+                    yield self.consume("(", TokenType.OPEN_P)
                 case ")":
-                    self.tokens.append(self.consume(")", TokenType.CLOSE_P))
+                    yield self.consume(")", TokenType.CLOSE_P)
                 case ",":
-                    self.tokens.append(self.consume(",", TokenType.COMMA))
+                    yield self.consume(",", TokenType.COMMA)
                 case "/" if self.peek(1) == "/":
                     self.consume("/", TokenType.SLASH)
                     self.consume("/", TokenType.SLASH)
@@ -79,73 +115,61 @@ class Tokenizer:
                         comment += t
                         self.pos += 1
                         self.line_pos += 1
-                    self.tokens.append(
-                        Token(
-                            token="//",
-                            type=TokenType.COMMENT,
-                            line=self.line,
-                            line_pos=self.line_pos,
-                            value=comment,
-                        )
+                    yield Token(
+                        token="//",
+                        type=TokenType.COMMENT,
+                        line=self.line,
+                        line_pos=self.line_pos,
+                        value=comment,
                     )
                 case "<" if self.peek(1) == "=" and self.peek(2) == ">":
                     self.consume("<", TokenType.LESS)
                     self.consume("=", TokenType.EQUAL)
                     self.consume(">", TokenType.GREATER)
-                    self.tokens.append(
-                        Token(
-                            token="<=>",
-                            type=TokenType.BICONDITIONAL,
-                            line=self.line,
-                            line_pos=self.line_pos,
-                        )
+                    yield Token(
+                        token="<=>",
+                        type=TokenType.BICONDITIONAL,
+                        line=self.line,
+                        line_pos=self.line_pos,
                     )
                 case "=" if self.peek(1) == ">":
                     self.consume("=", TokenType.EQUAL)
                     self.consume(">", TokenType.GREATER)
-                    self.tokens.append(
-                        Token(
-                            token="=>",
-                            type=TokenType.IMPLICATION,
-                            line=self.line,
-                            line_pos=self.line_pos,
-                        )
+                    yield Token(
+                        token="=>",
+                        type=TokenType.IMPLICATION,
+                        line=self.line,
+                        line_pos=self.line_pos,
                     )
                 case "=":
-                    self.tokens.append(self.consume("=", TokenType.EQUAL))
+                    yield self.consume("=", TokenType.EQUAL)
                 case "!" if self.peek(1) == "=":
                     self.consume("!", TokenType.BANG)
                     self.consume("=", TokenType.EQUAL)
-                    self.tokens.append(
-                        Token(
-                            token="!=",
-                            type=TokenType.XOR,
-                            line=self.line,
-                            line_pos=self.line_pos,
-                        )
+                    yield Token(
+                        token="!=",
+                        type=TokenType.XOR,
+                        line=self.line,
+                        line_pos=self.line_pos,
                     )
                 case "0" | "1":
                     self.pos += 1
                     self.line_pos += 1
-                    self.tokens.append(
-                        Token(
-                            token=c,
-                            type=TokenType.LITERAL,
-                            line=self.line,
-                            line_pos=self.line_pos,
-                            value=c,
-                        )
+                    yield Token(
+                        token=c,
+                        type=TokenType.LITERAL,
+                        line=self.line,
+                        line_pos=self.line_pos,
+                        value=c,
                     )
                 case ":" if self.peek(1) == "=":
                     self.consume(":", TokenType.COLON)
                     self.consume("=", TokenType.EQUAL)
-                    self.tokens.append(
-                        Token(
-                            token=":=",
-                            type=TokenType.ASSIGN,
-                            line=self.line,
-                            line_pos=self.line_pos,
-                        )
+                    yield Token(
+                        token=":=",
+                        type=TokenType.ASSIGN,
+                        line=self.line,
+                        line_pos=self.line_pos,
                     )
                 case _ if c.isalpha():
                     self.pos += 1
@@ -158,18 +182,16 @@ class Tokenizer:
                             identifier += c
                         else:
                             break
-                    self.tokens.append(
-                        Token(
-                            token=identifier,
-                            type=TokenType.IDENTIFIER,
-                            line=self.line,
-                            line_pos=self.line_pos,
-                            value=identifier,
-                        )
+                    yield Token(
+                        token=identifier,
+                        type=TokenType.IDENTIFIER,
+                        line=self.line,
+                        line_pos=self.line_pos,
+                        value=identifier,
                     )
                 case "\n":
                     self.line += 1
-                    self.tokens.append(self.consume("\n", TokenType.NEW_LINE))
+                    yield self.consume("\n", TokenType.NEW_LINE)
                     self.line_pos = 0
                 case "\t" | " " | "":
                     self.pos += 1
@@ -181,4 +203,53 @@ class Tokenizer:
                         line_pos=self.line_pos,
                     )
 
-        return self.tokens
+
+def scan(content: str, line: int = 1) -> Iterator[Token]:
+    """Yield the same tokens as `Tokenizer(content, line).stream()`, faster.
+
+    Each token is matched by one compiled regular expression, and
+    identifiers and comments are sliced out of `content` instead of being
+    built a character at a time.
+    """
+    match = TOKEN_PATTERN.match
+    pos = line_start = 0
+    size = len(content)
+    while pos < size:
+        found = match(content, pos)
+        kind = found.lastgroup if found else None
+        if kind is None or kind == "IDENTIFIER" and not content[pos].isalpha():
+            raise TokenizerError(
+                f"Invalid Character: '{content[pos]}'",
+                line=line,
+                line_pos=pos - line_start,
+            )
+        end = found.end()
+        if kind == "IDENTIFIER":
+            text = content[pos:end]
+            yield Token(text, TokenType.IDENTIFIER, line, end - line_start, text)
+        elif kind == "SYMBOL":
+            char = content[pos]
+            yield Token(char, SYMBOL_TYPES[char], line, end - line_start)
+        elif kind == "NEW_LINE":
+            line += 1
+            yield Token("\n", TokenType.NEW_LINE, line, end - line_start)
+            line_start = end
+        elif kind == "LITERAL":
+            char = content[pos]
+            yield Token(char, TokenType.LITERAL, line, end - line_start, char)
+        elif kind == "COMMENT":
+            comment = content[pos + 2 : end]
+            yield Token("//", TokenType.COMMENT, line, end - line_start, comment)
+        elif kind != "SKIP":
+            yield Token(found.group(), TokenType[kind], line, end - line_start)
+        pos = end
+
+
+def tokenize_lines(lines: Iterable[str]) -> Iterator[Token]:
+    """Yield the tokens of the text made of `lines`, reading one line at a time.
+
+    Tokens never span lines, so each line is tokenized on its own and only
+    the current line is held in memory.
+    """
+    for number, line in enumerate(lines, start=1):
+        yield from scan(line, line=number)
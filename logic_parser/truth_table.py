@@ -0,0 +1,239 @@
+from typing import BinaryIO, Iterable, Iterator, TextIO
+
+from logic_parser.expr import (
+    BinaryExpr,
+    Expr,
+    LiteralExpr,
+    NaryExpr,
+    UnaryExpr,
+    VariableExpr,
+    apply_binary,
+    collect_variables,
+)
+from logic_parser.token import TokenType
+
+CHUNK_ROWS = 1 << 16
+
+# Kinds of circuit nodes.
+_VARIABLE = 0
+_CONSTANT = 1
+_NOT = 2
+_BINARY = 3
+_ALL = 4
+_ANY = 5
+
+# Update steps of `Circuit.flip`: `(node, step, first argument, second argument)`.
+_STEP_AND = 0
+_STEP_OR = 1
+_STEP_XOR = 2
+_STEP_IMPLICATION = 3
+_STEP_BICONDITIONAL = 4
+_STEP_NOT = 5
+_STEP_OTHER = 6
+STEPS = {
+    TokenType.AND: _STEP_AND,
+    TokenType.OR: _STEP_OR,
+    TokenType.XOR: _STEP_XOR,
+    TokenType.IMPLICATION: _STEP_IMPLICATION,
+    TokenType.BICONDITIONAL: _STEP_BICONDITIONAL,
+}
+
+
+class Circuit:
+    """An expression as a list of nodes in evaluation order with cached values.
+
+    Every node keeps its last value, so after changing one input only the
+    nodes that depend on it, listed in `dependents`, are recomputed. Shared
+    subtrees and repeated variables become a single node.
+    """
+
+    def __init__(self, expr: Expr, variables: list[str]) -> None:
+        self.nodes: list[tuple] = []
+        self.values: list = []
+        self.inputs: list[int] = []
+        index: dict[int, int] = {}
+        leaves: dict[str, int] = {}
+        for name in variables:
+            leaves[name] = self.add((_VARIABLE, name))
+            self.inputs.append(leaves[name])
+
+        stack: list[tuple[Expr, bool]] = [(expr, False)]
+        while stack:
+            node, expanded = stack.pop()
+            if id(node) in index:
+                continue
+            children = []
+            if isinstance(node, UnaryExpr):
+                children = [node.operand]
+            elif isinstance(node, BinaryExpr):
+                children = [node.r_operand, node.l_operand]
+            elif isinstance(node, NaryExpr):
+                children = node.operands
+            if not expanded and children:
+                stack.append((node, True))
+                stack.extend((child, False) for child in reversed(children))
+                continue
+            args = [index[id(child)] for child in children]
+            if isinstance(node, VariableExpr):
+                if node.name not in leaves:
+                    raise ValueError(f"Variable '{node.name}' is used but not listed")
+                index[id(node)] = leaves[node.name]
+                continue
+            if isinstance(node, LiteralExpr):
+                entry = (_CONSTANT, bool(node.value))
+            elif isinstance(node, UnaryExpr) and node.operator == TokenType.NOT:
+                entry = (_NOT, args[0])
+            elif isinstance(node, BinaryExpr):
+                entry = (_BINARY, node.operator, args[0], args[1])
+            elif isinstance(node, NaryExpr) and node.operator == TokenType.AND:
+                entry = (_ALL, args)
+            elif isinstance(node, NaryExpr) and node.operator == TokenType.OR:
+                entry = (_ANY, args)
+            else:
+                raise ValueError(f"Cannot tabulate {type(node).__name__}")
+            index[id(node)] = self.add(entry)
+        self.root = index[id(expr)]
+
+        readers: list[list[int]] = [[] for _ in self.nodes]
+        for i, node in enumerate(self.nodes):
+            for arg in self.args(node):
+                readers[arg].append(i)
+        self.dependents: list[list[int]] = []
+        for leaf in self.inputs:
+            reached: set[int] = set()
+            stack = list(readers[leaf])
+            while stack:
+                if (i := stack.pop()) not in reached:
+                    reached.add(i)
+                    stack.extend(readers[i])
+            self.dependents.append(sorted(reached))
+        self.plans = [
+            [self.step(i) for i in dependents] for dependents in self.dependents
+        ]
+        for i in range(len(self.nodes)):
+            self.compute(i)
+
+    def add(self, node: tuple) -> int:
+        self.nodes.append(node)
+        self.values.append(False)
+        return len(self.nodes) - 1
+
+    @staticmethod
+    def args(node: tuple) -> list[int]:
+        kind = node[0]
+        if kind == _NOT:
+            return [node[1]]
+        if kind == _BINARY:
+            return [node[2], node[3]]
+        if kind in (_ALL, _ANY):
+            return node[1]
+        return []
+
+    def compute(self, i: int):
+        node = self.nodes[i]
+        kind = node[0]
+        values = self.values
+        if kind == _BINARY:
+            values[i] = bool(apply_binary(node[1], values[node[2]], values[node[3]]))
+        elif kind == _NOT:
+            values[i] = not values[node[1]]
+        elif kind == _ALL:
+            values[i] = all(values[arg] for arg in node[1])
+        elif kind == _ANY:
+            values[i] = any(values[arg] for arg in node[1])
+        elif kind == _CONSTANT:
+            values[i] = node[1]
+
+    def step(self, i: int) -> tuple[int, int, int, int]:
+        node = self.nodes[i]
+        if node[0] == _BINARY and node[1] in STEPS:
+            return i, STEPS[node[1]], node[2], node[3]
+        if node[0] == _NOT:
+            return i, _STEP_NOT, node[1], 0
+        return i, _STEP_OTHER, 0, 0
+
+    def flip(self, variable: int) -> bool:
+        """Negate input `variable` and return the new value of the root."""
+        values = self.values
+        leaf = self.inputs[variable]
+        values[leaf] = not values[leaf]
+        # The common node kinds are updated inline, the others by `compute`.
+        for i, step, a, b in self.plans[variable]:
+            if step == _STEP_AND:
+                values[i] = values[a] and values[b]
+            elif step == _STEP_OR:
+                values[i] = values[a] or values[b]
+            elif step == _STEP_NOT:
+                values[i] = not values[a]
+            elif step == _STEP_XOR:
+                values[i] = values[a] != values[b]
+            elif step == _STEP_IMPLICATION:
+                values[i] = not values[a] or values[b]
+            elif step == _STEP_BICONDITIONAL:
+                values[i] = values[a] == values[b]
+            else:
+                self.compute(i)
+        return values[self.root]
+
+
+def truth_table(
+    expr: Expr, variables: Iterable[str] | None = None
+) -> Iterator[tuple[int, bool]]:
+    """Rows `(assignment, value)` of the truth table of `expr`, in Gray-code order.
+
+    Bit i of `assignment` is the value of the i-th variable, which defaults
+    to the order of appearance in `expr`. Consecutive rows differ in exactly
+    one variable, and each row only re-evaluates the nodes depending on it.
+    """
+    names = collect_variables(expr) if variables is None else list(variables)
+    circuit = Circuit(expr, names)
+    assignment = 0
+    yield assignment, circuit.values[circuit.root]
+    for row in range(1, 1 << len(names)):
+        variable = (row & -row).bit_length() - 1
+        assignment ^= 1 << variable
+        yield assignment, circuit.flip(variable)
+
+
+def write_csv(
+    expr: Expr, f: TextIO, variables: Iterable[str] | None = None
+) -> None:
+    """Stream the truth table as CSV, one column per variable and a `value` column."""
+    names = collect_variables(expr) if variables is None else list(variables)
+    f.write(",".join(names + ["value"]) + "\n")
+    cells = ["0"] * len(names)
+    previous = 0
+    lines: list[str] = []
+    for assignment, value in truth_table(expr, names):
+        if changed := assignment ^ previous:
+            variable = changed.bit_length() - 1
+            cells[variable] = "1" if assignment & changed else "0"
+            previous = assignment
+        lines.append(",".join(cells) + (",1\n" if value else ",0\n"))
+        if len(lines) == CHUNK_ROWS:
+            f.write("".join(lines))
+            lines.clear()
+    f.write("".join(lines))
+
+
+def write_gray_bits(
+    expr: Expr, f: BinaryIO, variables: Iterable[str] | None = None
+) -> None:
+    """Stream the truth table as one bit per row, in Gray-code row order.
+
+    Bits are packed most significant first, as `numpy.packbits` does, and
+    row k holds the assignment `k ^ (k >> 1)`. There is no header, so this
+    is not the format of `packed_table`, whose bit k is assignment k.
+    """
+    chunk = bytearray(CHUNK_ROWS // 8)
+    rows = 0
+    for row, (_, value) in enumerate(truth_table(expr, variables)):
+        offset = row % CHUNK_ROWS
+        if value:
+            chunk[offset >> 3] |= 0x80 >> (offset & 7)
+        rows += 1
+        if offset == CHUNK_ROWS - 1:
+            f.write(chunk)
+            chunk = bytearray(CHUNK_ROWS // 8)
+    if remainder := rows % CHUNK_ROWS:
+        f.write(chunk[: (remainder + 7) // 8])
@@ -0,0 +1,47 @@
+"""Random formulas and brute-force references shared by the tests and benchmarks."""
+
+import itertools
+import random
+from typing import Iterator
+
+from logic_parser.expr import BinaryExpr, Expr, LiteralExpr, UnaryExpr, VariableExpr
+from logic_parser.token import TokenType
+
+BINARY_OPERATORS = [
+    TokenType.AND,
+    TokenType.OR,
+    TokenType.XOR,
+    TokenType.IMPLICATION,
+    TokenType.BICONDITIONAL,
+]
+
+
+def random_expr(
+    rng: random.Random, names: list[str], depth: int, literals: float = 0.0
+) -> Expr:
+    """A random formula over `names`; `literals` is the chance of a 0/1 leaf."""
+    roll = rng.random()
+    if depth == 0 or roll < 0.15:
+        return VariableExpr(rng.choice(names))
+    if roll < 0.15 + literals:
+        return LiteralExpr(rng.random() < 0.5)
+    if roll < 0.35 + literals:
+        return UnaryExpr(TokenType.NOT, random_expr(rng, names, depth - 1, literals))
+    return BinaryExpr(
+        rng.choice(BINARY_OPERATORS),
+        random_expr(rng, names, depth - 1, literals),
+        random_expr(rng, names, depth - 1, literals),
+    )
+
+
+def brute_force_models(expr: Expr, names: list[str]) -> Iterator[dict[str, bool]]:
+    for values in itertools.product([False, True], repeat=len(names)):
+        env = dict(zip(names, values))
+        if expr.eval(env):
+            yield env
+
+
+def assert_equivalent(original: Expr, rewritten: Expr, names: list[str]):
+    for values in itertools.product([False, True], repeat=len(names)):
+        env = dict(zip(names, values))
+        assert bool(rewritten.eval(env)) == bool(original.eval(env)), env
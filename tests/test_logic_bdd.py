@@ -0,0 +1,90 @@
+import random
+
+import pytest
+
+from logic_parser.bdd import BDD
+from logic_parser.parser import parse_formula
+from tests.helpers import brute_force_models, random_expr
+
+
+def test_equivalent_formulas_share_a_node():
+    bdd = BDD()
+    f = bdd.add_expr(parse_formula("A => B"))
+    g = bdd.add_expr(parse_formula("~A v B"))
+    h = bdd.add_expr(parse_formula("~(A ^ ~B)"))
+    assert f == g == h
+    assert bdd.add_expr(parse_formula("A v ~A")) == bdd.true
+    assert bdd.add_expr(parse_formula("A ^ ~A")) == bdd.false
+    assert f != bdd.add_expr(parse_formula("B => A"))
+
+
+def test_function_operators():
+    bdd = BDD(["A", "B"])
+    a, b = bdd.var("A"), bdd.var("B")
+    assert (a & b) == bdd.add_expr(parse_formula("A ^ B"))
+    assert (a | b) == bdd.add_expr(parse_formula("A v B"))
+    assert (a ^ b) == bdd.add_expr(parse_formula("A != B"))
+    assert a.equiv(b) == ~(a ^ b)
+    assert a.implies(b) == (~a | b)
+
+
+def test_count_and_models_match_brute_force():
+    rng = random.Random(27)
+    names = ["A", "B", "C", "D", "E"]
+    for _ in range(100):
+        expr = random_expr(rng, names, 5)
+        bdd = BDD(names)
+        f = bdd.add_expr(expr)
+        expected = list(brute_force_models(expr, names))
+        assert f.count() == len(expected)
+        assert sorted(map(sorted_items, f.models())) == sorted(
+            map(sorted_items, expected)
+        )
+
+
+def sorted_items(model: dict[str, bool]):
+    return sorted(model.items())
+
+
+def test_count_many_variables():
+    names = [f"X{i}" for i in range(60)]
+    bdd = BDD(names)
+    f = bdd.add_expr(parse_formula(" v ".join(names)))
+    assert f.count() == 2**60 - 1
+    assert bdd.add_expr(parse_formula(" != ".join(names))).count() == 2**59
+
+
+def test_reorder_preserves_functions():
+    # (X1 ^ Y1) v (X2 ^ Y2) v ... is linear with interleaved variables and
+    # exponential when all X come before all Y.
+    n = 6
+    xs = [f"X{i}" for i in range(n)]
+    ys = [f"Y{i}" for i in range(n)]
+    formula = " v ".join(f"({x} ^ {y})" for x, y in zip(xs, ys))
+    bdd = BDD(xs + ys)
+    f = bdd.add_expr(parse_formula(formula))
+    count = f.count()
+    bad_size = len(bdd)
+
+    bdd.reorder()
+    assert len(bdd) < bad_size
+    assert len(bdd) == 2 * n
+    assert f.count() == count
+    assert f == bdd.add_expr(parse_formula(formula))
+
+    bdd.reorder(xs + ys)
+    assert bdd.order == xs + ys
+    assert len(bdd) == bad_size
+    assert f == bdd.add_expr(parse_formula(formula))
+
+    with pytest.raises(ValueError):
+        bdd.reorder(xs)
+
+
+def test_computed_cache_is_bounded():
+    bdd = BDD(cache_size=64)
+    names = [f"X{i}" for i in range(12)]
+    f = bdd.add_expr(parse_formula(" != ".join(names)))
+    assert len(bdd._cache) <= 64
+    assert f.count() == 2**11
+    assert bdd.cache_hits + bdd.cache_misses > 0
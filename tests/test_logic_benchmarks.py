@@ -0,0 +1,88 @@
+import json
+
+import pytest
+
+from benchmarks import suite
+from benchmarks.workloads import workloads
+
+
+def result(seconds=1.0, peak=1_000_000):
+    return {
+        "tokenize": seconds,
+        "parse": seconds,
+        "evaluate": seconds,
+        "peak_bytes": peak,
+    }
+
+
+def run(results, seed=45, scale=1.0):
+    return {"seed": seed, "scale": scale, "commit": None, "results": results}
+
+
+def test_workloads_are_seeded():
+    first = workloads(1, 0.01)
+    assert [w.lines for w in first] == [w.lines for w in workloads(1, 0.01)]
+    assert [w.lines for w in first] != [w.lines for w in workloads(2, 0.01)]
+    assert {w.name for w in first} == {
+        "wide",
+        "deep",
+        "chain",
+        "functions",
+        "large_file",
+        "repl",
+    }
+
+
+def test_workloads_parse_and_evaluate():
+    for workload in workloads(3, 0.01):
+        statements, env = suite.parse(workload, suite.tokenize(workload))
+        assert statements
+        suite.evaluate_all(statements, env)
+
+
+def test_compare_reports_growth_over_threshold():
+    baseline = run({"a": result(), "b": result()})
+    current = run(
+        {
+            "a": {**result(), "parse": 1.2, "evaluate": 1.5},
+            "b": result(peak=2_000_000),
+            "new": result(),
+        }
+    )
+    regressions = suite.compare(baseline, current, 0.25)
+    assert regressions == [
+        "a evaluate: 1 -> 1.5 (+50%)",
+        "b peak_bytes: 1e+06 -> 2e+06 (+100%)",
+    ]
+    assert suite.compare(baseline, current, 1.0) == []
+
+
+def test_compare_ignores_small_times():
+    baseline = run({"a": result(seconds=0.001)})
+    current = run({"a": result(seconds=0.003)})
+    assert suite.compare(baseline, current) == []
+
+
+def test_failed_workloads():
+    baseline = run({"a": {"error": "RecursionError: too deep"}, "b": result()})
+    current = run({"a": result(), "b": {"error": "ValueError: bad"}})
+    assert suite.compare(baseline, current) == ["b: failed, ValueError: bad"]
+    assert "failed" in suite.format_row("b", current["results"]["b"])
+
+
+def test_compare_needs_the_same_workloads():
+    with pytest.raises(ValueError, match="scale"):
+        suite.compare(run({}), run({}, scale=0.5))
+
+
+def test_save_and_compare(tmp_path, capsys):
+    path = tmp_path / "baseline.json"
+    arguments = ["--scale", "0.01", "--rounds", "1", "--only", "wide", "deep"]
+    assert suite.main(arguments + ["--save", str(path)]) == 0
+    saved = json.loads(path.read_text())
+    assert set(saved["results"]) == {"wide", "deep"}
+
+    saved["results"]["wide"]["peak_bytes"] //= 10
+    path.write_text(json.dumps(saved))
+    assert suite.main(arguments + ["--compare", str(path)]) == 1
+    assert "REGRESSION wide peak_bytes" in capsys.readouterr().out
@@ -0,0 +1,75 @@
+import itertools
+import random
+
+import pytest
+
+from logic_parser.bytecode import LOAD, NARY_OR, NOT, OR, compile_expr, load
+from logic_parser.expr import NaryExpr, NoneExpr, VariableExpr
+from logic_parser.parser import parse_formula
+from logic_parser.token import TokenType
+from tests.helpers import random_expr
+
+
+def test_compile_emits_postfix_code():
+    program = compile_expr(parse_formula("A v ~B v A"))
+    assert list(program.code) == [LOAD, LOAD, NOT, OR, LOAD, OR]
+    assert list(program.args) == [0, 1, 0]
+    assert program.names == ["A", "B"]
+    assert compile_expr(parse_formula("B ^ A"), ["A", "B"]).names == ["A", "B"]
+
+
+def test_programs_evaluate_and_round_trip():
+    rng = random.Random(36)
+    names = ["A", "B", "C", "D"]
+    for _ in range(300):
+        expr = random_expr(rng, names, 6, literals=0.1)
+        program = compile_expr(expr, names)
+        assert program.to_expr() == expr
+        for values in itertools.product([False, True], repeat=len(names)):
+            env = dict(zip(names, values))
+            assert program.eval(env) == bool(expr.eval(env))
+            assert program.run(values) == bool(expr.eval(env))
+
+
+def test_nary_nodes_and_errors():
+    expr = NaryExpr(TokenType.OR, [VariableExpr("A"), parse_formula("B ^ C"), VariableExpr("A")])
+    program = compile_expr(expr)
+    assert list(program.code)[-1] == NARY_OR
+    assert program.to_expr() == expr
+    assert program.eval({"A": False, "B": True, "C": True}) is True
+    with pytest.raises(ValueError, match="'C'"):
+        program.eval({"A": False, "B": True})
+    with pytest.raises(ValueError, match="NoneExpr"):
+        compile_expr(NoneExpr())
+
+
+def test_dump_and_load_through_mmap(tmp_path):
+    rng = random.Random(36)
+    names = [f"Signal_{i}" for i in range(20)]
+    expr = random_expr(rng, names, 10, literals=0.05)
+    program = compile_expr(expr)
+    path = tmp_path / "rules.lpbc"
+    with open(path, "wb") as f:
+        program.dump(f)
+    loaded = load(str(path))
+    assert isinstance(loaded.code, memoryview)
+    assert loaded.names == program.names
+    assert list(loaded.code) == list(program.code)
+    assert list(loaded.args) == list(program.args)
+    assert loaded.to_expr() == expr
+    for _ in range(20):
+        env = {name: rng.random() < 0.5 for name in names}
+        assert loaded.eval(env) == bool(expr.eval(env))
+
+
+def test_load_rejects_other_files(tmp_path):
+    path = tmp_path / "rules.lpbc"
+    path.write_bytes(b"not a program at all")
+    with pytest.raises(ValueError, match="not a compiled logic program"):
+        load(str(path))
+
+
+def test_a_few_bytes_per_node():
+    expr = parse_formula(" ^ ".join(f"(X{i} v ~X{i + 1})" for i in range(1000)))
+    program = compile_expr(expr)
+    assert program.nbytes() / len(program) < 3
@@ -0,0 +1,117 @@
+import os
+import subprocess
+import sys
+
+from logic_parser.cache import Cache, CompiledFile
+from logic_parser.expr import evaluate
+from logic_parser.main import run_file
+from logic_parser.parser import Parser
+from logic_parser.tokenizer import Tokenizer
+
+SOURCE = """NAND(x, y) := ~(x ^ y)
+A := 1
+B := 0
+C := NAND(A, B)
+D := C ^ C ^ ~C
+C
+D
+"""
+
+
+def test_entries_keep_statements_memory_and_functions(tmp_path):
+    path = tmp_path / "rules.pl"
+    path.write_text(SOURCE)
+    parser = Parser(Tokenizer(SOURCE).tokenize())
+    statements = list(parser.parse_all())
+    cache = Cache(tmp_path / "cache")
+    assert cache.load(str(path)) is None
+    compiled = CompiledFile(statements, dict(parser.memory), parser.functions)
+    assert cache.store(str(path), compiled)
+
+    loaded = cache.load(str(path))
+    assert loaded == compiled
+    assert cache.stats.hits == 1 and cache.stats.misses == 1
+    # Shared subtrees stay shared.
+    d = loaded.memory["D"]
+    assert d.r_operand.r_operand is d.r_operand.l_operand is loaded.memory["C"]
+
+    more = Parser(Tokenizer("E := NAND(A, A)\nE\n").tokenize(), loaded.memory)
+    more.functions = loaded.functions
+    assert [evaluate(s) for s in more.parse_all()] == [False]
+
+
+def test_changed_files_miss(tmp_path):
+    path = tmp_path / "rules.pl"
+    path.write_text("A := 1\nA\n")
+    cache = Cache(tmp_path / "cache")
+    cache.store(str(path), CompiledFile())
+    assert cache.load(str(path)) is not None
+    path.write_text("A := 0\nA\n")
+    assert cache.load(str(path)) is None
+    cache.store(str(path), CompiledFile())
+    os.utime(path, ns=(0, 0))
+    assert cache.load(str(path)) is None
+    cache.entry_path(str(path)).write_bytes(b"garbage")
+    assert cache.load(str(path)) is None
+
+
+def test_damaged_entries_miss(tmp_path):
+    path = tmp_path / "rules.pl"
+    path.write_text(SOURCE)
+    parser = Parser(Tokenizer(SOURCE).tokenize())
+    statements = list(parser.parse_all())
+    cache = Cache(tmp_path / "cache")
+    cache.store(str(path), CompiledFile(statements, dict(parser.memory)))
+    entry = cache.entry_path(str(path))
+    data = entry.read_bytes()
+    # Truncated, too long, and with an argument out of range.
+    args = 96 + int.from_bytes(data[80:84], "little")
+    out_of_range = data[:args] + b"\xff" * 4 + data[args + 4 :]
+    for damaged in (data[:-1], data + b" ", out_of_range):
+        entry.write_bytes(damaged)
+        assert cache.load(str(path)) is None
+    entry.write_bytes(data)
+    assert cache.load(str(path)) is not None
+
+
+def test_run_file_uses_the_cache(tmp_path, capsys):
+    path = tmp_path / "rules.pl"
+    path.write_text(SOURCE)
+    cache = Cache(tmp_path / "cache")
+    run_file(str(path), cache=cache)
+    first = capsys.readouterr()
+    assert first.out == "True\nFalse\n"
+    assert "cache miss" in first.err
+
+    run_file(str(path), cache=cache)
+    second = capsys.readouterr()
+    assert second.out == first.out
+    assert "cache hit" in second.err
+    assert cache.stats.hits == 1 and cache.stats.misses == 1
+
+
+def test_files_with_errors_are_not_cached(tmp_path, capsys):
+    path = tmp_path / "rules.pl"
+    path.write_text("A := 1\nA\nB\n")
+    cache = Cache(tmp_path / "cache")
+    try:
+        run_file(str(path), cache=cache)
+    except SystemExit:
+        pass
+    assert capsys.readouterr().out.startswith("True\n")
+    assert not cache.entry_path(str(path)).exists()
+
+
+def test_no_cache_flag(tmp_path):
+    path = tmp_path / "rules.pl"
+    path.write_text(SOURCE)
+    env = dict(os.environ, LOGIC_PARSER_CACHE_DIR=str(tmp_path / "cache"))
+    command = [sys.executable, "-m", "logic_parser.main", str(path)]
+    runs = [
+        subprocess.run(command + flags, env=env, capture_output=True, text=True)
+        for flags in ([], [], ["--no-cache"])
+    ]
+    assert [run.stdout for run in runs] == ["True\nFalse\n"] * 3
+    assert "cache miss" in runs[0].stderr
+    assert "cache hit" in runs[1].stderr
+    assert runs[2].stderr == ""
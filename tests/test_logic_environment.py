@@ -0,0 +1,86 @@
+import pytest
+
+from logic_parser.environment import Environment
+from logic_parser.expr import VariableExpr
+from logic_parser.parser import Parser, parse_formula
+from logic_parser.repl import REPL
+from logic_parser.tokenizer import Tokenizer
+
+
+def run(source: str, env: Environment) -> list:
+    return [expr.eval(env) for expr in Parser(Tokenizer(source).tokenize(), env).parse_all()]
+
+
+def test_assignments_record_dependencies():
+    env = Environment()
+    run("A := 1\nB := 0\nC := A ^ B\nD := C v A\n", env)
+    assert env.dependencies["C"] == {"A", "B"}
+    assert env.dependencies["D"] == {"A", "C"}
+    assert env.definition("D") == parse_formula("C v A")
+    assert env.affected_by("A") == {"C", "D"}
+    assert dict(env) == {"A": True, "B": False, "C": False, "D": True}
+
+
+def test_reassigning_an_input_updates_dependents():
+    env = Environment()
+    run("A := 1\nB := A\nA := 0\n", env)
+    assert run("B\n", env) == [False]
+    env["A"] = True
+    assert env["B"] is True
+
+
+def test_only_dirty_dependents_are_recomputed():
+    env = Environment()
+    env.update(A=True, B=False)
+    env["L1"] = parse_formula("A")
+    env["R1"] = parse_formula("B")
+    for i in range(2, 201):
+        env[f"L{i}"] = parse_formula(f"~L{i - 1}")
+        env[f"R{i}"] = parse_formula(f"~R{i - 1}")
+    assert env["L200"] is False and env["R200"] is True
+    assert env.stats.recomputed == 402
+
+    env["A"] = False
+    assert env.dirty == {"A"} | {f"L{i}" for i in range(1, 201)}
+    assert env["R200"] is True
+    assert env.stats.recomputed == 402
+    assert env["L100"] is True
+    assert env.stats.recomputed == 402 + 101
+    assert env["L200"] is True
+    assert env.stats.recomputed == 402 + 201
+
+
+def test_self_reference_uses_previous_value():
+    env = Environment()
+    run("A := 1\nB := ~A\nA := A ^ B\nA := ~A\n", env)
+    assert env["A"] is True
+    assert env.dependencies["A"] == set()
+    env["C"] = parse_formula("A")
+    env["A"] = parse_formula("C v 0")
+    assert env["A"] is True and env["C"] is True
+
+
+def test_undefined_reads_and_deletion():
+    env = Environment()
+    env["B"] = parse_formula("A ^ 1")
+    with pytest.raises(ValueError, match="No value found for variable name 'A'"):
+        env["B"]
+    env["A"] = True
+    assert env["B"] is True
+    del env["A"]
+    assert "A" not in env and "B" in env.dirty
+    with pytest.raises(KeyError):
+        env["A"]
+
+
+def test_environment_as_eval_env():
+    env = Environment({"A": True, "B": False})
+    assert parse_formula("A => B").eval(env) is False
+    assert VariableExpr("B").eval(env) is False
+
+
+def test_repl_uses_spreadsheet_semantics(monkeypatch, capsys):
+    lines = iter(["A := 1", "B := ~A", "A := 0", "B", "exit"])
+    monkeypatch.setattr("builtins.input", lambda _: next(lines))
+    REPL().run()
+    assert capsys.readouterr().out.splitlines()[-3] == "True"
@@ -0,0 +1,128 @@
+import itertools
+import random
+import subprocess
+import sys
+
+from logic_parser.equivalence import compare_outputs, equivalent
+from logic_parser.expr import BinaryExpr, UnaryExpr, collect_variables, format_expr
+from logic_parser.minimizer import minimize
+from logic_parser.optimizer import optimize
+from logic_parser.token import TokenType
+from tests.helpers import random_expr
+
+FILE_A = """A := 1
+B := 0
+C := 1
+NAND(x, y) := ~(x ^ y)
+X := NAND(A, B)
+Y := (A ^ B) v (A ^ C)
+Z := A => B
+W := X ^ C
+Only := A
+"""
+
+FILE_B = """A := 0
+B := 0
+C := 0
+X := ~A v ~B
+Y := A ^ (B v C)
+Z := ~A v B v C
+W := (~A v ~B) ^ C
+Other := B
+"""
+
+NAMES = ["A", "B", "C", "D", "E", "F"]
+
+
+def write_files(tmp_path):
+    a, b = tmp_path / "a.pl", tmp_path / "b.pl"
+    a.write_text(FILE_A)
+    b.write_text(FILE_B)
+    return str(a), str(b)
+
+
+def values(expr, names, assignment):
+    """The values of `expr` for all completions of `assignment` over `names`."""
+    free = [name for name in names if name not in assignment]
+    for bits in itertools.product([False, True], repeat=len(free)):
+        yield bool(expr.eval({**dict(zip(free, bits)), **assignment}))
+
+
+def test_example_files(tmp_path):
+    report = equivalent(*write_files(tmp_path))
+    assert report.outputs == ["X", "Y", "Z", "W"]
+    assert report.only_a == ["Only"] and report.only_b == ["Other"]
+    assert not report
+    [mismatch] = report.mismatches
+    assert mismatch.output == "Z"
+    assert mismatch.assignment == {"A": True, "B": False, "C": True}
+    assert mismatch.values == (False, True)
+    assert equivalent(*write_files(tmp_path), outputs=["X", "Y"]).equivalent
+
+
+def test_rewritten_formulas_are_equivalent():
+    rng = random.Random(49)
+    a = {f"R_{i}": random_expr(rng, NAMES, 5, literals=0.1) for i in range(40)}
+    b = {
+        name: minimize(expr) if i % 2 else optimize(expr)
+        for i, (name, expr) in enumerate(a.items())
+    }
+    report = compare_outputs(a, b)
+    assert report.equivalent and len(report.outputs) == 40
+    stats = report.stats
+    assert stats.simulated == 0 and stats.swept + stats.solved == 40
+
+
+def test_mismatches_agree_with_brute_force():
+    rng = random.Random(490)
+    a, b = {}, {}
+    for i in range(60):
+        expr = random_expr(rng, NAMES, 4)
+        mutated = BinaryExpr(
+            rng.choice([TokenType.AND, TokenType.OR]),
+            UnaryExpr(TokenType.NOT, expr) if rng.random() < 0.2 else expr,
+            random_expr(rng, NAMES, 2),
+        )
+        a[f"R_{i}"], b[f"R_{i}"] = expr, mutated
+    report = compare_outputs(a, b, patterns=8)
+    differ = {m.output: m for m in report.mismatches}
+    assert differ and len(differ) < len(a)
+    for name in a:
+        support = sorted({*collect_variables(a[name]), *collect_variables(b[name])})
+
+        def pairs(assignment):
+            return zip(
+                values(a[name], support, assignment),
+                values(b[name], support, assignment),
+            )
+
+        assert (name in differ) == any(x != y for x, y in pairs({})), name
+        if name not in differ:
+            continue
+        mismatch = differ[name]
+        assignment = mismatch.assignment
+        assert all(x != y for x, y in pairs(assignment))
+        for dropped in assignment:
+            rest = {n: v for n, v in assignment.items() if n != dropped}
+            assert any(x == y for x, y in pairs(rest))
+        zeros = {n: assignment.get(n, False) for n in support}
+        assert mismatch.values == (
+            bool(a[name].eval(zeros)),
+            bool(b[name].eval(zeros)),
+        )
+
+
+def test_command_line(tmp_path):
+    a, b = write_files(tmp_path)
+    run = subprocess.run(
+        [sys.executable, "-m", "logic_parser.main", "--equivalent-files", a, b],
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+    assert run.returncode == 1
+    assert run.stdout.splitlines() == [
+        f"Z differs with A := 1, B := 0, C := 1: False in {a}, True in {b}",
+        "4 outputs compared, 1 differs.",
+    ]
+    assert f"Only in {a}: Only" in run.stderr
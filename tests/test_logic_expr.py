@@ -0,0 +1,48 @@
+import random
+import sys
+
+import pytest
+
+from benchmarks.bench_eval import deep_chain, recursive_eval
+from logic_parser.expr import NaryExpr, evaluate
+from logic_parser.main import run_file
+from logic_parser.parser import parse_formula
+from logic_parser.token import TokenType
+from tests.helpers import random_expr
+
+
+def test_evaluate_matches_recursive_evaluation():
+    rng = random.Random(35)
+    names = ["A", "B", "C", "D"]
+    for _ in range(500):
+        expr = random_expr(rng, names, 6, literals=0.1)
+        env = {name: rng.random() < 0.5 for name in names}
+        assert evaluate(expr, env) == recursive_eval(expr, env)
+        assert expr.eval(env) == recursive_eval(expr, env)
+
+
+def test_short_circuit_skips_undecisive_operands():
+    assert evaluate(parse_formula("A ^ Missing"), {"A": False}) is False
+    assert evaluate(parse_formula("A v Missing"), {"A": True}) is True
+    assert evaluate(parse_formula("A => Missing"), {"A": False}) is True
+    with pytest.raises(ValueError, match="Missing"):
+        evaluate(parse_formula("A != Missing"), {"A": False})
+    chain = NaryExpr(TokenType.OR, [parse_formula("A"), parse_formula("Missing")])
+    assert evaluate(chain, {"A": True}) is True
+    assert evaluate(NaryExpr(TokenType.AND, [])) is True
+    assert evaluate(NaryExpr(TokenType.OR, [])) is False
+
+
+def test_deep_trees_do_not_recurse():
+    names = [f"X{i}" for i in range(16)]
+    env = dict.fromkeys(names, True)
+    expr = deep_chain(random.Random(35), 10 * sys.getrecursionlimit())
+    assert evaluate(expr, env) == expr.eval(env)
+    assert parse_formula("~" * 20001 + "A").eval({"A": True}) is False
+
+
+def test_run_file_evaluates_long_chains(tmp_path, capsys):
+    path = tmp_path / "chain.pl"
+    path.write_text("A := 1\n" + "A ^ " * 5000 + "~A\n" + "A ^ " * 5000 + "A\n")
+    run_file(str(path))
+    assert capsys.readouterr().out.splitlines() == ["False", "True"]
@@ -0,0 +1,78 @@
+from logic_parser.environment import Environment
+from logic_parser.expr import LiteralExpr, evaluate
+from logic_parser.memo import CallCache
+from logic_parser.parser import Parser
+from logic_parser.profiling import Profiler
+from logic_parser.tokenizer import scan
+
+SOURCE = """NAND(x, y) := ~(x ^ y)
+A := 1
+B := 0
+C := NAND(A, B)
+D := NAND(~B, B)
+E := NAND(A v B, B)
+F := NAND(A, A)
+C
+D
+E
+F
+"""
+
+
+def run(source, memory=None, calls=None):
+    parser = Parser(scan(source), memory, calls=calls)
+    return [evaluate(s, memory) for s in parser.parse_all()], parser
+
+
+def test_calls_with_the_same_values_are_cached():
+    results, parser = run(SOURCE)
+    assert results == [True, True, True, False]
+    stats = parser.calls.stats
+    # NAND(~B, B) and NAND(A v B, B) have the argument values of NAND(A, B).
+    assert (stats.hits, stats.misses) == (2, 2)
+    assert stats.hit_rate == 0.5
+    assert parser.memory["D"] == parser.memory["C"] == LiteralExpr(True)
+
+
+def test_redefining_a_function_drops_its_entries():
+    source = "F(x) := ~x\nA := F(1)\nF(x) := x\nB := F(1)\nA\nB\n"
+    results, parser = run(source)
+    assert results == [False, True]
+    assert parser.calls.stats.hits == 0 and len(parser.calls) == 1
+
+
+def test_lru_size():
+    source = """A_0 := 0
+A_1 := 1
+SAME(x, y) := x <=> y
+R_0 := SAME(A_0, A_0)
+R_1 := SAME(A_0, A_1)
+R_2 := SAME(A_1, A_0)
+R_3 := SAME(A_0, A_0)
+"""
+    calls = CallCache(maxsize=2)
+    run(source, calls=calls)
+    assert len(calls) == 2 and calls.stats.misses == 4
+    _, parser = run(source)
+    assert parser.calls.stats.hits == 1
+    _, parser = run(source, calls=CallCache(maxsize=0))
+    assert len(parser.calls) == 0 and parser.calls.stats.misses == 0
+
+
+def test_calls_that_may_change_are_not_cached():
+    # The body reads a variable that is not an argument.
+    _, parser = run("G := 1\nF(x) := x ^ G\nA := 1\nB := F(A)\nC := F(A)\n")
+    assert parser.calls.stats.hits == 0 and len(parser.calls) == 0
+    # Arguments in an environment are references that later assignments change.
+    env = Environment()
+    results, parser = run("NOT(x) := ~x\nA := 1\nB := NOT(A)\nC := NOT(A)\nC\n", env)
+    assert results[-1] is False
+    assert parser.calls.stats.uncached == 2 and len(parser.calls) == 0
+
+
+def test_profile_counts_cached_calls():
+    with Profiler() as profiler:
+        run(SOURCE)
+    assert profiler.functions["NAND"].calls == 2
+    assert profiler.functions["NAND"].cached == 2
+    assert "2 cached" in str(profiler.report())
@@ -0,0 +1,92 @@
+import random
+
+import pytest
+
+from logic_parser.expr import Expr, LiteralExpr, format_expr
+from logic_parser.minimizer import minimize, prime_implicants, quine_mccluskey
+from logic_parser.parser import parse_formula
+from tests.helpers import assert_equivalent, random_expr
+
+
+def cost(expr: Expr) -> tuple[int, int]:
+    terms = format_expr(expr).split(" v ")
+    return len(terms), sum(len(term.split(" ^ ")) for term in terms)
+
+
+def test_format_expr_round_trips():
+    for formula in [
+        "A ^ B v ~C",
+        "~(A v B) => C => D",
+        "A => (B => C)",
+        "(A <=> B) ^ 1",
+        "A != B != (C v 0)",
+    ]:
+        expr = parse_formula(formula)
+        assert format_expr(expr) == formula
+        assert parse_formula(format_expr(expr)) == expr
+
+
+def test_minimize_known_formulas():
+    assert format_expr(minimize(parse_formula("A ^ B v A ^ ~B v C ^ A"))) == "A"
+    assert (
+        format_expr(minimize(parse_formula("A ^ B v A ^ ~B ^ C v ~A ^ B ^ C")))
+        == "A ^ B v A ^ C v B ^ C"
+    )
+    assert minimize(parse_formula("A v ~A")) == LiteralExpr(True)
+    assert minimize(parse_formula("A ^ ~A ^ B")) == LiteralExpr(False)
+
+
+def test_quine_mccluskey_textbook_example():
+    # f(A, B, C, D) = sum of minterms 4, 8, 10, 11, 12, 15 with A the high bit.
+    minterms = [4, 8, 10, 11, 12, 15]
+    assert len(prime_implicants(minterms, 4)) == 5
+    cover = quine_mccluskey(minterms, 4)
+    assert len(cover) == 3
+    covered = {m for m in range(16) for mask, value in cover if m & mask == value}
+    assert covered == set(minterms)
+
+
+def test_minimize_variable_order_and_validation():
+    expr = parse_formula("B ^ A")
+    assert format_expr(minimize(expr, variables=["A", "B", "C"])) == "A ^ B"
+    with pytest.raises(ValueError):
+        minimize(expr, variables=["A"])
+
+
+@pytest.mark.parametrize("exact_limit", [8, 0])
+def test_randomized_minimization_is_equivalent(exact_limit):
+    rng = random.Random(30 + exact_limit)
+    names = ["A", "B", "C", "D", "E"]
+    for _ in range(60):
+        expr = random_expr(rng, names, 6, literals=0.05)
+        minimized = minimize(expr, exact_limit=exact_limit)
+        assert_equivalent(expr, minimized, names)
+        assert_equivalent(expr, parse_formula(format_expr(minimized)), names)
+
+
+def test_exact_is_never_worse_than_heuristic():
+    rng = random.Random(7)
+    names = ["A", "B", "C", "D", "E", "F"]
+    for _ in range(40):
+        expr = random_expr(rng, names, 7, literals=0.05)
+        exact = minimize(expr)
+        heuristic = minimize(expr, exact_limit=0)
+        if isinstance(exact, LiteralExpr):
+            assert exact == heuristic
+        else:
+            assert cost(exact) <= cost(heuristic)
+
+
+def test_heuristic_on_many_variables():
+    names = [f"X{i}" for i in range(12)]
+    # Every third term is the consensus of the two before it, so redundant.
+    terms = []
+    for a, b, c in zip(names[::2], names[1::2], names[2::2]):
+        terms += [f"{a} ^ {b}", f"~{b} ^ {c}", f"{a} ^ {c}"]
+    expr = parse_formula(" v ".join(terms))
+    minimized = minimize(expr)
+    assert cost(minimized) == (10, 20)
+    rng = random.Random(12)
+    for _ in range(500):
+        env = {name: rng.random() < 0.5 for name in names}
+        assert minimized.eval(env) == expr.eval(env)
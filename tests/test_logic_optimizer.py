@@ -0,0 +1,83 @@
+import random
+
+from logic_parser.expr import (
+    LiteralExpr,
+    NaryExpr,
+    UnaryExpr,
+    VariableExpr,
+)
+from logic_parser.optimizer import Optimizer, count_nodes, optimize
+from logic_parser.parser import Parser, parse_formula
+from logic_parser.token import TokenType
+from logic_parser.tokenizer import Tokenizer
+from tests.helpers import assert_equivalent, random_expr
+
+
+def test_constant_folding():
+    assert optimize(parse_formula("1 ^ 0 v 1")) == LiteralExpr(True)
+    assert optimize(parse_formula("A ^ 1")) == VariableExpr("A")
+    assert optimize(parse_formula("A ^ 0")) == LiteralExpr(False)
+    assert optimize(parse_formula("A v 1")) == LiteralExpr(True)
+    assert optimize(parse_formula("0 => A")) == LiteralExpr(True)
+    assert optimize(parse_formula("A => 0")) == UnaryExpr(TokenType.NOT, VariableExpr("A"))
+    assert optimize(parse_formula("A != 1")) == UnaryExpr(TokenType.NOT, VariableExpr("A"))
+    assert optimize(parse_formula("A <=> 1")) == VariableExpr("A")
+
+
+def test_double_negation_and_complements():
+    assert optimize(parse_formula("~~A")) == VariableExpr("A")
+    assert optimize(parse_formula("~~~A")) == UnaryExpr(TokenType.NOT, VariableExpr("A"))
+    assert optimize(parse_formula("A ^ ~A")) == LiteralExpr(False)
+    assert optimize(parse_formula("B v ~B v C")) == LiteralExpr(True)
+    assert optimize(parse_formula("A != ~A")) == LiteralExpr(True)
+    assert optimize(parse_formula("(A ^ B) <=> (B ^ A)")) == LiteralExpr(True)
+
+
+def test_idempotence_absorption_and_flattening():
+    assert optimize(parse_formula("A ^ A ^ A")) == VariableExpr("A")
+    assert optimize(parse_formula("A ^ (A v B)")) == VariableExpr("A")
+    assert optimize(parse_formula("A v (B ^ A)")) == VariableExpr("A")
+
+    flat = optimize(parse_formula("A ^ (B ^ (C ^ D)) ^ B"))
+    assert isinstance(flat, NaryExpr)
+    assert flat.operator == TokenType.AND
+    assert [operand.name for operand in flat.operands] == ["A", "B", "C", "D"]
+
+
+def test_node_counts_are_reported():
+    optimizer = Optimizer()
+    expr = parse_formula("~~A ^ (1 v B) ^ A")
+    assert count_nodes(expr) == 9
+    assert optimizer.optimize(expr) == VariableExpr("A")
+    assert optimizer.report.nodes_before == 9
+    assert optimizer.report.nodes_after == 1
+
+
+def test_shared_subtrees_are_counted_and_optimized_once():
+    stmt = "A := 1\nB := A ^ A\nC := B ^ B\nD := C v C\nD"
+    parser = Parser(Tokenizer(stmt).tokenize(), {})
+    expr = parser.parse()
+    assert count_nodes(expr) == 15
+    assert optimize(expr) == LiteralExpr(True)
+
+
+def test_randomized_semantic_equivalence():
+    rng = random.Random(29)
+    names = ["A", "B", "C", "D"]
+    optimizer = Optimizer()
+    for _ in range(500):
+        expr = random_expr(rng, names, 6, literals=0.1)
+        optimized = optimizer.optimize(expr)
+        assert count_nodes(optimized) <= count_nodes(expr)
+        assert_equivalent(expr, optimized, names)
+
+
+def test_forget_keeps_memory_per_statement():
+    optimizer = Optimizer()
+    for i in range(200):
+        optimizer.optimize(parse_formula(f"A ^ B{i} v ~(C => B{i})"))
+        optimizer.forget()
+        assert not optimizer.memo and not optimizer.originals
+    assert len(optimizer.interned) == 202
+    assert optimizer.optimize(parse_formula("A ^ A")) is optimizer.interned[("var", "A")]
+    assert optimizer.report.nodes_before == 200 * 8 + 3
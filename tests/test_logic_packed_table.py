@@ -0,0 +1,67 @@
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from logic_parser.expr import NaryExpr, VariableExpr, evaluate
+from logic_parser.packed_table import PackedTable, evaluate_range, write_table
+from logic_parser.parser import parse_formula
+from logic_parser.token import TokenType
+from logic_parser.truth_table import truth_table
+from tests.helpers import random_expr
+
+
+def test_vectorized_evaluation_matches_evaluate():
+    rng = random.Random(40)
+    names = ["A", "B", "C", "D", "E"]
+    for _ in range(200):
+        expr = random_expr(rng, names, 6, literals=0.1)
+        if rng.random() < 0.2:
+            expr = NaryExpr(rng.choice([TokenType.AND, TokenType.OR]), [expr, VariableExpr("A")])
+        values = evaluate_range(expr, names, 0, 32)
+        expected = [value for _, value in sorted(truth_table(expr, names))]
+        assert values.tolist() == expected
+
+
+def test_write_and_look_up(tmp_path):
+    expr = parse_formula("A ^ ~B v C ^ D")
+    names = ["A", "B", "C", "D"]
+    table = write_table(expr, str(tmp_path / "f.lptt"), names, chunk_bits=3)
+    assert isinstance(table.bits, np.memmap)
+    assert table.names == names and len(table) == 16
+    for assignment in range(16):
+        env = {name: bool(assignment >> i & 1) for i, name in enumerate(names)}
+        assert table[assignment] == evaluate(expr, env) == table[env]
+    assert table.count() == sum(table[a] for a in range(16))
+    with pytest.raises(IndexError):
+        table[16]
+
+
+def test_count_and_set_operations(tmp_path):
+    names = [f"X{i}" for i in range(12)]
+    f = parse_formula("X0 ^ X3 v ~X11 ^ (X5 != X7)")
+    g = parse_formula("X3 => X5 ^ X0")
+    a = write_table(f, str(tmp_path / "f.lptt"), names, chunk_bits=8)
+    b = write_table(g, str(tmp_path / "g.lptt"), names)
+    expected = {
+        "and": parse_formula("(X0 ^ X3 v ~X11 ^ (X5 != X7)) ^ (X3 => X5 ^ X0)"),
+        "or": parse_formula("(X0 ^ X3 v ~X11 ^ (X5 != X7)) v (X3 => X5 ^ X0)"),
+        "xor": parse_formula("(X0 ^ X3 v ~X11 ^ (X5 != X7)) != (X3 => X5 ^ X0)"),
+        "andnot": parse_formula("(X0 ^ X3 v ~X11 ^ (X5 != X7)) ^ ~(X3 => X5 ^ X0)"),
+    }
+    for operation, formula in expected.items():
+        reference = write_table(formula, str(tmp_path / f"{operation}.ref"), names)
+        combined = a.combine(b, operation, str(tmp_path / f"{operation}.lptt"))
+        assert np.array_equal(combined.bits, reference.bits)
+        assert a.count_with(b, operation) == combined.count() == reference.count()
+
+
+def test_incompatible_and_invalid_files(tmp_path):
+    a = write_table(parse_formula("A ^ B"), str(tmp_path / "a.lptt"))
+    b = write_table(parse_formula("B ^ A"), str(tmp_path / "b.lptt"))
+    with pytest.raises(ValueError, match="different variables"):
+        a.count_with(b, "and")
+    (tmp_path / "bad").write_bytes(b"0" * 64)
+    with pytest.raises(ValueError, match="not a packed truth table"):
+        PackedTable(str(tmp_path / "bad"))
@@ -1,9 +1,24 @@
+import random
+import sys
+import tracemalloc
+
 import pytest
+from benchmarks.bench_parser import RecursiveDescentParser, random_formula
 from logic_parser import token
+from logic_parser.environment import Environment
 from logic_parser.exceptions import ParserError, TokenizerError
-from logic_parser.expr import Expr
-from logic_parser.parser import Parser
-from logic_parser.tokenizer import Tokenizer
+from logic_parser.frame import Frame
+from logic_parser.expr import (
+    BinaryExpr,
+    Expr,
+    UnaryExpr,
+    VariableExpr,
+    collect_variables,
+    evaluate,
+)
+from logic_parser.parser import Parser, parse_formula
+from logic_parser.main import expand_paths, run_file, run_files
+from logic_parser.tokenizer import Tokenizer, scan, tokenize_lines
 
 
 # Tokenizer tests
@@ -442,3 +457,196 @@ def test_function_call_non_identifier_arg():
     with pytest.raises(Exception) as excinfo:
         list(parser.parse_all())
     assert "No value found for variable name 'B'" in str(excinfo.value)
+
+
+def test_literal_operands_evaluate_as_booleans():
+    stmt = """
+    NAND(x, y) := ~(x ^ y)
+    R := NAND(1, 0)
+    R
+    A := 1
+    A ^ 0
+    """
+    tkz = Tokenizer(stmt)
+    tokens = tkz.tokenize()
+    parser = Parser(tokens, {})
+    results = list(parser.parse_all())
+    assert results[0].eval() is True
+    assert results[1].eval() is False
+
+
+def test_parse_formula_free_variables():
+    expr = parse_formula("(A ^ B) => C")
+    assert collect_variables(expr) == ["A", "B", "C"]
+    assert expr.eval({"A": True, "B": True, "C": False}) is False
+    assert expr.eval({"A": True, "B": False, "C": False}) is True
+    with pytest.raises(ValueError):
+        expr.eval()
+
+
+def test_tokenize_lines_matches_tokenize():
+    content = "A := 1\n// note\nB := A ^ ~0\n\nf(x, y) := x <=> y\nB != A => 1"
+    streamed = list(tokenize_lines(content.splitlines(keepends=True)))
+    assert streamed == Tokenizer(content).tokenize()
+
+
+def tokenize_or_error(tokenize, content: str):
+    try:
+        return tokenize(content)
+    except TokenizerError as err:
+        return str(err), err.line, err.line_pos
+
+
+def test_scan_matches_tokenizer():
+    rng = random.Random(33)
+    pieces = " |\t|\n|~|^|v|(|)|,|//|/|<=>|<|=>|=|!=|!|:=|:|0|1|2|A|var|x_1|é|$|>"
+    pieces = pieces.split("|")
+    for _ in range(2000):
+        content = "".join(rng.choice(pieces) for _ in range(rng.randint(0, 20)))
+        expected = tokenize_or_error(lambda text: Tokenizer(text).tokenize(), content)
+        assert tokenize_or_error(lambda text: list(scan(text)), content) == expected
+    assert all(not hasattr(token, "__dict__") for token in scan("A := 1 // x\n"))
+
+
+def test_parser_reads_token_stream_lazily():
+    consumed = []
+
+    def tokens():
+        for token in tokenize_lines(["A := 1\n", "A\n", "~A\n", "A ^ 0\n"]):
+            consumed.append(token)
+            yield token
+
+    results = Parser(tokens(), {}).parse_all()
+    assert next(results).eval() is True
+    assert len(consumed) <= 7
+    assert [result.eval() for result in results] == [False, False]
+
+
+def test_long_runs_of_assignments():
+    lines = [f"V{i} := {i % 2}\n" for i in range(5000)] + ["V4999 ^ ~V4998\n"]
+    parser = Parser(tokenize_lines(lines), {})
+    results = list(parser.parse_all())
+    assert len(parser.memory) == 5000
+    assert [result.eval() for result in results] == [True]
+
+
+def test_run_file_streams_results(tmp_path, capsys):
+    path = tmp_path / "stream.pl"
+    path.write_text("A := 1\nA\n~A\nUnset\n")
+    with pytest.raises(SystemExit):
+        run_file(str(path))
+    assert capsys.readouterr().out.splitlines() == [
+        "True",
+        "False",
+        f"{path}:4:6: No value found for variable name 'Unset'.",
+    ]
+
+
+def test_run_files_keeps_file_order(tmp_path, capsys):
+    sources = {"b.pl": "B := 0\nB\nX\n", "a.pl": "A := 1\nA\n", "c.pl": "~1\n"}
+    for name, source in sources.items():
+        (tmp_path / name).write_text(source)
+    paths = expand_paths([str(tmp_path / "*.pl"), str(tmp_path / "missing.pl")])
+    assert paths[:3] == [str(tmp_path / name) for name in ("a.pl", "b.pl", "c.pl")]
+    expected = [
+        f"==> {tmp_path / 'a.pl'} <==",
+        "True",
+        f"==> {tmp_path / 'b.pl'} <==",
+        "False",
+        f"{tmp_path / 'b.pl'}:3:2: No value found for variable name 'X'.",
+        f"==> {tmp_path / 'c.pl'} <==",
+        "False",
+        f"==> {tmp_path / 'missing.pl'} <==",
+    ]
+    for jobs in (1, 3):
+        with pytest.raises(SystemExit):
+            run_files(paths, jobs)
+        out, err = capsys.readouterr()
+        assert out.splitlines()[:-1] == expected
+        assert "No such file" in out.splitlines()[-1]
+        assert f"{tmp_path / 'a.pl'}: 1 results in" in err
+        assert err.splitlines()[-1].startswith("4 files, 2 failed in")
+
+
+def parse_or_error(parser_class, content: str):
+    try:
+        return list(parser_class(scan(content), {}, free_variables=True).parse_all())
+    except ParserError as err:
+        return str(err), err.token
+
+
+def test_precedence_climbing_matches_recursive_descent():
+    rng = random.Random(34)
+    for _ in range(1000):
+        content = random_formula(rng, 6)
+        if rng.random() < 0.3:
+            content = content.replace(" ^ ", " ^\n", 1).replace("(", "(X := 1\n", 1)
+        if rng.random() < 0.1:
+            words = content.split(" ")
+            content = " ".join(words[: rng.randint(0, len(words))])
+        expected = parse_or_error(RecursiveDescentParser, content)
+        assert parse_or_error(Parser, content) == expected
+
+
+def test_nesting_deeper_than_recursion_limit():
+    depth = 2 * sys.getrecursionlimit()
+    expr = parse_formula("(" * depth + "A" + ")" * depth + " ^ " + "~" * depth + "B")
+    assert isinstance(expr, BinaryExpr) and expr.r_operand == VariableExpr("A")
+    operand = expr.l_operand
+    for _ in range(depth):
+        assert isinstance(operand, UnaryExpr)
+        operand = operand.operand
+    assert operand == VariableExpr("B")
+
+
+def test_long_flat_chain():
+    expr = parse_formula("A ^ " * 20000 + "~A v A")
+    assert isinstance(expr, BinaryExpr) and expr.operator == token.TokenType.OR
+    depth = 0
+    node = expr.r_operand
+    while isinstance(node, BinaryExpr):
+        node = node.r_operand
+        depth += 1
+    assert depth == 20000
+
+
+def test_parsers_do_not_share_default_memory():
+    for i in range(3):
+        parser = Parser(scan(f"V{i} := 1\nV{i}\n"))
+        assert [result.eval() for result in parser.parse_all()] == [True]
+        assert list(parser.memory) == [f"V{i}"]
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    for i in range(1000):
+        list(Parser(scan(f"W{i} := 1\nW{i}\n")).parse_all())
+    growth = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    assert growth < 50_000
+
+
+def test_frames_look_names_up_through_parents():
+    frame = Frame()
+    frame["A"] = parse_formula("1")
+    frame["B"] = parse_formula("0")
+    call = frame.child()
+    call["B"] = parse_formula("1")
+    assert call["A"] is frame["A"] and call.lookup("C") is None
+    assert call["B"].eval() is True and frame["B"].eval() is False
+    assert list(call) == ["B"] and "A" in call and "C" not in call
+    del frame["A"]
+    assert "A" not in call and dict(frame) == {"B": frame["B"]}
+    outer = Frame(outer={"C": parse_formula("1")}.get)
+    assert outer["C"].eval() is True and not outer
+
+
+def test_function_calls_see_the_calling_frame():
+    stmt = "G := 1\nF(x) := x ^ G\nR := F(G)\nR\n"
+    parser = Parser(scan(stmt))
+    assert [result.eval() for result in parser.parse_all()] == [True]
+    assert isinstance(parser.memory, Frame) and list(parser.memory) == ["G", "R"]
+    # Other memories give function bodies the same view of the caller.
+    env = Environment()
+    results = [evaluate(s, env) for s in Parser(scan(stmt), env).parse_all()]
+    assert results == [True]
+    parser = Parser(scan(stmt), {})
+    assert [result.eval() for result in parser.parse_all()] == [True]
@@ -0,0 +1,67 @@
+import json
+import subprocess
+import sys
+
+from logic_parser import profiling
+from logic_parser.expr import evaluate
+from logic_parser.parser import Parser, parse_formula
+from logic_parser.profiling import Profiler
+from logic_parser.tokenizer import scan, tokenize_lines
+
+SOURCE = [
+    "NAND(x, y) := ~(x ^ y)\n",
+    "A := 0\n",
+    "B := NAND(A, A)\n",
+    "A ^ B\n",
+    "B v A\n",
+]
+
+
+def test_phases_are_counted():
+    with Profiler() as profiler:
+        assert profiling.ACTIVE is profiler
+        results = [evaluate(s) for s in Parser(tokenize_lines(SOURCE)).parse_all()]
+    assert profiling.ACTIVE is None
+    assert results == [False, True]
+    report = profiler.report()
+    assert report.tokens == len(list(scan("".join(SOURCE))))
+    assert report.statements == 2 and report.parse.calls == 2
+    # The call cache replaces `NAND(A, A)` by its value.
+    assert report.ast_nodes == 6
+    # `A ^ B` stops at A, and `B v A` at B.
+    assert report.evaluate.calls == 2 and report.eval_visits == 2 + 2
+    assert report.functions["NAND"].calls == 1
+    assert report.functions["NAND"].tokens == 6
+    assert report.seconds >= report.parse.seconds + report.tokenize.seconds
+
+
+def test_nothing_is_recorded_without_a_profiler():
+    profiler = Profiler()
+    with profiler:
+        pass
+    evaluate(parse_formula("1 ^ 0"))
+    with Profiler() as inner:
+        evaluate(parse_formula("1"))
+    assert profiler.evaluate.calls == 0
+    assert inner.evaluate.calls == 1 and inner.eval_visits == 1
+
+
+def test_trace_memory_and_json(tmp_path):
+    with Profiler(trace_memory=True) as profiler:
+        list(Parser(tokenize_lines(SOURCE)).parse_all())
+    report = json.loads(profiler.report().to_json())
+    assert report["peak_traced_bytes"] > 0
+    assert report["functions"]["NAND"]["calls"] == 1
+
+    path = tmp_path / "rules.pl"
+    path.write_text("".join(SOURCE))
+    output = tmp_path / "profile.json"
+    command = [sys.executable, "-m", "logic_parser.main", "--no-cache", str(path)]
+    run = subprocess.run(
+        command + ["--profile", "--profile-json", str(output)],
+        capture_output=True,
+        text=True,
+    )
+    assert run.stdout == "False\nTrue\n"
+    assert "call NAND" in run.stderr
+    assert json.loads(output.read_text())["statements"] == 2
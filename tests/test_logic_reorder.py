@@ -0,0 +1,63 @@
+import itertools
+import random
+
+from logic_parser.expr import BinaryExpr, NaryExpr, VariableExpr, evaluate
+from logic_parser.parser import parse_formula
+from logic_parser.reorder import Profile, reorder
+from logic_parser.token import TokenType
+from tests.helpers import assert_equivalent, random_expr
+
+
+def test_profile_counts_outcomes_and_skipped_nodes():
+    expr = parse_formula("A ^ (B v C v D)")
+    profile = Profile()
+    assert profile.evaluate(expr, {"A": False, "B": True, "C": True, "D": True}) is False
+    assert (profile.evaluated, profile.skipped) == (2, 5)
+    assert profile.evaluate(expr, {"A": True, "B": True, "C": False, "D": False}) is True
+    assert profile.counts[id(expr)] == [1, 1]
+    assert profile.counts[id(expr.r_operand)] == [1, 1]
+    assert profile.probability(expr.r_operand, True) == 0.5
+
+
+def test_profile_evaluation_matches_evaluate():
+    rng = random.Random(37)
+    names = ["A", "B", "C", "D"]
+    profile = Profile()
+    for _ in range(300):
+        expr = random_expr(rng, names, 6, literals=0.1)
+        nary = NaryExpr(rng.choice([TokenType.AND, TokenType.OR]), [expr, VariableExpr("A")])
+        for values in itertools.product([False, True], repeat=len(names)):
+            env = dict(zip(names, values))
+            assert bool(profile.evaluate(expr, env)) == bool(evaluate(expr, env))
+            assert bool(profile.evaluate(nary, env)) == bool(evaluate(nary, env))
+
+
+def test_reorder_puts_cheap_deciding_operands_first():
+    expr = parse_formula("(B v C v D v E) ^ A")
+    profile = Profile()
+    rng = random.Random(37)
+    for _ in range(100):
+        env = {name: rng.random() < 0.5 for name in "BCDE"}
+        profile.evaluate(expr, env | {"A": rng.random() < 0.1})
+    reordered = reorder(expr, profile)
+    assert isinstance(reordered, BinaryExpr)
+    assert reordered.r_operand == VariableExpr("A")
+
+    skipped = profile.skipped
+    after = Profile()
+    for _ in range(100):
+        env = {name: rng.random() < 0.5 for name in "BCDE"}
+        after.evaluate(reordered, env | {"A": rng.random() < 0.1})
+    assert after.evaluated < profile.evaluated
+    assert after.skipped > skipped
+
+
+def test_reorder_preserves_semantics():
+    rng = random.Random(37)
+    names = ["A", "B", "C", "D"]
+    for _ in range(200):
+        expr = random_expr(rng, names, 6, literals=0.1)
+        profile = Profile()
+        for _ in range(10):
+            profile.evaluate(expr, {name: rng.random() < 0.7 for name in names})
+        assert_equivalent(expr, reorder(expr, profile), names)
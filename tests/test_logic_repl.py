@@ -0,0 +1,82 @@
+import io
+import subprocess
+import sys
+
+from logic_parser.repl import REPL
+
+SESSION = """A := 1
+B := ~A
+B
+NOT(x) := ~x
+C := NOT(A)
+C
+A := 0
+C
+B
+"""
+
+
+def batch(source, repl=None, block_size=7):
+    out = io.StringIO()
+    (repl or REPL()).run_batch(io.StringIO(source), out, block_size)
+    return out.getvalue()
+
+
+def test_batch_prints_results_only():
+    assert batch(SESSION) == "False\nFalse\nTrue\nTrue\n"
+    assert batch("A := 1\n\nA\nexit\nA\n") == "True\n"
+    assert batch("A := 1\r\n~A") == "False\n"
+    assert batch("D\n(A := 1\n") == (
+        "Error at position 2: No value found for variable name 'D'.\n"
+        "Error: Unexpected end of input.\n"
+    )
+
+
+def test_repeated_lines_are_parsed_once():
+    repl = REPL()
+    batch(SESSION * 3, repl)
+    # The 5 assignments are parsed every time. Defining NOT changes the
+    # version, so `B` is parsed again after it; defining it again does not.
+    assert (repl.stats.misses, repl.stats.hits) == (3 * 5 + 3, 1 + 4 + 4)
+    assert batch("B v C\n" * 4, repl) == "True\n" * 4
+    assert repl.stats.hits == 9 + 3
+    # Each distinct line was tokenized once.
+    assert len(repl.tokenized) == len(set(SESSION.splitlines()) | {"B v C"})
+    tokens = repl.tokenized["A := 1"]
+    batch("A := 1\n", repl)
+    assert repl.tokenized["A := 1"] is tokens
+
+
+def test_definitions_change_what_lines_parse_to():
+    repl = REPL()
+    source = "X\nX := 1\nX\nF(x) := x\nY := F(X)\nF(x) := ~x\nZ := F(X)\nZ\n"
+    assert batch(source, repl) == (
+        "Error at position 2: No value found for variable name 'X'.\nTrue\nFalse\n"
+    )
+    assert repl.version == 2
+    assert batch("X := 0\nX\nX\n", repl) == "False\nFalse\n"
+    assert repl.version == 2 and repl.stats.hits == 1
+    # Function bodies read the session's variables, as references.
+    assert batch("G(x) := x ^ C\nC := 1\nZ := G(X)\nZ\nX := 1\nZ\n", repl) == (
+        "False\nTrue\n"
+    )
+
+
+def test_cache_size():
+    repl = REPL(cache_size=2)
+    batch("A := 1\nA\n~A\n~~A\nA\n", repl)
+    assert len(repl.parsed) == 2 and repl.stats.hits == 0
+    repl = REPL(cache_size=0)
+    batch("A := 1\nA\nA\n", repl)
+    assert not repl.parsed and repl.stats.hits == 0
+
+
+def test_piped_stdin_runs_in_batch_mode():
+    run = subprocess.run(
+        [sys.executable, "-m", "logic_parser.main"],
+        input=SESSION,
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+    assert run.stdout == "False\nFalse\nTrue\nTrue\n"
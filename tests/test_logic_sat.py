@@ -0,0 +1,148 @@
+import itertools
+import random
+
+import pytest
+
+from logic_parser.expr import BinaryExpr, collect_variables
+from logic_parser.parser import parse_formula
+from logic_parser.sat import (
+    CNF,
+    ModelCounter,
+    Solver,
+    are_equivalent,
+    count_models,
+    find_model,
+    is_satisfiable,
+    is_tautology,
+    parse_dimacs,
+    solve_cnf,
+    to_dimacs,
+    tseitin,
+)
+from logic_parser.token import TokenType
+from tests.helpers import brute_force_models, random_expr
+
+
+def test_sat_basic_formulas():
+    assert is_satisfiable(parse_formula("A ^ B"))
+    assert not is_satisfiable(parse_formula("A ^ ~A"))
+    assert is_tautology(parse_formula("A v ~A"))
+    assert is_tautology(parse_formula("(A => B) <=> (~B => ~A)"))
+    assert not is_tautology(parse_formula("A => B"))
+    assert are_equivalent(parse_formula("A != B"), parse_formula("~(A <=> B)"))
+    assert not are_equivalent(parse_formula("A => B"), parse_formula("B => A"))
+
+
+def test_sat_constants():
+    assert is_tautology(parse_formula("1 v A"))
+    assert not is_satisfiable(parse_formula("0 ^ A"))
+    assert find_model(parse_formula("1")) == {}
+
+
+def test_find_model_satisfies_formula():
+    expr = parse_formula("(A => B) ^ A ^ (C != B)")
+    model = find_model(expr)
+    assert model == {"A": True, "B": True, "C": False}
+    assert expr.eval(model) is True
+
+
+def test_sat_matches_brute_force():
+    rng = random.Random(26)
+    names = ["A", "B", "C", "D", "E"]
+    for _ in range(200):
+        expr = random_expr(rng, names, 5)
+        models = list(brute_force_models(expr, names))
+        model = find_model(expr)
+        assert (model is not None) == bool(models)
+        if model is not None:
+            env = {name: model.get(name, False) for name in names}
+            assert expr.eval(env) is True
+
+
+def test_pigeonhole_is_unsat():
+    # Five pigeons do not fit in four holes.
+    pigeons, holes = 5, 4
+    cnf = CNF(num_vars=pigeons * holes)
+    var = lambda p, h: p * holes + h + 1
+    for p in range(pigeons):
+        cnf.add_clause(*(var(p, h) for h in range(holes)))
+    for h in range(holes):
+        for p, q in itertools.combinations(range(pigeons), 2):
+            cnf.add_clause(-var(p, h), -var(q, h))
+    assert solve_cnf(cnf) is None
+
+
+def test_solver_incremental_with_assumptions():
+    solver = Solver()
+    solver.add_clause([1, 2])
+    solver.add_clause([-1, 3])
+    assert solver.solve([-3])
+    assert solver.model[2] is True
+    assert not solver.solve([-2, -3])
+    solver.add_clause([-2])
+    assert solver.solve()
+    assert solver.model[1] and solver.model[3]
+
+
+def test_shared_chains_encode_once():
+    # X_i := X_{i-1} ^ X_{i-1}, as substitution in the parser builds it.
+    node = parse_formula("A ^ B")
+    for _ in range(30):
+        node = BinaryExpr(TokenType.AND, node, node)
+    cnf, root = tseitin(node)
+    assert cnf.num_vars < 40 and len(cnf.clauses) < 100
+    assert find_model(node) == {"A": True, "B": True}
+    # An unshared chain is still one gate.
+    cnf, _ = tseitin(parse_formula("A ^ B ^ C ^ D"))
+    assert cnf.num_vars == 5
+
+
+def test_dimacs_round_trip():
+    cnf, root = tseitin(parse_formula("(A v B) ^ ~C"))
+    cnf.add_clause(root)
+    parsed = parse_dimacs(to_dimacs(cnf))
+    assert parsed == cnf
+
+    model = solve_cnf(parsed)
+    assert model is not None
+    assert model[parsed.variables["C"]] is False
+
+
+def test_dimacs_comments_and_errors():
+    cnf = parse_dimacs("c example\np cnf 2 2\n1 -2 0\n2\n0\n")
+    assert cnf.clauses == [[1, -2], [2]]
+    assert solve_cnf(cnf) == {1: True, 2: True}
+
+    with pytest.raises(ValueError) as excinfo:
+        parse_dimacs("p cnf 1 1\n1 2 0\n")
+    assert "exceeds" in str(excinfo.value)
+
+
+def test_count_models_matches_brute_force():
+    rng = random.Random(28)
+    names = ["A", "B", "C", "D", "E", "F"]
+    for _ in range(100):
+        expr = random_expr(rng, names, 5)
+        used = collect_variables(expr)
+        assert count_models(expr) == len(list(brute_force_models(expr, used)))
+        assert count_models(expr, names) == len(list(brute_force_models(expr, names)))
+
+
+def test_count_models_many_variables():
+    names = [f"X{i}" for i in range(80)]
+    assert count_models(parse_formula(" v ".join(names))) == 2**80 - 1
+    assert count_models(parse_formula(" != ".join(names))) == 2**79
+    chain = " ^ ".join(f"({a} => {b})" for a, b in zip(names, names[1:]))
+    assert count_models(parse_formula(chain)) == 81
+    assert count_models(parse_formula("A ^ ~A")) == 0
+    assert count_models(parse_formula("1"), ["A", "B"]) == 4
+    with pytest.raises(ValueError):
+        count_models(parse_formula("A ^ B"), ["A"])
+
+
+def test_model_counter_on_cnf():
+    cnf = parse_dimacs("p cnf 4 2\n1 2 0\n-3 0\n")
+    counter = ModelCounter(cnf)
+    # Variable 4 is unconstrained.
+    assert counter.count() == 3 * 2
+    assert counter.stats.decisions > 0
@@ -0,0 +1,72 @@
+import asyncio
+import subprocess
+import sys
+import threading
+
+import pytest
+
+from logic_parser.exceptions import ServerError
+from logic_parser.server import Client, Server
+
+
+@pytest.fixture
+def server(tmp_path):
+    path = str(tmp_path / "logic.sock")
+    server = Server(path, workers=2, heavy=200)
+    loop = asyncio.new_event_loop()
+    started = threading.Event()
+    thread = threading.Thread(
+        target=lambda: loop.run_until_complete(server.run(started))
+    )
+    thread.start()
+    started.wait(10)
+    yield server
+    loop.call_soon_threadsafe(server.close)
+    thread.join(10)
+    loop.close()
+
+
+def test_sessions_keep_their_own_variables_and_functions(server):
+    with Client(server.path) as client:
+        assert client.run("A := 1\nNAND(x, y) := ~(x ^ y)\n", "one") == []
+        assert client.run("A := 0\n", "two") == []
+        assert client.run("A\nB := NAND(A, A)\nB\n", "one") == [True, False]
+        assert client.run("A\n", "two") == [False]
+        with pytest.raises(ServerError, match="NAND"):
+            client.run("C := NAND(A, A)\n", "two")
+
+
+def test_errors_have_locations_and_keep_earlier_statements(server):
+    with Client(server.path) as client:
+        with pytest.raises(ServerError) as info:
+            client.run("A := 1\nA\nA v X\n")
+        assert (info.value.line, info.value.column) == (3, 6)
+        response = client.request({"source": "A\nA v X\n"})
+        assert response["results"] == [True]
+        assert client.request({"source": 1})["error"]["message"] == "Invalid request"
+        client.drop("default")
+        with pytest.raises(ServerError):
+            client.run("A\n")
+
+
+def test_heavy_batches_run_on_the_pool(server):
+    source = "".join(f"X{i} := {i % 2}\n" for i in range(100)) + "X98 v X99\n"
+    assert len(source) >= server.heavy
+    clients = [Client(server.path) for _ in range(4)]
+    results = [client.run(source, f"s{i}") for i, client in enumerate(clients)]
+    assert results == [[True]] * 4
+    for client in clients:
+        client.close()
+
+
+def test_connect_sends_a_file(server, tmp_path):
+    path = tmp_path / "rules.pl"
+    path.write_text("A := 1\nA\n~A\n")
+    command = [sys.executable, "-m", "logic_parser.main", "--connect", server.path]
+    run = subprocess.run(command + [str(path)], capture_output=True, text=True)
+    assert run.stdout == "True\nFalse\n"
+    run = subprocess.run(
+        command + ["--session", "other"], input="A\n", capture_output=True, text=True
+    )
+    assert run.stdout == "<stdin>:1:2: No value found for variable name 'A'.\n"
+    assert run.returncode == 1
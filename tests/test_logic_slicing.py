@@ -0,0 +1,105 @@
+import random
+import subprocess
+import sys
+
+import pytest
+
+from logic_parser.exceptions import ParserError
+from logic_parser.expr import evaluate, format_expr
+from logic_parser.parser import Parser
+from logic_parser.slicing import Program, evaluate_outputs, slice_lines
+from logic_parser.tokenizer import scan
+from tests.helpers import random_expr
+
+SOURCE = """A := 1
+B := 0
+C := 1
+NAND(x, y) := ~(x ^ y)
+// G reads C when it is called.
+G(x) := x ^ C
+X := NAND(A, B)
+Y := (A ^
+  B) v (A ^ C)
+Unused := A v B
+C := 0
+Z := G(A)
+Z := Z v
+  ~X // the first Z, and X
+A ^ B
+W := X ^ C
+X := ~X
+"""
+
+
+def full_values(source, names):
+    parser = Parser(scan(source))
+    for _ in parser.parse_all():
+        pass
+    return {name: bool(evaluate(parser.memory[name])) for name in names}
+
+
+def test_slice_keeps_the_cone_of_influence():
+    lines = SOURCE.splitlines(keepends=True)
+    program = Program(lines)
+    assert program.statements[6].lines == ["Y := (A ^\n", "  B) v (A ^ C)\n"]
+    sliced = program.slice(["Z"])
+    # `C := 1` is left out: G reads C when it is called, after `C := 0`.
+    assert [s.line for s in sliced.statements] == [1, 2, 4, 6, 7, 11, 12, 13]
+    assert sliced.total == 14
+    assert [s.name for s in slice_lines(lines, ["Y"]).statements] == list("ABCY")
+    names = ["X", "Y", "Z", "W", "Unused"]
+    assert evaluate_outputs(lines, names) == full_values(SOURCE, names)
+
+
+def test_random_files_agree_with_full_evaluation():
+    rng = random.Random(50)
+    lines = [f"In_{i} := {rng.randint(0, 1)}\n" for i in range(8)]
+    lines.append("MUX(s, a, b) := s ^ a v ~s ^ b\n")
+    lines.append("K(a) := a != In_0\n")
+    names = [f"In_{i}" for i in range(8)]
+    inputs = list(names)
+    for i in range(300):
+        name = rng.choice(names[8:]) if i > 10 and rng.random() < 0.1 else f"V_{i}"
+        # Each definition reads at most one earlier definition, so the trees
+        # that substituting them builds stay small enough to evaluate.
+        earlier = rng.choice(names[-20:])
+        if rng.random() < 0.1:
+            args = ", ".join(rng.sample(inputs, 2) + [earlier])
+            lines.append(f"{name} := MUX({args})\n")
+        elif rng.random() < 0.05:
+            lines.append(f"{name} := K({earlier})\n")
+        else:
+            text = format_expr(random_expr(rng, inputs, 3))
+            lines.append(f"{name} := ({text}) != {earlier}\n")
+        if rng.random() < 0.05:
+            lines.append(f"In_0 := {rng.randint(0, 1)}\n")
+        names.append(name)
+    for _ in range(20):
+        outputs = rng.sample(sorted(set(names)), 3)
+        assert evaluate_outputs(lines, outputs) == full_values("".join(lines), outputs)
+    assert len(slice_lines(lines, names[-1:]).statements) < len(lines)
+
+
+def test_only_the_cone_is_checked_for_errors():
+    lines = ["A := 1\n", "B := A ^ Missing\n", "C := A v\n", "  ~A\n", "D := ~B\n"]
+    assert evaluate_outputs(lines, ["C"]) == {"C": True}
+    with pytest.raises(ParserError) as error:
+        evaluate_outputs(lines, ["D"])
+    assert error.value.token.line == 2
+    with pytest.raises(ValueError, match="'E'"):
+        evaluate_outputs(lines, ["E"])
+
+
+def test_command_line(tmp_path):
+    path = tmp_path / "rules.pl"
+    path.write_text(SOURCE)
+    run = subprocess.run(
+        [sys.executable, "-m", "logic_parser.main", str(path), "--outputs", "Z,Y"],
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+    assert run.returncode == 0
+    assert run.stdout == "Z := 0\nY := 1\n"
+    sliced = slice_lines(SOURCE.splitlines(keepends=True), ["Z", "Y"])
+    assert f"evaluated {len(sliced.statements)} of {sliced.total}" in run.stderr
@@ -0,0 +1,87 @@
+import random
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from logic_parser.environment import Environment
+from logic_parser.expr import format_expr
+from logic_parser.snapshot import MAX_LAYERS, Snapshot, freeze
+from tests.helpers import random_expr
+
+SOURCE = """A := 1
+B := 0
+NAND(x, y) := ~(x ^ y)
+C := NAND(A, B)
+D := C ^ A
+"""
+
+
+def test_bindings_override_definitions():
+    snapshot = freeze(SOURCE)
+    assert snapshot.evaluate("D") is True
+    assert snapshot.evaluate("D", {"A": False}) is False
+    assert snapshot.evaluate("D", {"C": False}) is False
+    assert snapshot.evaluate(snapshot.parse("D ^ X"), {"X": True}) is True
+    with pytest.raises(ValueError, match="'X'"):
+        snapshot.evaluate("X")
+    assert snapshot.evaluate(snapshot.parse("E := NAND(A, A)\nE v B")) is False
+    assert "E" not in snapshot
+    snapshot = freeze(SOURCE + "G(x) := x ^ C\nZ := G(A)\n")
+    assert snapshot.evaluate("Z") is True
+    assert snapshot.evaluate("Z", {"C": False}) is False
+
+
+def test_snapshots_do_not_change():
+    snapshot = freeze(SOURCE)
+    changed = snapshot.assign({"A": False, "E": snapshot.parse("~D")})
+    assert snapshot.evaluate("D") is True and "E" not in snapshot
+    assert changed.evaluate("D") is False and changed.evaluate("E") is True
+    assert set(changed) == {"A", "B", "C", "D", "E"}
+    with pytest.raises(TypeError):
+        snapshot["A"] = snapshot["B"]
+    with pytest.raises(TypeError):
+        snapshot.functions["F"] = snapshot.functions["NAND"]
+
+    for i in range(3 * MAX_LAYERS):
+        changed = changed.assign({"A": i % 2 == 0})
+    assert changed._layers <= MAX_LAYERS
+    assert changed.evaluate("D") is False
+
+
+def test_snapshot_of_an_environment():
+    env = Environment()
+    env.update(A=True, B=False)
+    env["C"] = Snapshot().parse("A != B")
+    snapshot = Snapshot.of(env)
+    env["A"] = False
+    assert snapshot.evaluate("C") is True and env["C"] is False
+
+
+def test_threads_evaluate_one_snapshot():
+    rng = random.Random(48)
+    inputs = [f"In_{i}" for i in range(12)]
+    lines = [f"{name} := 0\n" for name in inputs]
+    names = list(inputs)
+    for i in range(150):
+        lines.append(f"V_{i} := {format_expr(random_expr(rng, names[-20:], 4))}\n")
+        names.append(f"V_{i}")
+    snapshot = freeze(lines)
+    cases = [
+        {name: rng.random() < 0.5 for name in rng.sample(inputs, 6)}
+        for _ in range(100)
+    ]
+    targets = names[-30:]
+
+    def expected(bindings):
+        env = Environment(dict(snapshot))
+        env.update(bindings)
+        return [env[name] for name in targets]
+
+    def evaluated(bindings):
+        scope = snapshot.scope(bindings)
+        return [scope[name] for name in targets]
+
+    with ThreadPoolExecutor(8) as executor:
+        results = list(executor.map(evaluated, cases * 4))
+    assert results == [expected(bindings) for bindings in cases] * 4
+    assert snapshot == freeze(lines)
@@ -0,0 +1,66 @@
+import io
+import random
+import subprocess
+import sys
+
+import pytest
+
+from logic_parser.expr import NaryExpr, evaluate
+from logic_parser.parser import parse_formula
+from logic_parser.token import TokenType
+from logic_parser.truth_table import truth_table, write_csv, write_gray_bits
+from tests.helpers import random_expr
+
+
+def test_rows_follow_gray_code_and_match_evaluation():
+    rng = random.Random(39)
+    names = ["A", "B", "C", "D", "E"]
+    for _ in range(100):
+        expr = random_expr(rng, names, 6, literals=0.1)
+        if rng.random() < 0.2:
+            expr = NaryExpr(rng.choice([TokenType.AND, TokenType.OR]), [expr, expr])
+        rows = list(truth_table(expr, names))
+        assert [assignment for assignment, _ in rows] == [k ^ (k >> 1) for k in range(32)]
+        for assignment, value in rows:
+            env = {name: bool(assignment >> i & 1) for i, name in enumerate(names)}
+            assert value == bool(evaluate(expr, env))
+
+
+def test_variables_must_be_listed():
+    assert len(list(truth_table(parse_formula("A"), ["A", "B"]))) == 4
+    assert list(truth_table(parse_formula("1 ^ 0"))) == [(0, False)]
+    with pytest.raises(ValueError, match="'B'"):
+        list(truth_table(parse_formula("A ^ B"), ["A"]))
+
+
+def test_csv_and_gray_bits_output():
+    expr = parse_formula("A ^ B v ~C")
+    text = io.StringIO()
+    write_csv(expr, text)
+    lines = text.getvalue().splitlines()
+    assert lines[:3] == ["A,B,C,value", "0,0,0,1", "1,0,0,1"]
+    assert lines[-1] == "0,0,1,0" and len(lines) == 9
+
+    bits = io.BytesIO()
+    write_gray_bits(expr, bits)
+    assert bits.getvalue() == bytes([0b11110100])
+
+    wide = parse_formula(" v ".join(f"X{i}" for i in range(17)))
+    bits = io.BytesIO()
+    write_gray_bits(wide, bits)
+    assert bits.getvalue() == bytes([0x7F]) + bytes([0xFF]) * (2**17 // 8 - 1)
+
+
+def test_truth_table_cli(tmp_path):
+    path = tmp_path / "table.csv"
+    command = [sys.executable, "-m", "logic_parser.main", "--truth-table", "A => B"]
+    subprocess.run(command + ["--output", str(path)], check=True)
+    assert path.read_text().splitlines() == [
+        "A,B,value",
+        "0,0,1",
+        "1,0,0",
+        "1,1,1",
+        "0,1,1",
+    ]
+    bits = subprocess.run(command + ["--format", "gray-bits"], check=True, capture_output=True)
+    assert bits.stdout == bytes([0b10110000])